@@ -0,0 +1,83 @@
+"""
+Compares the throughput of model.batch with computing the same features through Board,
+on positions from random games. tests/test_batch.py checks that both agree.
+
+usage: python -m benchmarks.batch_features [--positions N] [--seed SEED]
+"""
+
+import argparse
+import random
+import time
+
+from model.batch import BoardBatch
+from model.board import Board
+from model.movement import Movement
+from model.pieces import Piece
+
+
+def generate_positions(count: int, rng: random.Random) -> list[Board]:
+    """Plays random legal moves, restarting whenever a game ends"""
+    boards: list[Board] = []
+    board: Board = Board()
+    board.setup_pieces()
+
+    while len(boards) < count:
+        movements: list[Movement] = [
+            Movement(square, target_square)
+            for square, target_squares in sorted(
+                board.get_all_moveable_squares(board.white_turn).items()
+            )
+            for target_square in sorted(target_squares)
+        ]
+        if len(movements) == 0 or board.halfmove_clock > 100:
+            board = Board()
+            board.setup_pieces()
+            continue
+        board = board.move_piece(rng.choice(movements))
+        boards.append(board)
+
+    return boards
+
+
+def get_scalar_mobility(board: Board, is_white: bool) -> int:
+    pieces: dict[tuple[int, int], Piece] = board.get_pieces()
+    return sum(
+        len(piece.get_moveable_squares(pieces, square))
+        for square, piece in pieces.items()
+        if piece.is_white == is_white
+    )
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args: argparse.Namespace = parser.parse_args()
+
+    boards: list[Board] = generate_positions(args.positions, random.Random(args.seed))
+
+    start_time: float = time.perf_counter()
+    batch: BoardBatch = BoardBatch.create_from_boards(boards)
+    pack_time: float = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    batch.get_attack_maps()
+    batch.get_mobility()
+    batch.get_in_check()
+    batch_time: float = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for board in boards:
+        for is_white in (True, False):
+            get_scalar_mobility(board, is_white)
+            board.is_king_in_check(is_white)
+    scalar_time: float = time.perf_counter() - start_time
+
+    print(f"{len(boards)} positions")
+    print(f"pack:   {pack_time * 1000:>10.1f} ms")
+    print(f"batch:  {batch_time * 1000:>10.1f} ms  ({len(boards) / batch_time:,.0f} positions/s)")
+    print(f"scalar: {scalar_time * 1000:>10.1f} ms  ({len(boards) / scalar_time:,.0f} positions/s)")
+
+
+if __name__ == "__main__":
+    main()
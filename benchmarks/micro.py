@@ -0,0 +1,332 @@
+"""
+Micro-benchmarks of the model, view and engine layers, timing each operation and counting
+its allocations with tracemalloc. Results can be stored as a baseline and later runs compared
+against it, flagging operations that became slower or allocate more. Allocations differ
+between Python versions, so a baseline is stored for each version.
+
+usage: python -m benchmarks.micro [run|baseline|compare] [--filter TEXT] [--rounds N]
+                                  [--baseline PATH] [--threshold FRACTION]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, override
+from unittest import mock
+
+import view.game_view
+from benchmarks.startup import ROOT_PATH, STUB_ENGINE_PATH
+from benchmarks.tui_latency import ScriptedTerminal
+from controller.game_config import GameConfig
+from controller.game_controller import GameController
+from engine.uci_engine import UCIEngine
+from model.board import Board
+from model.movement import Movement
+from model.snapshot import BoardSnapshot
+from view.game_view import GameView
+from view.simul_view import BoardTile
+
+BASELINE_PATH: Path = ROOT_PATH / "benchmarks" / "micro_baseline.json"
+
+# middlegame with both sides castling, pins and captures available, see "Kiwipete" in perft
+MIDDLEGAME_FEN: str = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+# the middlegame with white in check from a bishop, so moves are searched until an escape
+CHECK_FEN: str = "r3k2r/p1ppqpb1/1n2pnp1/3PN3/1p2P3/2N2Q1p/PPPBbPPP/R2K3R w kq - 0 2"
+# white is mated, so every white move is searched before checkmate is confirmed
+CHECKMATE_FEN: str = "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+
+# calls whose allocations are counted, the mean is reported
+ALLOCATION_CALLS: int = 20
+
+# increase of blocks held that is not flagged, by benchmark name prefix, as the blocks held
+# after an engine round trip vary by about one with the buffering of its pipes
+BLOCK_TOLERANCES: dict[str, float] = {"engine.": 2}
+DEFAULT_BLOCK_TOLERANCE: float = 0.5
+
+
+class NullOutput(io.TextIOBase):
+    """Stands in for stdout, discarding frames so that writing them is not measured"""
+
+    @override
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class BenchmarkResultError(Exception):
+    """A benchmarked call returned something else than expected, so it measures the wrong path"""
+
+
+class Benchmark:
+    """Operation measured by repeatedly calling a function prepared outside of the timings"""
+
+    def __init__(self, name: str, function: Callable[[], object], expected: object = None):
+        self.name: str = name
+        self.function: Callable[[], object] = function
+        self.expected: object = expected  # result checked before measuring, unless None
+
+    def measure_time(self, rounds: int) -> float:
+        """Median microseconds per call, over rounds of calls lasting at least 0.2 seconds"""
+        timer: timeit.Timer = timeit.Timer(self.function)
+        number, _ = timer.autorange()
+        times: list[float] = timer.repeat(repeat=rounds, number=number)
+        return statistics.median(times) / number * 1e6
+
+    def measure_allocations(self) -> tuple[float, float]:
+        """Allocations of a call, less those of measuring a call that does nothing"""
+        blocks, peak_kib = count_allocations(self.function)
+        empty_blocks, empty_peak_kib = count_allocations(lambda: None)
+        return max(blocks - empty_blocks, 0), max(peak_kib - empty_peak_kib, 0)
+
+    def measure(self, rounds: int) -> dict[str, float]:
+        if self.expected is not None and (result := self.function()) != self.expected:
+            raise BenchmarkResultError(f"{self.name} returned {result}, not {self.expected}")
+        time_us: float = self.measure_time(rounds)
+        blocks, peak_kib = self.measure_allocations()
+        return {
+            "time_us": round(time_us, 2),
+            "blocks": round(blocks, 1),
+            "peak_kib": round(peak_kib, 2),
+        }
+
+
+def count_allocations(function: Callable[[], object]) -> tuple[float, float]:
+    """
+    Mean blocks still allocated after each call, i.e. held by its result,
+    and mean peak KiB allocated during a call, including memory freed before it returns
+    """
+    function()  # warms caches, which would otherwise count as allocations of one call
+    results: list[object] = [None] * ALLOCATION_CALLS
+    peaks: list[int] = []
+
+    tracemalloc.start()
+    try:
+        before: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        for index in range(ALLOCATION_CALLS):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            results[index] = function()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+        after: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    ignored: list[tracemalloc.Filter] = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    blocks: int = sum(
+        statistic.count_diff
+        for statistic in after.filter_traces(ignored).compare_to(
+            before.filter_traces(ignored), "filename"
+        )
+    )
+    return blocks / ALLOCATION_CALLS, statistics.mean(peaks) / 1024
+
+
+def create_model_benchmarks() -> list[Benchmark]:
+    board: Board = Board.create_from_fen(MIDDLEGAME_FEN)
+    check_board: Board = Board.create_from_fen(CHECK_FEN)
+    checkmate_board: Board = Board.create_from_fen(CHECKMATE_FEN)
+    castling: Movement = Movement.create_from_algebraic("e1g1")
+    capture: Movement = Movement.create_from_algebraic("e5f7")
+
+    return [
+        Benchmark("board.move_piece", lambda: board.move_piece(capture)),
+        Benchmark("board.move_piece.castling", lambda: board.move_piece(castling)),
+        Benchmark("board.get_moveable_squares", lambda: board.get_moveable_squares((5, 5))),
+        Benchmark("board.is_king_in_check", lambda: board.is_king_in_check(True), False),
+        Benchmark(
+            "board.is_king_in_checkmate",
+            lambda: check_board.is_king_in_checkmate(True),
+            False,
+        ),
+        Benchmark(
+            "board.is_king_in_checkmate.mated",
+            lambda: checkmate_board.is_king_in_checkmate(True),
+            True,
+        ),
+        Benchmark("board.fen_serialize", lambda: board.fen_serialize()),
+    ]
+
+
+@contextlib.contextmanager
+def create_view_benchmarks(runner: asyncio.Runner) -> Iterator[list[Benchmark]]:
+    """Draws frames of the middlegame to a fake terminal, with and without cursors"""
+    from run import create_parser
+
+    config: GameConfig = GameConfig(**vars(create_parser().parse_args([])))
+    # the view creates its own terminal, so hand it the scripted one while it is built
+    with mock.patch.object(view.game_view, "Terminal", ScriptedTerminal):
+        controller: GameController = GameController(config)
+    game_view: GameView | BoardTile = controller.view
+    if isinstance(game_view, BoardTile):
+        raise TypeError("The view benchmarks draw a single game")
+    game_view.board = BoardSnapshot(Board.create_from_fen(MIDDLEGAME_FEN))
+    moveable_squares: set[tuple[int, int]] = game_view.board.get_moveable_squares((5, 5))
+
+    with contextlib.redirect_stdout(NullOutput()):
+        yield [
+            Benchmark("view.draw_board", lambda: runner.run(game_view.draw_board(False))),
+            Benchmark(
+                "view.draw_board.moving",
+                lambda: runner.run(game_view.draw_board(True, moveable_squares)),
+            ),
+        ]
+
+
+@contextlib.contextmanager
+def create_engine_benchmarks(runner: asyncio.Runner) -> Iterator[list[Benchmark]]:
+    """Round trips over the pipes of the stub engine, which is started once for all calls"""
+    engine: UCIEngine = UCIEngine(str(STUB_ENGINE_PATH), 1)
+
+    async def is_ready():
+        await engine.write("isready")
+        await engine.wait_for("readyok")
+
+    runner.run(engine.start())
+    try:
+        yield [
+            Benchmark("engine.isready", lambda: runner.run(is_ready())),
+            Benchmark("engine.search", lambda: runner.run(engine.search(MIDDLEGAME_FEN))),
+        ]
+    finally:
+        runner.run(engine.terminate())
+
+
+def run_benchmarks(name_filter: str | None, rounds: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'benchmark':<34}{'time us':>12}{'blocks':>10}{'peak KiB':>10}")
+
+    def run(benchmarks: list[Benchmark]):
+        for benchmark in benchmarks:
+            if name_filter and name_filter not in benchmark.name:
+                continue
+            result: dict[str, float] = benchmark.measure(rounds)
+            results[benchmark.name] = result
+            print(
+                f"{benchmark.name:<34}{result['time_us']:>12.2f}"
+                f"{result['blocks']:>10.1f}{result['peak_kib']:>10.1f}",
+                file=sys.__stdout__,
+                flush=True,
+            )
+
+    run(create_model_benchmarks())
+    with asyncio.Runner() as runner:
+        with create_view_benchmarks(runner) as benchmarks:
+            run(benchmarks)
+        with create_engine_benchmarks(runner) as benchmarks:
+            run(benchmarks)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """
+    Prints the ratio of each result to its baseline, returning the names of regressions:
+    slower by more than threshold, more blocks held, or a higher peak by more than threshold
+    """
+    regressions: list[str] = []
+    print(f"\n{'benchmark':<34}{'time':>10}{'blocks':>10}{'peak':>10}  status")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<34}{'':>30}  new")
+            continue
+        base: dict[str, float] = baseline[name]
+        time_ratio: float = result["time_us"] / base["time_us"]
+        peak_ratio: float = result["peak_kib"] / base["peak_kib"] if base["peak_kib"] else 1
+        blocks_diff: float = result["blocks"] - base["blocks"]
+
+        reasons: list[str] = []
+        if time_ratio > 1 + threshold:
+            reasons.append("slower")
+        if blocks_diff > get_block_tolerance(name):
+            reasons.append("more blocks")
+        if peak_ratio > 1 + threshold:
+            reasons.append("higher peak")
+        if reasons:
+            regressions.append(name)
+        status: str = f"REGRESSION ({', '.join(reasons)})" if reasons else "ok"
+        print(f"{name:<34}{time_ratio:>9.2f}x{blocks_diff:>+10.1f}{peak_ratio:>9.2f}x  {status}")
+    return regressions
+
+
+def get_block_tolerance(name: str) -> float:
+    for prefix, tolerance in BLOCK_TOLERANCES.items():
+        if name.startswith(prefix):
+            return tolerance
+    return DEFAULT_BLOCK_TOLERANCE
+
+
+def get_environment() -> dict[str, str]:
+    """Recorded with a baseline, as timings are only comparable on the same machine"""
+    return {"python": platform.python_version(), "machine": platform.machine()}
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["run", "baseline", "compare"],
+        default="run",
+        help="run prints results, baseline also stores them, compare checks them against "
+        "the stored ones and exits with 1 on a regression",
+    )
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains TEXT")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds, default 5")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline file, default benchmarks/micro_baseline.json",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown flagged as a regression, default 0.25 i.e. 25%%",
+        metavar="FRACTION",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = run_benchmarks(args.filter, args.rounds)
+
+    # baselines of each Python version, e.g. "3.13", as it changes what is allocated
+    version: str = ".".join(platform.python_version_tuple()[:2])
+    baselines: dict[str, dict[str, Any]] = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text())
+
+    if args.command == "baseline":
+        stored: dict[str, dict[str, float]] = {}
+        if args.filter and version in baselines:  # keep benchmarks which were not run
+            stored = baselines[version]["results"]
+        stored.update(results)
+        baselines[version] = {"environment": get_environment(), "results": stored}
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline for Python {version} written to {args.baseline}")
+
+    elif args.command == "compare":
+        if version not in baselines:
+            print(f"\nNo baseline for Python {version}, record one with the baseline command")
+            sys.exit(1)
+        baseline: dict[str, Any] = baselines[version]
+        if baseline["environment"] != get_environment():
+            print(f"\nWarning: baseline was recorded on {baseline['environment']}")
+        regressions: list[str] = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Measures application startup: time to first frame and time until engines are ready.
+Each run launches a fresh interpreter so imports are included in the timings.
+
+usage: python -m benchmarks.startup [--runs N] [--handshake-delay SECONDS] [-w PATH] [-b PATH]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_PATH: Path = Path(__file__).resolve().parent.parent
+STUB_ENGINE_PATH: Path = ROOT_PATH / "benchmarks" / "stub_engine.py"
+
+
+async def measure(run_arguments: list[str]) -> dict[str, float]:
+    """Runs the game until both milestones are reached, returning their wall-clock times"""
+    from controller.game_config import GameConfig
+    from controller.game_controller import GameController
+    from run import create_parser
+
+    config: GameConfig = GameConfig(**vars(create_parser().parse_args(run_arguments)))
+    controller: GameController = GameController(config)
+    times: dict[str, float] = {}
+
+    game_task: asyncio.Task[None] = asyncio.create_task(controller.run_tasks())
+    while not controller.view.is_ready and not game_task.done():
+        await asyncio.sleep(0.001)
+    times["first_frame"] = time.time()
+
+    engines_ready_task: asyncio.Task[bool] = asyncio.create_task(controller.engines_ready.wait())
+    await asyncio.wait([game_task, engines_ready_task], return_when=asyncio.FIRST_COMPLETED)
+    times["engines_ready"] = time.time()
+
+    for task in (game_task, engines_ready_task):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    return times
+
+
+def run_child(run_arguments: list[str]):
+    with contextlib.redirect_stdout(io.StringIO()):  # discard frames
+        times: dict[str, float] = asyncio.run(measure(run_arguments))
+    print(json.dumps(times))
+
+
+def run_once(run_arguments: list[str], handshake_delay: float) -> dict[str, float]:
+    environment: dict[str, str] = dict(os.environ, STUB_ENGINE_HANDSHAKE_DELAY=str(handshake_delay))
+    spawn_time: float = time.time()
+    output: str = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", "--", *run_arguments],
+        cwd=ROOT_PATH,
+        env=environment,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    times: dict[str, float] = json.loads(output.splitlines()[-1])
+    return {name: (value - spawn_time) * 1000 for name, value in times.items()}
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--handshake-delay",
+        type=float,
+        default=0.25,
+        help="UCI handshake delay of the stub engine, default 0.25",
+        metavar="SECONDS",
+    )
+    parser.add_argument("-w", "--white", default=str(STUB_ENGINE_PATH), metavar="PATH")
+    parser.add_argument("-b", "--black", default=str(STUB_ENGINE_PATH), metavar="PATH")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("run_arguments", nargs="*", help=argparse.SUPPRESS)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.child:
+        run_child(args.run_arguments)
+        return
+
+    run_arguments: list[str] = ["-w", args.white, "-b", args.black, "-d", "1", "-a"]
+    results: list[dict[str, float]] = [
+        run_once(run_arguments, args.handshake_delay) for _ in range(args.runs)
+    ]
+
+    print(f"{'milestone':<16}{'median ms':>12}{'min ms':>12}{'max ms':>12}")
+    for name in ("first_frame", "engines_ready"):
+        samples: list[float] = [result[name] for result in results]
+        print(
+            f"{name:<16}{statistics.median(samples):>12.1f}"
+            f"{min(samples):>12.1f}{max(samples):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
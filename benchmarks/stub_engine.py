@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Minimal UCI engine for benchmarks, plays a random legal move using the project's model.
+Handshake and move delays can be added to mimic real engines, either as arguments
+or through STUB_ENGINE_* environment variables when launched by UCIEngine.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from model.board import Board
+from model.movement import Movement
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def set_position(arguments: list[str]) -> Board:
+    """Handles arguments of 'position startpos|fen <fen> [moves ...]'"""
+    if arguments[0] == "startpos":
+        board: Board = Board.create_from_fen(START_FEN)
+        arguments = arguments[1:]
+    else:
+        board = Board.create_from_fen(" ".join(arguments[1:7]))
+        arguments = arguments[7:]
+
+    if len(arguments) != 0 and arguments[0] == "moves":
+        for notation in arguments[1:]:
+            board = board.move_piece(Movement.create_from_algebraic(notation))
+
+    return board
+
+
+def choose_move(board: Board, rng: random.Random) -> str:
+    movements: list[Movement] = []
+    for square, moveable_squares in sorted(
+        board.get_all_moveable_squares(board.white_turn).items()
+    ):
+        for moveable_square in sorted(moveable_squares):
+            movements.append(Movement(square, moveable_square))
+
+    if len(movements) == 0:
+        return "(none)"
+
+    movement: Movement = rng.choice(movements)
+    return movement.to_algebraic(board.is_promotion(movement))
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--handshake-delay",
+        type=float,
+        default=float(os.environ.get("STUB_ENGINE_HANDSHAKE_DELAY", "0")),
+        metavar="SECONDS",
+    )
+    parser.add_argument(
+        "--move-delay",
+        type=float,
+        default=float(os.environ.get("STUB_ENGINE_MOVE_DELAY", "0")),
+        metavar="SECONDS",
+    )
+    parser.add_argument("--seed", type=int, default=int(os.environ.get("STUB_ENGINE_SEED", "0")))
+    args: argparse.Namespace = parser.parse_args()
+
+    rng: random.Random = random.Random(args.seed)
+    board: Board = Board.create_from_fen(START_FEN)
+
+    for line in sys.stdin:
+        tokens: list[str] = line.split()
+        if len(tokens) == 0:
+            continue
+
+        match tokens[0]:
+            case "uci":
+                time.sleep(args.handshake_delay)
+                print("id name stub_engine")
+                # accepted and ignored, so that setting options can be exercised
+                print("option name Hash type spin default 16 min 1 max 1024")
+                print("option name Threads type spin default 1 min 1 max 64")
+                print("option name Ponder type check default false")
+                print("uciok", flush=True)
+            case "isready":
+                print("readyok", flush=True)
+            case "position":
+                board = set_position(tokens[1:])
+            case "go":
+                time.sleep(args.move_delay)
+                move: str = choose_move(board, rng)
+                print(f"info depth 1 seldepth 1 score cp 0 nodes 1 nps 1 time 0 pv {move}")
+                print(f"bestmove {move}", flush=True)
+            case "quit":
+                break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Measures keystroke-to-frame latency of the TUI by replaying a scripted game against a fake terminal.
+Also counts frames drawn, redraws coalesced into them and bytes written for each move.
+
+usage: python -m benchmarks.tui_latency [--runs N] [--key-interval SECONDS] [--output PATH]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import override
+from unittest import mock
+
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+
+import view.game_view
+from controller.game_config import GameConfig
+from controller.game_controller import GameController
+from model.movement import Movement
+from util.stats import get_percentile
+from view.cursor import Cursor
+from view.game_view import GameView, SelectingState
+from view.simul_view import BoardTile
+
+# fixed game played by keyboard, every move is a human one
+SCRIPTED_MOVES: list[str] = [
+    "e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5a4", "g8f6",
+    "e1g1", "f8e7", "f1e1", "b7b5", "a4b3", "d7d6", "c2c3", "e8g8",
+]  # fmt: skip
+
+# arrow keys and the cursor step they make
+ARROW_KEYS: dict[str, tuple[int, int]] = {
+    "KEY_LEFT": (-1, 0),
+    "KEY_DOWN": (0, 1),
+    "KEY_RIGHT": (1, 0),
+    "KEY_UP": (0, -1),
+}
+ARROW_SEQUENCES: dict[str, str] = {
+    "KEY_LEFT": "\x1b[D",
+    "KEY_DOWN": "\x1b[B",
+    "KEY_RIGHT": "\x1b[C",
+    "KEY_UP": "\x1b[A",
+}
+
+TERMINAL_WIDTH: int = 80
+TERMINAL_HEIGHT: int = 24
+
+# longest wait for the game to respond, so that a stuck run fails instead of hanging
+RESPONSE_TIMEOUT: float = 10
+
+
+class ScriptedGameEndedError(Exception):
+    """The game ended before every scripted move was played"""
+
+
+class ScriptedGameStuckError(Exception):
+    """The game did not respond to the scripted keys in time"""
+
+
+class ScriptedTerminal(Terminal):
+    """Terminal of fixed size whose keystrokes arrive at scheduled times instead of from a tty"""
+
+    def __init__(self):
+        super().__init__(kind="xterm-256color", stream=io.StringIO(), force_styling=True)
+        # keystrokes with their arrival time, and those read but not yet shown by a frame
+        self.scheduled_keys: deque[tuple[float, Keystroke]] = deque()
+        self.read_keys: list[float] = []
+
+    @property
+    @override
+    def width(self) -> int:
+        return TERMINAL_WIDTH
+
+    @property
+    @override
+    def height(self) -> int:
+        return TERMINAL_HEIGHT
+
+    @override
+    @contextlib.contextmanager
+    def cbreak(self) -> Iterator[None]:
+        yield
+
+    @override
+    @contextlib.contextmanager
+    def hidden_cursor(self) -> Iterator[None]:
+        yield
+
+    @override
+    def inkey(self, timeout: float | None = None, esc_delay: float = 0.35) -> Keystroke:
+        """Blocks like a real terminal until the next keystroke arrives or the timeout passes"""
+        deadline: float = time.perf_counter() + (timeout or 0)
+        if self.scheduled_keys:
+            time.sleep(max(0, min(deadline, self.scheduled_keys[0][0]) - time.perf_counter()))
+            if self.scheduled_keys[0][0] <= time.perf_counter():
+                arrival_time, key = self.scheduled_keys.popleft()
+                self.read_keys.append(arrival_time)
+                return key
+        else:
+            time.sleep(max(0, deadline - time.perf_counter()))
+        return Keystroke("")
+
+    def send(self, keys: list[Keystroke], interval: float):
+        start_time: float = time.perf_counter()
+        for index, key in enumerate(keys):
+            self.scheduled_keys.append((start_time + index * interval, key))
+
+
+class ByteCounter(io.TextIOBase):
+    """Stands in for stdout, counting the encoded size of everything written"""
+
+    def __init__(self):
+        self.bytes_written: int = 0
+
+    @override
+    def write(self, text: str) -> int:
+        self.bytes_written += len(text.encode())
+        return len(text)
+
+
+def get_key_path(
+    start: tuple[int, int], target: tuple[int, int], skip_squares: set[tuple[int, int]]
+) -> list[str]:
+    """Shortest sequence of arrow keys moving a cursor from start to target"""
+    previous: dict[tuple[int, int], tuple[tuple[int, int], str] | None] = {start: None}
+    queue: deque[tuple[int, int]] = deque([start])
+    while queue:
+        square: tuple[int, int] = queue.popleft()
+        if square == target:
+            break
+        for name, (x_diff, y_diff) in ARROW_KEYS.items():
+            cursor: Cursor = Cursor(0, 0, 7, 7, square)
+            cursor.move(x_diff, y_diff, skip_squares)
+            if cursor.square not in previous:
+                previous[cursor.square] = (square, name)
+                queue.append(cursor.square)
+
+    path: list[str] = []
+    step: tuple[tuple[int, int], str] | None = previous[target]
+    while step:
+        path.append(step[1])
+        step = previous[step[0]]
+    return path[::-1]
+
+
+def create_keys(term: Terminal, names: list[str]) -> list[Keystroke]:
+    keys: list[Keystroke] = []
+    for name in names:
+        if name == " ":
+            keys.append(Keystroke(" "))
+        else:
+            # the key code is what makes blessed treat the keystroke as a sequence
+            keys.append(Keystroke(ARROW_SEQUENCES[name], code=getattr(term, name), name=name))
+    return keys
+
+
+async def wait_for_game(
+    game_task: asyncio.Task[None], is_done: Callable[[], bool], timeout: float, waiting_for: str
+):
+    """Polls until the game is done with the keys sent, raising if it ends or gets stuck"""
+    deadline: float = time.perf_counter() + timeout
+    while not is_done():
+        if game_task.done():
+            game_task.result()
+            raise ScriptedGameEndedError(f"Game ended while waiting for {waiting_for}")
+        if time.perf_counter() > deadline:
+            raise ScriptedGameStuckError(f"Game did not respond in {timeout:.0f}s to {waiting_for}")
+        await asyncio.sleep(0.001)
+
+
+async def play(key_interval: float) -> dict[str, list[float]]:
+    """Plays the scripted game, returning latency of every key and frames and bytes of each move"""
+    from run import create_parser
+
+    output: ByteCounter = ByteCounter()
+    samples: dict[str, list[float]] = {"latency": [], "frames": [], "dropped": [], "bytes": []}
+    frame_count: int = 0
+
+    with contextlib.redirect_stdout(output):
+        config: GameConfig = GameConfig(**vars(create_parser().parse_args([])))
+        # the view creates its own terminal, so hand it the scripted one while it is built
+        terminal: ScriptedTerminal = ScriptedTerminal()
+        with mock.patch.object(view.game_view, "Terminal", return_value=terminal):
+            controller: GameController = GameController(config)
+        game_view: GameView | BoardTile = controller.view
+        if isinstance(game_view, BoardTile):
+            raise TypeError("The benchmark plays a single game")
+
+        draw_board = game_view.draw_board
+
+        async def draw_frame(
+            draw_cursors: bool, moveable_squares: set[tuple[int, int]] | None = None
+        ):
+            nonlocal frame_count
+            await draw_board(draw_cursors, moveable_squares)
+            frame_count += 1
+            frame_time: float = time.perf_counter()
+            samples["latency"].extend((frame_time - key) * 1000 for key in terminal.read_keys)
+            terminal.read_keys.clear()
+
+        game_view.draw_board = draw_frame
+
+        game_task: asyncio.Task[None] = asyncio.create_task(controller.run_tasks())
+        try:
+            for ply, notation in enumerate(SCRIPTED_MOVES, start=1):
+                # wait for legal moves so the cursor skips the same squares in every run
+                await wait_for_game(
+                    game_task,
+                    lambda: (
+                        game_view.all_moveable_squares is not None
+                        and isinstance(game_view.state, SelectingState)
+                    ),
+                    RESPONSE_TIMEOUT,
+                    f"input before move '{notation}'",
+                )
+
+                movement: Movement = Movement.create_from_algebraic(notation)
+                names: list[str] = get_key_path(
+                    game_view.selection_cursor.square,
+                    movement.origin_square,
+                    game_view.get_immobile_squares(),
+                )
+                names.append(" ")
+                names.extend(get_key_path(movement.origin_square, movement.target_square, set()))
+                names.append(" ")
+
+                start_frames: int = frame_count
+                start_dropped: int = game_view.dropped_frames
+                start_bytes: int = output.bytes_written
+                terminal.send(create_keys(terminal, names), key_interval)
+                await wait_for_game(
+                    game_task,
+                    lambda ply=ply: (
+                        controller.history.ply >= ply
+                        and game_view.all_moveable_squares is not None
+                        and not game_view.dirty.is_set()
+                    ),
+                    RESPONSE_TIMEOUT + len(names) * key_interval,
+                    f"the keys of move '{notation}'",
+                )
+
+                samples["frames"].append(frame_count - start_frames)
+                samples["dropped"].append(game_view.dropped_frames - start_dropped)
+                samples["bytes"].append(output.bytes_written - start_bytes)
+
+        finally:
+            game_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await game_task
+
+    return samples
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--key-interval",
+        type=float,
+        default=0.05,
+        help="Time between keystrokes of a move, default 0.05",
+        metavar="SECONDS",
+    )
+    parser.add_argument("--output", help="Also write results as JSON to PATH", metavar="PATH")
+    args: argparse.Namespace = parser.parse_args()
+
+    samples: dict[str, list[float]] = {"latency": [], "frames": [], "dropped": [], "bytes": []}
+    for _ in range(args.runs):
+        for name, values in asyncio.run(play(args.key_interval)).items():
+            samples[name].extend(values)
+
+    latencies: list[float] = sorted(samples["latency"])
+    results: dict[str, float] = {
+        "keys": len(latencies),
+        "latency_p50_ms": get_percentile(latencies, 50),
+        "latency_p90_ms": get_percentile(latencies, 90),
+        "latency_p99_ms": get_percentile(latencies, 99),
+        "latency_max_ms": latencies[-1],
+        "frames_per_move": statistics.mean(samples["frames"]),
+        "dropped_per_move": statistics.mean(samples["dropped"]),
+        "bytes_per_move": statistics.mean(samples["bytes"]),
+        "bytes_per_frame": sum(samples["bytes"]) / sum(samples["frames"]),
+    }
+
+    for name, value in results.items():
+        print(f"{name:<20}{value:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
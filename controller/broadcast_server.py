@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from util import log
+
+
+class Spectator:
+    """Connected watcher with its own bounded queue of encoded messages"""
+
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int):
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+
+        # connection handler, cancelled by the server when it shuts down
+        self.task: asyncio.Task[None] | None = asyncio.current_task()
+
+
+class BroadcastServer:
+    """
+    Publishes the game to spectators over TCP as newline-delimited JSON.
+    New spectators receive a full snapshot, the start position and every move since,
+    after which each move is sent as a small delta.
+    A spectator that falls behind has its backlog replaced with a fresh snapshot,
+    and one that stops reading is dropped, so the game loop never waits on the network.
+    """
+
+    def __init__(self, host: str, port: int, queue_size: int = 64, write_timeout: float = 5):
+        self.host: str = host
+        self.port: int = port
+        self.queue_size: int = queue_size
+        self.write_timeout: float = write_timeout
+
+        self.spectators: set[Spectator] = set()
+
+        self._start_fen: str = ""
+        self._movements: list[str] = []
+        self._clocks: dict[str, int] = {}
+        self._status: dict[str, Any] = {}
+
+    async def run(self):
+        server: asyncio.Server = await asyncio.start_server(
+            self._handle_spectator, self.host, self.port
+        )
+        # port 0 has the system pick a free port, which spectators need to know
+        self.port = server.sockets[0].getsockname()[1]
+        log(f"Broadcasting on {self.host}:{self.port}")
+        async with server:
+            try:
+                # not serve_forever, which waits for open connections when cancelled
+                await asyncio.get_running_loop().create_future()
+            finally:
+                # handlers finish before the server closes, which waits for their connections
+                server.close()
+                tasks: list[asyncio.Task[None]] = [
+                    spectator.task for spectator in self.spectators if spectator.task
+                ]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def reset(self, start_fen: str, movements: list[str], clocks: dict[str, int]):
+        """Sets the whole game state, e.g. at the start or after a takeback"""
+        self._start_fen = start_fen
+        self._movements = list(movements)
+        self._clocks = clocks
+        message: bytes = self._get_snapshot_message()
+        for spectator in self.spectators:
+            self._send_snapshot(spectator, message)
+
+    def publish_move(self, movement_text: str, clocks: dict[str, int]):
+        """Appends a move, snapshots keep the start position so that moves replay from it"""
+        self._movements.append(movement_text)
+        self._clocks = clocks
+        self._publish(
+            {
+                "type": "move",
+                "ply": len(self._movements),
+                "move": movement_text,
+                "clocks": clocks,
+            }
+        )
+
+    def publish_status(self, status: dict[str, Any]):
+        if status != self._status:
+            self._status = status
+            self._publish({"type": "status", "status": status})
+
+    def _publish(self, message: dict[str, Any]):
+        data: bytes = self._encode(message)  # encoded once for every spectator
+        snapshot: bytes | None = None
+        for spectator in self.spectators:
+            try:
+                spectator.queue.put_nowait(data)
+            except asyncio.QueueFull:
+                if snapshot is None:
+                    snapshot = self._get_snapshot_message()
+                self._send_snapshot(spectator, snapshot)
+
+    def _send_snapshot(self, spectator: Spectator, snapshot: bytes):
+        """Replaces any queued messages with a snapshot of the current state"""
+        while not spectator.queue.empty():
+            spectator.queue.get_nowait()
+        spectator.queue.put_nowait(snapshot)
+
+    def _get_snapshot_message(self) -> bytes:
+        return self._encode(
+            {
+                "type": "snapshot",
+                "fen": self._start_fen,
+                "moves": self._movements,
+                "clocks": self._clocks,
+                "status": self._status,
+            }
+        )
+
+    def _encode(self, message: dict[str, Any]) -> bytes:
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+    async def _handle_spectator(self, _reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        spectator: Spectator = Spectator(writer, self.queue_size)
+        spectator.queue.put_nowait(self._get_snapshot_message())
+        self.spectators.add(spectator)
+
+        try:
+            while True:
+                data: bytes = await spectator.queue.get()
+                writer.write(data)
+                await asyncio.wait_for(writer.drain(), timeout=self.write_timeout)
+        except (TimeoutError, ConnectionError):
+            pass  # spectator disconnected or stopped reading
+        finally:
+            self.spectators.discard(spectator)
+            writer.close()
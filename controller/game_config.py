@@ -1,3 +1,8 @@
+import json
+
+from engine.uci_option import parse_option_assignment
+
+
 class GameConfig:
     def __init__(
         self,
@@ -5,11 +10,137 @@ class GameConfig:
         black_engine_path: str | None,
         engine_depth: int,
         ascii: bool,
+        fen: str | None,
+        profile_path: str | None,
+        cprofile_path: str | None,
+        log_path: str | None,
+        log_level: str,
+        cache_path: str | None,
+        cache_size: int,
+        broadcast_port: int | None,
+        move_timeout: float | None,
+        max_restarts: int,
+        max_fps: int,
+        index_path: str | None,
+        telemetry_path: str | None,
+        simul: int | None,
+        white_depth: int | None,
+        black_depth: int | None,
+        white_movetime: int | None,
+        black_movetime: int | None,
+        white_options: list[str] | None,
+        black_options: list[str] | None,
+        engine_options_path: str | None,
+        save_path: str | None,
+        resume_path: str | None,
+        analysis_engine_path: str | None,
+        analysis_prefetch: int,
     ):
         self.white_engine_path: str | None = white_engine_path
         self.black_engine_path: str | None = black_engine_path
         self.engine_depth: int = engine_depth
         self.ascii: bool = ascii
+        self.fen: str | None = fen
+        self.profile_path: str | None = profile_path
+        self.cprofile_path: str | None = cprofile_path
+        self.log_path: str | None = log_path
+        self.log_level: str = log_level
+        self.cache_path: str | None = cache_path
+        self.cache_size: int = cache_size
+        self.broadcast_port: int | None = broadcast_port
+        self.move_timeout: float | None = move_timeout
+        self.max_restarts: int = max_restarts
+        self.max_fps: int = max_fps
+        self.index_path: str | None = index_path
+        self.telemetry_path: str | None = telemetry_path
+        self.simul: int | None = simul
+
+        # search settings of each side, depth falls back to engine_depth, movetime replaces it
+        self.white_depth: int = white_depth or engine_depth
+        self.black_depth: int = black_depth or engine_depth
+        self.white_movetime: int | None = white_movetime
+        self.black_movetime: int | None = black_movetime
+
+        # game is saved to save_path after every move, and resumed from resume_path
+        self.save_path: str | None = save_path
+        self.resume_path: str | None = resume_path
+
+        # engine evaluating the viewed position, and the plies after it ahead of time
+        self.analysis_engine_path: str | None = analysis_engine_path
+        self.analysis_prefetch: int = analysis_prefetch
+
+        # 'setoption' values of each side, from the options file overridden by the command line
+        self.engine_options_path: str | None = engine_options_path
+        self.white_options: dict[str, str] = {}
+        self.black_options: dict[str, str] = {}
+        if self.engine_options_path:
+            self.load_engine_options(self.engine_options_path)
+        for name, value in map(parse_option_assignment, white_options or []):
+            self.white_options[name] = value
+        for name, value in map(parse_option_assignment, black_options or []):
+            self.black_options[name] = value
 
         if self.engine_depth <= 0:
             raise ValueError(f"Invalid engine depth of '{self.engine_depth}'")
+
+        for depth in (white_depth, black_depth):
+            if depth is not None and depth <= 0:
+                raise ValueError(f"Invalid engine depth of '{depth}'")
+
+        for movetime in (self.white_movetime, self.black_movetime):
+            if movetime is not None and movetime <= 0:
+                raise ValueError(f"Invalid engine move time of '{movetime}'")
+
+        if self.cache_size <= 0:
+            raise ValueError(f"Invalid cache size of '{self.cache_size}'")
+
+        if self.broadcast_port is not None and not 0 < self.broadcast_port < 65536:
+            raise ValueError(f"Invalid broadcast port '{self.broadcast_port}'")
+
+        if self.move_timeout is not None and self.move_timeout <= 0:
+            raise ValueError(f"Invalid move timeout of '{self.move_timeout}'")
+
+        if self.max_restarts < 0:
+            raise ValueError(f"Invalid maximum restarts of '{self.max_restarts}'")
+
+        if self.max_fps <= 0:
+            raise ValueError(f"Invalid maximum frames per second of '{self.max_fps}'")
+
+        if self.cprofile_path and not self.profile_path:
+            raise ValueError("cProfile output requires profiling to be enabled")
+
+        if self.analysis_prefetch < 0:
+            raise ValueError(f"Invalid number of prefetched plies '{self.analysis_prefetch}'")
+
+        if self.resume_path and self.fen:
+            raise ValueError("A resumed game continues from its saved position, not a FEN")
+
+        if self.simul is not None:
+            if self.simul <= 0:
+                raise ValueError(f"Invalid number of simul boards '{self.simul}'")
+            if not (self.white_engine_path and self.black_engine_path):
+                raise ValueError("A simul requires engines for both sides")
+            if self.profile_path or self.broadcast_port or self.telemetry_path:
+                raise ValueError("Profiling, broadcasting and telemetry cover a single game")
+            if self.save_path or self.resume_path or self.analysis_engine_path:
+                raise ValueError("Saving, resuming and analysis cover a single game")
+
+    def load_engine_options(self, path: str):
+        """
+        Reads 'setoption' values from JSON of options per side
+        e.g. {"white": {"Threads": 8, "Hash": 1024}, "black": {"Threads": 4}}
+        """
+        with open(path) as file:
+            sides: object = json.load(file)
+        if (
+            not isinstance(sides, dict)
+            or not set(sides) <= {"white", "black"}
+            or not all(isinstance(options, dict) for options in sides.values())
+        ):
+            raise ValueError(f"Engine options '{path}' must map 'white' and 'black' to options")
+
+        for side, options in sides.items():
+            for name, value in options.items():
+                if isinstance(value, bool):  # before str(), which would give "True"
+                    value = "true" if value else "false"
+                (self.white_options if side == "white" else self.black_options)[name] = str(value)
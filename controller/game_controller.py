@@ -1,48 +1,227 @@
+from __future__ import annotations
+
 import asyncio
+import time
+from typing import TYPE_CHECKING
 
-from .exceptions import EndGameException
-from .game_config import GameConfig
+from engine.search_result import SearchResult
 from engine.uci_engine import UCIEngine
 from model.board import Board
+from model.history import GameHistory
 from model.movement import Movement
+from model.repetition import RepetitionTracker
+from model.san import get_san
+from model.snapshot import BoardSnapshot
+from model.termination import Termination
+from util import log, logger
 from view.game_view import GameView
+from view.simul_view import BoardTile
+
+from .exceptions import EndGameException
+from .game_config import GameConfig
+
+# optional features, imported only when enabled so that they do not slow down startup
+if TYPE_CHECKING:
+    from engine.analyser import Analyser
+    from engine.eval_cache import EvalCache
+    from model.position_index import PositionIndex
+
+    from .broadcast_server import BroadcastServer
+    from .saved_game import SavedGame
+    from .telemetry import TelemetryRecorder
+
+# hot paths instrumented when profiling, as (class, method name, metric name)
+PROFILED_METHODS: list[tuple[type, str, str]] = [
+    (Board, "move_piece", "board.move_piece"),
+    (Board, "get_moveable_squares", "board.get_moveable_squares"),
+    (Board, "get_all_moveable_squares", "board.get_all_moveable_squares"),
+    (Board, "is_king_in_check", "board.is_king_in_check"),
+    (Board, "get_termination", "board.get_termination"),
+    (GameView, "draw_board", "view.render_frame"),
+    (GameView, "get_moveable_squares", "view.selection_move_generation"),
+    (UCIEngine, "get_move", "engine.move_latency"),
+]
 
 
 class GameController:
-    def __init__(self, config: GameConfig):
+    def __init__(self, config: GameConfig, tile: BoardTile | None = None):
         self.config: GameConfig = config
+        logger.configure(self.config.log_path, self.config.log_level)
+
+        # saved engine settings replace the configured ones, so load before creating engines
+        saved_game: SavedGame | None = None
+        if self.config.resume_path:
+            from .saved_game import SavedGame
+
+            saved_game = SavedGame.read(self.config.resume_path)
+            saved_game.apply_engine_settings(self.config)
+            log(f"Resuming game from '{self.config.resume_path}' at ply {saved_game.history.ply}")
+
+        self.cache: EvalCache | None = None
+        if self.config.cache_path:
+            from engine.eval_cache import EvalCache
+
+            self.cache = EvalCache(self.config.cache_path, self.config.cache_size)
 
         self.white_engine: UCIEngine | None = None
         if self.config.white_engine_path:
-            self.white_engine = UCIEngine(self.config.white_engine_path, self.config.engine_depth)
+            self.white_engine = UCIEngine(
+                self.config.white_engine_path,
+                self.config.white_depth,
+                self.cache,
+                self.config.move_timeout,
+                self.config.max_restarts,
+                self.config.white_movetime,
+                self.config.white_options,
+            )
 
         self.black_engine: UCIEngine | None = None
         if self.config.black_engine_path:
-            self.black_engine = UCIEngine(self.config.black_engine_path, self.config.engine_depth)
+            self.black_engine = UCIEngine(
+                self.config.black_engine_path,
+                self.config.black_depth,
+                self.cache,
+                self.config.move_timeout,
+                self.config.max_restarts,
+                self.config.black_movetime,
+                self.config.black_options,
+            )
 
-        self.board: Board = Board()
-        self.board.setup_pieces()
+        if saved_game:
+            self.board: Board = saved_game.board
+        elif self.config.fen:
+            self.board = Board.create_from_fen(self.config.fen)
+        else:
+            self.board = Board()
+            self.board.setup_pieces()
 
-        self.view: GameView = GameView(
-            self.board.deep_clone(), self.handle_human_movement, self.config
-        )
+        self.repetitions: RepetitionTracker = RepetitionTracker(self.board)
+        if saved_game:
+            self.repetitions.restore(saved_game.repetition_keys)
+
+        # the game may start from a finished position, e.g. a stalemate FEN,
+        # which is evaluated before the board is published
+        self.is_check: bool = False
+        self.update_termination(self.repetitions.get_count(self.board))
+
+        self.history: GameHistory = saved_game.history if saved_game else GameHistory(self.board)
+
+        # SAN of every move in the history, including moves that can be redone
+        self.move_texts: list[str] = saved_game.move_texts if saved_game else []
+
+        # a resumed game keeps being saved to its file, unless saved elsewhere
+        self.save_path: str | None = self.config.save_path or self.config.resume_path
+        self.engine_settings: dict[str, object] = {}
+        if self.save_path:
+            from .saved_game import SavedGame
+
+            self.engine_settings = SavedGame.get_engine_settings(self.config)
+
+        # boards are shared with the history and the view once published, so a board is
+        # only modified between being created by a move and being published
+        self.view: GameView | BoardTile
+        if tile:  # game is one board of a simul
+            tile.board = BoardSnapshot(self.board)
+            self.view = tile
+        else:
+            self.view = GameView(
+                BoardSnapshot(self.board),
+                self.handle_human_movement,
+                self.handle_takeback,
+                self.handle_redo,
+                self.handle_browse,
+                self.history,
+                self.config,
+            )
+
+        self.position_index: PositionIndex | None = None
+        if self.config.index_path:
+            from model.position_index import PositionIndex
+
+            self.position_index = PositionIndex(self.config.index_path)
+            self.update_archive_games()
+
+        self.analyser: Analyser | None = None
+        self.analysis_fen: str | None = None  # position being viewed, evaluated first
+        if self.config.analysis_engine_path:
+            from engine.analyser import Analyser
+
+            self.analyser = Analyser(
+                UCIEngine(
+                    self.config.analysis_engine_path,
+                    self.config.engine_depth,
+                    self.cache,
+                    self.config.move_timeout,
+                    self.config.max_restarts,
+                ),
+                self.config.analysis_prefetch,
+                self.handle_analysis,
+            )
+
+        self.telemetry: TelemetryRecorder | None = None
+        if self.config.telemetry_path:
+            from .telemetry import TelemetryRecorder
+
+            self.telemetry = TelemetryRecorder()
 
         self.movements_queue: list[Movement] = []
 
+        self.broadcast_server: BroadcastServer | None = None
+        if self.config.broadcast_port:
+            from .broadcast_server import BroadcastServer
+
+            self.broadcast_server = BroadcastServer("127.0.0.1", self.config.broadcast_port)
+            self.broadcast_game()
+
+        # set once every engine has completed its UCI handshake
+        self.engines_ready: asyncio.Event = asyncio.Event()
+
     def start(self):
-        asyncio.run(self.run_tasks())
+        try:
+            if self.config.profile_path:
+                from util.profiler import Profiler  # deferred as only needed when profiling
+
+                profiler: Profiler = Profiler(self.config.cprofile_path)
+                profiler.start(PROFILED_METHODS)
+                try:
+                    asyncio.run(self.run_tasks())
+                finally:
+                    profiler.stop()
+                    profiler.write_report(self.config.profile_path)
+            else:
+                asyncio.run(self.run_tasks())
+        finally:
+            self.report_engines()
+
+    def report_engines(self):
+        """Prints watchdog counters and telemetry after the terminal is restored"""
+        for engine in (self.white_engine, self.black_engine):
+            if engine:
+                log(engine.get_watchdog_report())
+                if engine.timeouts or engine.crashes:
+                    print(engine.get_watchdog_report())
+
+        if self.analyser:
+            log(self.analyser.get_report())
+
+        if self.telemetry and self.config.telemetry_path:
+            self.telemetry.write(self.config.telemetry_path)
+            if self.telemetry.moves:
+                log(f"Engine telemetry:\n{self.telemetry.get_report()}")
+                print(self.telemetry.get_report())
+
+        # the logger task has stopped, so these records are written here
+        logger.flush_sync()
 
     async def run_tasks(self):
+        if isinstance(self.view, BoardTile):
+            raise TypeError("Games of a simul are run by the SimulController")
+
         try:
             async with asyncio.TaskGroup() as group:
-                if self.white_engine:
-                    await self.white_engine.start()
-                    group.create_task(self.white_engine.idle())
-                if self.black_engine:
-                    await self.black_engine.start()
-                    group.create_task(self.black_engine.idle())
-                group.create_task(self.process_movements())
+                group.create_task(logger.run())
                 group.create_task(self.view.run())
+                group.create_task(self.run_game())
 
         except* EndGameException:  # raised by view upon user quitting
             pass
@@ -50,16 +229,61 @@ class GameController:
             for error in errors.exceptions:
                 raise error
 
+    async def run_game(self):
+        """Plays the game until cancelled, drawing it on whichever view the controller has"""
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self.run_engines())
+                group.create_task(self.process_movements())
+                if self.analyser:
+                    group.create_task(self.analyser.run())
+                if self.broadcast_server:
+                    group.create_task(self.broadcast_server.run())
+
+        except* Exception as errors:  # noqa: BLE001 - re-raised without the group
+            for error in errors.exceptions:
+                raise error
+        finally:
+            if self.cache:
+                await self.cache.close()
+            if self.position_index:
+                self.position_index.close()
+
+    async def run_engines(self):
+        """Starts engines concurrently, then keeps them alive until cancelled"""
+        engines: list[UCIEngine] = [
+            engine for engine in (self.white_engine, self.black_engine) if engine
+        ]
+
+        results: list[None | BaseException] = await asyncio.gather(
+            *(engine.start() for engine in engines), return_exceptions=True
+        )
+        errors: list[BaseException] = [result for result in results if result is not None]
+        if len(errors) != 0:
+            for engine in engines:
+                await engine.terminate()
+            raise errors[0]
+
+        self.engines_ready.set()
+        await asyncio.gather(*(engine.idle() for engine in engines))
+
     async def process_movements(self):
         try:
             # needed so that the view can draw the initial state of the board
             # before the movement made by an engine as white
             while not self.view.is_ready:
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(0.01)
+            await self.engines_ready.wait()
+            if self.history.ply:  # resumed game
+                await self.view.set_move_texts(self.move_texts[: self.history.ply])
+            await self.focus_analysis()
 
-            # setup first move
-            if self.white_engine:
-                self.movements_queue.append(await self.get_engine_movement(self.white_engine))
+            # setup first move, by the side to move as the game may start from any position
+            first_engine: UCIEngine | None = self.get_engine_to_move()
+            if self.board.game_over:
+                await self.view.disable_input()
+            elif first_engine:
+                self.movements_queue.append(await self.get_engine_movement(first_engine))
             else:
                 await self.view.enable_input()
 
@@ -69,27 +293,46 @@ class GameController:
                     continue
 
                 movement: Movement = self.movements_queue.pop(0)
+                apply_start_time: float = time.perf_counter()
+                log(f"Move {self.board.fullmove_number}: {movement}")
+                previous_board: Board = self.board
+                is_promotion: bool = self.board.is_promotion(movement)
                 self.board = self.board.move_piece(movement)
+                repetition_count: int = self.repetitions.push(self.board)
+                self.update_termination(repetition_count)
 
-                # fifty-move rule
-                if self.board.halfmove_clock > 100:
-                    self.board.game_over = True
-                elif self.board.is_king_in_checkmate(self.board.white_turn):
-                    self.board.game_over = True
+                del self.move_texts[self.history.ply :]
+                self.move_texts.append(
+                    get_san(
+                        previous_board,
+                        movement,
+                        self.is_check,
+                        self.board.termination == Termination.CHECKMATE,
+                        self.get_known_moveable_squares(previous_board),
+                    )
+                )
+                self.history.push(movement, self.board, is_promotion)
+                self.update_archive_games()
+                await self.focus_analysis()
+                await self.view.set_board(BoardSnapshot(self.board))
+                await self.view.append_move_text(self.move_texts[-1])
 
-                await self.view.set_board(self.board.deep_clone())
+                if self.broadcast_server:
+                    self.broadcast_server.publish_move(
+                        movement.to_algebraic(is_promotion), self.get_clocks()
+                    )
+                    self.broadcast_server.publish_status(self.get_status())
 
-                if self.board.game_over:
-                    await self.view.disable_input()
-                    break
+                self.save_game()
 
-                engine: UCIEngine | None = None
+                if self.telemetry:
+                    self.telemetry.add_apply_time(time.perf_counter() - apply_start_time)
 
-                if self.board.white_turn and self.white_engine:
-                    engine = self.white_engine
-                elif not self.board.white_turn and self.black_engine:
-                    engine = self.black_engine
+                if self.board.game_over:  # moves can still follow a takeback
+                    await self.view.disable_input()
+                    continue
 
+                engine: UCIEngine | None = self.get_engine_to_move()
                 if engine:
                     await self.view.disable_input()
                     self.movements_queue.append(await self.get_engine_movement(engine))
@@ -99,9 +342,166 @@ class GameController:
         except asyncio.CancelledError:
             raise
 
+    def update_termination(self, repetition_count: int):
+        """Ends the game if the position is terminal, otherwise clears an earlier end of it"""
+        self.is_check = self.board.is_king_in_check(self.board.white_turn)
+        self.board.game_over = False
+        self.board.termination = None
+
+        termination: Termination | None = self.board.get_termination()
+        if termination:
+            self.end_game(termination)
+        elif repetition_count >= 3:
+            self.end_game(Termination.THREEFOLD_REPETITION)
+
+    def get_known_moveable_squares(
+        self, board: Board
+    ) -> dict[tuple[int, int], set[tuple[int, int]]] | None:
+        """Legal moves the view has already computed for the board, i.e. for a human to move"""
+        if isinstance(self.view, GameView) and self.view.board.is_snapshot_of(board):
+            return self.view.all_moveable_squares
+        return None
+
+    def end_game(self, termination: Termination):
+        self.board.game_over = True
+        self.board.termination = termination
+        log(f"Game over by {termination.value}")
+
     async def get_engine_movement(self, engine: UCIEngine) -> Movement:
+        start_time: float = time.perf_counter()
         movement_text: str = await engine.get_move(self.board.fen_serialize())
-        return Movement.create_from_algebraic(movement_text)
+        movement: Movement = Movement.create_from_algebraic(movement_text)
+        if self.telemetry and engine.last_result:
+            self.telemetry.record(
+                self.history.ply + 1,
+                engine.path.name,
+                engine.last_result,
+                time.perf_counter() - start_time,
+            )
+        return movement
 
     async def handle_human_movement(self, movement: Movement):
         self.movements_queue.append(movement)
+
+    async def handle_takeback(self):
+        """Takes back moves until it is a human's turn again"""
+        plies: int = self.get_plies_per_human_turn()
+        if self.board.game_over and self.get_engine_to_move():
+            plies = 1  # game was ended by the human's move, which is the one taken back
+        if self.can_change_ply() and self.history.can_undo(plies):
+            await self.set_ply_board(self.history.undo(plies))
+
+    async def handle_redo(self):
+        plies: int = self.get_plies_per_human_turn()
+        if self.can_change_ply() and self.history.can_redo(plies):
+            await self.set_ply_board(self.history.redo(plies))
+
+    def get_plies_per_human_turn(self) -> int:
+        """Returns 1 if both sides are human, otherwise 2 plies to skip the engine's move"""
+        return 1 if self.white_engine is None and self.black_engine is None else 2
+
+    def get_engine_to_move(self) -> UCIEngine | None:
+        return self.white_engine if self.board.white_turn else self.black_engine
+
+    def can_change_ply(self) -> bool:
+        """
+        Ply can only change on a human's turn, before their move is processed,
+        or once a game with a human in it is over, e.g. to take back the final move
+        """
+        if len(self.movements_queue) != 0:
+            return False
+        if self.board.game_over:
+            return self.white_engine is None or self.black_engine is None
+        return self.get_engine_to_move() is None
+
+    async def set_ply_board(self, board: Board):
+        # boards of the history may be cached or published, so the termination is set on a copy
+        self.board = board.deep_clone()
+        first_ply: int = max(0, self.history.ply - self.board.halfmove_clock)
+        self.repetitions.rebuild(self.history.iterate_boards(first_ply, self.history.ply))
+        self.update_termination(self.repetitions.get_count(self.board))
+        log(f"Moved to ply {self.history.ply}")
+        if self.broadcast_server:
+            self.broadcast_game()
+
+        self.save_game()
+        self.update_archive_games()
+        await self.view.set_board(BoardSnapshot(self.board))
+        await self.view.set_move_texts(self.move_texts[: self.history.ply])
+        await self.focus_analysis()
+        if self.board.game_over:  # redone up to the final move
+            await self.view.disable_input()
+        else:
+            await self.view.enable_input()
+
+    async def handle_browse(self):
+        """Publishes the position the view browsed to, then has it analysed first"""
+        if not isinstance(self.view, GameView):
+            return
+
+        ply: int | None = self.view.browse_ply
+        browse_board: BoardSnapshot | None = None
+        if ply is not None:
+            browse_board = BoardSnapshot(self.history.get_board(ply))
+        await self.view.set_browse_board(browse_board)
+        await self.focus_analysis()
+
+    async def focus_analysis(self):
+        """Has the analyser evaluate the viewed position first, then the plies after it"""
+        if self.analyser is None or not isinstance(self.view, GameView):
+            return
+
+        ply: int = self.history.ply if self.view.browse_ply is None else self.view.browse_ply
+        last_ply: int = min(ply + self.analyser.prefetch, self.history.ply)
+        fens: list[str] = [
+            board.fen_serialize() for board in self.history.iterate_boards(ply, last_ply)
+        ]
+        self.analysis_fen = fens[0]
+        self.analyser.focus(fens)
+        await self.view.set_evaluation(self.analyser.results.get(self.analysis_fen))
+
+    async def handle_analysis(self, fen: str, result: SearchResult):
+        if fen == self.analysis_fen and isinstance(self.view, GameView):
+            await self.view.set_evaluation(result)
+
+    def save_game(self):
+        """Saves the game after every change, so that quitting at any point loses nothing"""
+        if self.save_path:
+            from .saved_game import SavedGame
+
+            SavedGame(
+                self.board,
+                self.history,
+                self.repetitions.get_keys(),
+                self.move_texts,
+                self.engine_settings,
+            ).write(self.save_path)
+
+    def update_archive_games(self):
+        """Looks up how many indexed games reached the current position, for the view to show"""
+        if self.position_index:
+            self.view.archive_games = self.position_index.count_games(self.board)
+
+    def broadcast_game(self):
+        """Sends the whole game to spectators, used at the start and when the ply changes"""
+        if self.broadcast_server:
+            self.broadcast_server.reset(
+                self.history.get_start_fen(),
+                self.history.get_algebraic_movements(),
+                self.get_clocks(),
+            )
+            self.broadcast_server.publish_status(self.get_status())
+
+    def get_clocks(self) -> dict[str, int]:
+        return {
+            "halfmove_clock": self.board.halfmove_clock,
+            "fullmove_number": self.board.fullmove_number,
+        }
+
+    def get_status(self) -> dict[str, str | bool | None]:
+        """Status sent to spectators, only published when it changes"""
+        return {
+            "check": self.is_check,
+            "game_over": self.board.game_over,
+            "termination": self.board.termination.value if self.board.termination else None,
+        }
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+
+from model.board import PACKED_BOARD, Board
+from model.history import GameHistory
+
+from .game_config import GameConfig
+
+MAGIC: bytes = b"CHSAVE01"
+
+# current ply and number of moves, then lengths of the start FEN, repetition keys,
+# move texts and engine settings, which follow the packed board and the move codes
+SECTIONS: struct.Struct = struct.Struct("<HHIIII")
+
+# game config fields saved with the game, so that it is resumed against the same engines
+ENGINE_SETTINGS: list[str] = [
+    "white_engine_path",
+    "black_engine_path",
+    "engine_depth",
+    "white_depth",
+    "black_depth",
+    "white_movetime",
+    "black_movetime",
+    "white_options",
+    "black_options",
+    "move_timeout",
+    "max_restarts",
+]
+
+
+class SavedGame:
+    """
+    Game in progress as a compact binary file: magic, sections, packed board, move codes,
+    then the texts. The current position is stored packed rather than replayed on load,
+    and earlier positions are only reconstructed by the history when stepped back to.
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        history: GameHistory,
+        repetition_keys: list[str],
+        move_texts: list[str],
+        engine_settings: dict[str, object],
+    ):
+        self.board: Board = board
+        self.history: GameHistory = history
+        self.repetition_keys: list[str] = repetition_keys
+        self.move_texts: list[str] = move_texts  # SAN of every stored move
+        self.engine_settings: dict[str, object] = engine_settings
+
+    @staticmethod
+    def get_engine_settings(config: GameConfig) -> dict[str, object]:
+        return {name: getattr(config, name) for name in ENGINE_SETTINGS}
+
+    def apply_engine_settings(self, config: GameConfig):
+        """Sets the saved engine settings on config, before the controller creates engines"""
+        for name in ENGINE_SETTINGS:
+            if name in self.engine_settings:
+                setattr(config, name, self.engine_settings[name])
+
+    @classmethod
+    def read(cls, path: str) -> SavedGame:
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"'{path}' is not a saved game")
+        if len(data) < len(MAGIC) + SECTIONS.size + PACKED_BOARD.size:
+            raise ValueError(f"Saved game '{path}' is truncated or corrupt")
+
+        offset: int = len(MAGIC)
+        sections: tuple[int, ...] = SECTIONS.unpack_from(data, offset)
+        ply, move_count, *text_lengths = sections
+        offset += SECTIONS.size
+
+        board: Board = Board.create_from_packed(data[offset : offset + PACKED_BOARD.size])
+        offset += PACKED_BOARD.size
+        codes: bytes = data[offset : offset + 2 * move_count]
+        offset += 2 * move_count
+
+        texts: list[str] = []
+        for length in text_lengths:
+            texts.append(data[offset : offset + length].decode())
+            offset += length
+        if offset != len(data):
+            raise ValueError(f"Saved game '{path}' is truncated or corrupt")
+        start_fen, repetition_keys, move_texts, engine_settings = texts
+
+        return cls(
+            board,
+            GameHistory.create_from_codes(start_fen, codes, ply, board),
+            repetition_keys.split("\n") if repetition_keys else [],
+            move_texts.split() if move_texts else [],
+            json.loads(engine_settings),
+        )
+
+    def write(self, path: str):
+        """Writes to a temporary file first, so that a crash never leaves a partial save"""
+        codes: bytes = self.history.get_codes()
+        texts: list[bytes] = [
+            self.history.get_start_fen().encode(),
+            "\n".join(self.repetition_keys).encode(),
+            " ".join(self.move_texts).encode(),
+            json.dumps(self.engine_settings).encode(),
+        ]
+        temporary_path: str = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(
+                b"".join(
+                    [
+                        MAGIC,
+                        SECTIONS.pack(
+                            self.history.ply, len(codes) // 2, *(len(text) for text in texts)
+                        ),
+                        self.board.pack(),
+                        codes,
+                        *texts,
+                    ]
+                )
+            )
+        os.replace(temporary_path, path)
@@ -0,0 +1,56 @@
+import asyncio
+import copy
+
+from util import logger
+from view.simul_view import SimulView
+
+from .exceptions import EndGameException
+from .game_config import GameConfig
+from .game_controller import GameController
+
+
+class SimulController:
+    """Plays several engine games at once, each by its own GameController shown as a tile"""
+
+    def __init__(self, config: GameConfig):
+        self.config: GameConfig = config
+        logger.configure(self.config.log_path, self.config.log_level)
+
+        self.view: SimulView = SimulView(self.config)
+        self.controllers: list[GameController] = []
+        for index in range(self.config.simul or 0):
+            board_config: GameConfig = copy.copy(self.config)
+            if index % 2 == 1:  # alternate colours, so that engines play both sides
+                # search settings belong to the engine, so they swap sides with it
+                board_config.white_engine_path = self.config.black_engine_path
+                board_config.black_engine_path = self.config.white_engine_path
+                board_config.white_depth = self.config.black_depth
+                board_config.black_depth = self.config.white_depth
+                board_config.white_movetime = self.config.black_movetime
+                board_config.black_movetime = self.config.white_movetime
+                board_config.white_options = self.config.black_options
+                board_config.black_options = self.config.white_options
+            self.controllers.append(
+                GameController(board_config, self.view.create_tile(board_config))
+            )
+
+    def start(self):
+        try:
+            asyncio.run(self.run_tasks())
+        finally:
+            for controller in self.controllers:
+                controller.report_engines()
+
+    async def run_tasks(self):
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(logger.run())
+                group.create_task(self.view.run())
+                for controller in self.controllers:
+                    group.create_task(controller.run_game())
+
+        except* EndGameException:  # raised by view upon user quitting
+            pass
+        except* Exception as errors:  # noqa: BLE001 - re-raised without the group
+            for error in errors.exceptions:
+                raise error
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import csv
+import json
+
+from engine.search_result import SearchResult
+from util.stats import get_percentile
+
+# statistics summarised with percentiles when the game ends
+SUMMARY_FIELDS: list[str] = ["engine_ms", "wall_ms", "overhead_ms", "depth", "seldepth", "nps"]
+
+
+class MoveTelemetry:
+    """Statistics of one engine move, from the engine's last 'info' line and our own timings"""
+
+    def __init__(self, ply: int, engine: str, result: SearchResult, wall_time: float):
+        self.ply: int = ply
+        self.engine: str = engine
+        self.move: str = result.best_move
+        self.cached: bool = result.time is None
+        self.depth: int = result.depth
+        self.seldepth: int | None = result.seldepth
+        self.nodes: int | None = result.nodes
+        self.nps: int | None = result.nps
+        self.hashfull: int | None = result.hashfull
+
+        # engine time is from 'go' to 'bestmove', wall time also includes our side of the
+        # exchange, and overhead is the difference plus applying the move once it arrives
+        self.engine_time: float = result.time or 0
+        self.wall_time: float = wall_time
+        self.overhead: float = wall_time - self.engine_time
+
+    def to_dict(self) -> dict[str, str | int | float | bool | None]:
+        return {
+            "ply": self.ply,
+            "engine": self.engine,
+            "move": self.move,
+            "cached": self.cached,
+            "depth": self.depth,
+            "seldepth": self.seldepth,
+            "nodes": self.nodes,
+            "nps": self.nps,
+            "hashfull": self.hashfull,
+            "engine_ms": self.engine_time * 1000,
+            "wall_ms": self.wall_time * 1000,
+            "overhead_ms": self.overhead * 1000,
+        }
+
+
+class TelemetryRecorder:
+    def __init__(self):
+        self.moves: list[MoveTelemetry] = []
+        self._pending: MoveTelemetry | None = None  # engine move not applied yet
+
+    def record(self, ply: int, engine: str, result: SearchResult, wall_time: float):
+        self._pending = MoveTelemetry(ply, engine, result, wall_time)
+        self.moves.append(self._pending)
+
+    def add_apply_time(self, seconds: float):
+        """Adds time taken to apply the move to its overhead, if it was an engine move"""
+        if self._pending:
+            self._pending.overhead += seconds
+            self._pending = None
+
+    def write(self, path: str):
+        """Writes every move as JSON if the path ends with .json, otherwise as CSV"""
+        rows: list[dict[str, str | int | float | bool | None]] = [
+            move.to_dict() for move in self.moves
+        ]
+        with open(path, "w", newline="") as file:
+            if path.endswith(".json"):
+                json.dump({"moves": rows, "summary": self.get_summary()}, file, indent=2)
+            elif rows:
+                writer: csv.DictWriter[str] = csv.DictWriter(file, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+
+    def get_summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Returns p50, p90, p99 and max of each summary field, per engine"""
+        summary: dict[str, dict[str, dict[str, float]]] = {}
+        for engine in dict.fromkeys(move.engine for move in self.moves):
+            rows: list[dict[str, str | int | float | bool | None]] = [
+                move.to_dict() for move in self.moves if move.engine == engine and not move.cached
+            ]
+            summary[engine] = {}
+            for field in SUMMARY_FIELDS:
+                ordered: list[float] = sorted(
+                    float(value) for row in rows if (value := row[field]) is not None
+                )
+                if ordered:
+                    summary[engine][field] = {
+                        "p50": get_percentile(ordered, 50),
+                        "p90": get_percentile(ordered, 90),
+                        "p99": get_percentile(ordered, 99),
+                        "max": ordered[-1],
+                    }
+        return summary
+
+    def get_report(self) -> str:
+        lines: list[str] = []
+        for engine, fields in self.get_summary().items():
+            lines.append(f"{engine}: {sum(move.engine == engine for move in self.moves)} moves")
+            lines.append(f"  {'':<12}{'p50':>12}{'p90':>12}{'p99':>12}{'max':>12}")
+            for field, percentiles in fields.items():
+                values: str = "".join(f"{value:>12.1f}" for value in percentiles.values())
+                lines.append(f"  {field:<12}{values}")
+        return "\n".join(lines)
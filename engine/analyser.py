@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from .search_result import SearchResult
+from .uci_engine import UCIEngine
+
+
+class Analyser:
+    """
+    Evaluates the position being viewed and the positions of the plies after it in the
+    background, so that stepping forward through a game shows their evaluations at once.
+    Positions wait on a bounded queue, which is refilled whenever the viewed ply changes,
+    and a search of a position no longer at or ahead of the viewed ply is cancelled.
+    """
+
+    def __init__(
+        self,
+        engine: UCIEngine,
+        prefetch: int,
+        send_result: Callable[[str, SearchResult], Awaitable[None]],
+    ):
+        self.engine: UCIEngine = engine
+        self.prefetch: int = prefetch  # plies evaluated ahead of the viewed one
+        self.send_result: Callable[[str, SearchResult], Awaitable[None]] = send_result
+
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=prefetch + 1)
+        self.results: dict[str, SearchResult] = {}  # by FEN
+        self.window: list[str] = []  # FEN of the viewed ply, then of the plies after it
+
+        self._search_fen: str | None = None
+        self._search_task: asyncio.Task[SearchResult] | None = None
+
+        self.cancelled_searches: int = 0
+
+    def focus(self, fens: list[str]):
+        """Replaces queued positions with those from the viewed ply onwards, nearest first"""
+        self.window = fens[: self.prefetch + 1]
+
+        # cancelled once, so that the search can stop the engine without being interrupted
+        search_task: asyncio.Task[SearchResult] | None = self._search_task
+        if search_task and not search_task.cancelling() and self._search_fen not in self.window:
+            search_task.cancel()  # user skipped past it
+        searching: bool = search_task is not None and not search_task.cancelling()
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        for fen in self.window:
+            if fen not in self.results and not (searching and fen == self._search_fen):
+                self.queue.put_nowait(fen)
+
+    async def run(self):
+        await self.engine.start()
+        try:
+            while True:
+                fen: str = await self.queue.get()
+                if fen in self.results:
+                    continue
+
+                self._search_fen = fen
+                self._search_task = asyncio.create_task(self.engine.search(fen))
+                try:
+                    result: SearchResult = await self._search_task
+                except asyncio.CancelledError:
+                    analyser_task: asyncio.Task[None] | None = asyncio.current_task()
+                    if analyser_task and analyser_task.cancelling():
+                        raise  # analyser itself is being cancelled
+                    self.cancelled_searches += 1
+                    continue
+                finally:
+                    self._search_fen = None
+                    self._search_task = None
+
+                self.results[fen] = result
+                await self.send_result(fen, result)
+        finally:
+            await self.engine.terminate()
+
+    def get_report(self) -> str:
+        return (
+            f"Analysis: {len(self.results)} position(s) evaluated, "
+            f"{self.cancelled_searches} search(es) cancelled"
+        )
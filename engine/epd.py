@@ -0,0 +1,207 @@
+"""
+Runs engines through an EPD test suite, checking their moves against 'bm' and 'am' operations.
+Every engine searches the positions concurrently with the others, optionally with several
+instances each, and solve rate, time to solution, nodes and nps are reported per engine.
+
+usage: python -m engine.epd SUITE -e PATH [-e PATH ...] [--depth N | --movetime MS]
+                            [--instances N] [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+from pathlib import Path
+
+from model.board import Board
+from model.movement import Movement
+from model.san import parse_san
+
+from .search_result import SearchResult
+from .uci_engine import UCIEngine
+
+OPERATION_PATTERN: re.Pattern[str] = re.compile(r'\s*(\w+)\s*((?:"[^"]*"|[^;"])*);')
+
+
+class EPDPosition:
+    def __init__(self, fen: str, operations: dict[str, str]):
+        self.fen: str = fen
+        self.operations: dict[str, str] = operations
+        self.id: str = operations.get("id", "").strip('"')
+
+        # answers converted from SAN to the long algebraic notation engines reply with
+        board: Board = Board.create_from_fen(fen)
+        self.best_moves: set[str] = self._get_moves(board, "bm")
+        self.avoid_moves: set[str] = self._get_moves(board, "am")
+
+    @classmethod
+    def create_from_epd(cls, line: str) -> EPDPosition:
+        fields: list[str] = line.split(maxsplit=4)
+        if len(fields) < 4:
+            raise ValueError(f"Invalid EPD '{line}'")
+
+        operations: dict[str, str] = {}
+        for match in OPERATION_PATTERN.finditer(fields[4] if len(fields) == 5 else ""):
+            operations[match.group(1)] = match.group(2).strip()
+
+        # move clocks are operations in EPD
+        fen: str = " ".join([*fields[:4], operations.get("hmvc", "0"), operations.get("fmvn", "1")])
+        return cls(fen, operations)
+
+    def is_solved_by(self, move: str) -> bool:
+        if self.best_moves and move not in self.best_moves:
+            return False
+        return move not in self.avoid_moves
+
+    def _get_moves(self, board: Board, operation: str) -> set[str]:
+        moves: set[str] = set()
+        for san in self.operations.get(operation, "").split():
+            try:
+                movement: Movement = parse_san(board, san)
+            except ValueError as error:
+                raise ValueError(f"Position '{self.id}': {error}")
+            moves.add(movement.to_algebraic(board.is_promotion(movement)))
+        return moves
+
+
+class EPDResult:
+    def __init__(self, engine: str, position: EPDPosition, result: SearchResult):
+        self.engine: str = engine
+        self.position: EPDPosition = position
+        self.result: SearchResult = result
+        self.solved: bool = position.is_solved_by(result.best_move)
+
+    def to_dict(self) -> dict[str, str | int | float | bool | None]:
+        return {
+            "engine": self.engine,
+            "id": self.position.id,
+            "fen": self.position.fen,
+            "best_move": self.result.best_move,
+            "solved": self.solved,
+            "depth": self.result.depth,
+            "score": self.result.score,
+            "nodes": self.result.nodes,
+            "time": self.result.time,
+            "time_to_solution": self.result.settled_time if self.solved else None,
+        }
+
+
+def read_suite(path: str) -> list[EPDPosition]:
+    with open(path) as file:
+        return [
+            EPDPosition.create_from_epd(line)
+            for line in file
+            if line.strip() and not line.startswith("#")
+        ]
+
+
+async def run_suite(
+    positions: list[EPDPosition],
+    engine_paths: list[str],
+    depth: int,
+    movetime: int | None = None,
+    instances: int = 1,
+) -> list[EPDResult]:
+    """Searches every position with every engine, each engine having its own queue of positions"""
+    results: list[EPDResult] = []
+
+    async def run_instance(engine: UCIEngine, queue: asyncio.Queue[EPDPosition]):
+        await engine.start()
+        try:
+            while not queue.empty():
+                position: EPDPosition = queue.get_nowait()
+                await engine.new_game()
+                results.append(
+                    EPDResult(str(engine.path), position, await engine.search(position.fen))
+                )
+        finally:
+            await engine.terminate()
+
+    async with asyncio.TaskGroup() as group:
+        for engine_path in engine_paths:
+            queue: asyncio.Queue[EPDPosition] = asyncio.Queue()
+            for position in positions:
+                queue.put_nowait(position)
+            for _ in range(instances):
+                engine: UCIEngine = UCIEngine(engine_path, depth, movetime=movetime)
+                group.create_task(run_instance(engine, queue))
+
+    # instances finish in any order, so sort for results that can be diffed between runs
+    suite_order: dict[int, int] = {id(position): index for index, position in enumerate(positions)}
+    results.sort(key=lambda result: (result.engine, suite_order[id(result.position)]))
+    return results
+
+
+def get_summaries(results: list[EPDResult]) -> dict[str, dict[str, float | int | None]]:
+    """Returns solve rate, mean time to solution, nodes and nps of each engine"""
+    summaries: dict[str, dict[str, float | int | None]] = {}
+    for engine in dict.fromkeys(result.engine for result in results):
+        engine_results: list[EPDResult] = [result for result in results if result.engine == engine]
+        solved: list[EPDResult] = [result for result in engine_results if result.solved]
+        nodes: int = sum(result.result.nodes or 0 for result in engine_results)
+        search_time: float = sum(result.result.time or 0 for result in engine_results)
+        summaries[engine] = {
+            "positions": len(engine_results),
+            "solved": len(solved),
+            "solve_rate": len(solved) / len(engine_results),
+            "mean_time_to_solution": (
+                sum(result.result.settled_time or 0 for result in solved) / len(solved)
+                if solved
+                else None
+            ),
+            "nodes": nodes,
+            "nps": nodes / search_time if search_time else None,
+        }
+    return summaries
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("suite_path", metavar="SUITE", help="EPD file of positions")
+    parser.add_argument(
+        "-e", "--engine", dest="engine_paths", action="append", required=True, metavar="PATH"
+    )
+    parser.add_argument("-d", "--depth", type=int, default=10, help="Search depth, default 10")
+    parser.add_argument("--movetime", type=int, help="Search time per position instead of depth")
+    parser.add_argument("--instances", type=int, default=1, help="Processes per engine")
+    parser.add_argument("--output", help="Write results as JSON to PATH", metavar="PATH")
+    args: argparse.Namespace = parser.parse_args()
+
+    positions: list[EPDPosition] = read_suite(args.suite_path)
+    results: list[EPDResult] = asyncio.run(
+        run_suite(positions, args.engine_paths, args.depth, args.movetime, args.instances)
+    )
+    summaries: dict[str, dict[str, float | int | None]] = get_summaries(results)
+
+    print(f"{'engine':<24}{'solved':>10}{'rate':>8}{'mean tts s':>12}{'nodes':>14}{'nps':>12}")
+    for engine, summary in summaries.items():
+        mean_time: float | None = summary["mean_time_to_solution"]
+        nps: float | None = summary["nps"]
+        print(
+            f"{Path(engine).name:<24}{summary['solved']:>5}/{summary['positions']:<4}"
+            f"{summary['solve_rate']:>8.1%}"
+            f"{'-' if mean_time is None else f'{mean_time:.3f}':>12}"
+            f"{summary['nodes']:>14}{'-' if nps is None else f'{nps:.0f}':>12}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "suite": args.suite_path,
+                    "depth": args.depth,
+                    "movetime": args.movetime,
+                    "engines": summaries,
+                    "positions": [result.to_dict() for result in results],
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
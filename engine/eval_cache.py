@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+from .search_result import SearchResult
+
+# cached results of an older layout are dropped rather than migrated
+SCHEMA_VERSION: int = 2
+
+
+class EvalCache:
+    """
+    Persistent SQLite cache of engine search results, keyed by engine name, search settings
+    and position (FEN without move clocks). Writes are queued and committed in batches from
+    a worker thread, and the least recently used entries are evicted once `max_entries` is
+    exceeded, using a running count of entries rather than counting the table.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, batch_size: int = 32):
+        self.max_entries: int = max_entries
+        self.batch_size: int = batch_size
+
+        # reads happen on the event loop and writes on a second connection in a worker
+        # thread, write-ahead logging lets reads go on while a batch is being written
+        self._connection: sqlite3.Connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self._connection:
+                self._connection.execute("DROP TABLE IF EXISTS evaluations")
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "engine TEXT NOT NULL, settings TEXT NOT NULL, position TEXT NOT NULL, "
+            "best_move TEXT NOT NULL, depth INTEGER NOT NULL, score TEXT, pv TEXT NOT NULL, "
+            "last_used REAL NOT NULL, PRIMARY KEY (engine, settings, position))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS evaluations_last_used ON evaluations (last_used)"
+        )
+        self._connection.commit()
+
+        self._writer: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._write_lock: threading.Lock = threading.Lock()
+        self._flushing: bool = False
+
+        # entries are only counted here, then the count is kept up to date by the writes
+        count_row: tuple[int] = self._connection.execute(
+            "SELECT COUNT(*) FROM evaluations"
+        ).fetchone()
+        self._count: int = count_row[0]
+
+        # results and hits waiting to be written, keyed by (engine, settings, position)
+        self._pending_results: dict[tuple[str, str, str], SearchResult] = {}
+        self._pending_hits: dict[tuple[str, str, str], float] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def normalize_fen(fen_text: str) -> str:
+        """Drops the move clocks, which do not change the evaluation"""
+        return " ".join(fen_text.split()[:4])
+
+    def get(self, engine: str, settings: str, fen_text: str, min_depth: int) -> SearchResult | None:
+        """Returns the deepest cached result searched to at least `min_depth`"""
+        key: tuple[str, str, str] = (engine, settings, self.normalize_fen(fen_text))
+
+        # a pending result may be shallower than one written earlier
+        result: SearchResult | None = self._pending_results.get(key)
+        row: tuple[str, int, str | None, str] | None = self._connection.execute(
+            "SELECT best_move, depth, score, pv FROM evaluations "
+            "WHERE engine = ? AND settings = ? AND position = ?",
+            key,
+        ).fetchone()
+        if row and (result is None or row[1] > result.depth):
+            result = SearchResult(*row)
+
+        if result is None or result.depth < min_depth:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._pending_hits[key] = time.time()
+        return result
+
+    async def put(self, engine: str, settings: str, fen_text: str, result: SearchResult):
+        key: tuple[str, str, str] = (engine, settings, self.normalize_fen(fen_text))
+        pending: SearchResult | None = self._pending_results.get(key)
+        if pending is None or result.depth >= pending.depth:
+            self._pending_results[key] = result
+
+        if not self._flushing and (
+            len(self._pending_results) + len(self._pending_hits) >= self.batch_size
+        ):
+            await self.flush()
+
+    async def flush(self):
+        """
+        Writes pending results and hits in a worker thread. They stay pending, so readable
+        by `get`, until written, and any replaced meanwhile are written by the next flush.
+        """
+        results: dict[tuple[str, str, str], SearchResult] = dict(self._pending_results)
+        hits: dict[tuple[str, str, str], float] = dict(self._pending_hits)
+        if len(results) == 0 and len(hits) == 0:
+            return
+
+        self._flushing = True
+        try:
+            await asyncio.to_thread(self._write, results, hits)
+        finally:
+            self._flushing = False
+
+        for key, result in results.items():
+            if self._pending_results.get(key) is result:
+                del self._pending_results[key]
+        for key, last_used in hits.items():
+            if self._pending_hits.get(key) == last_used:
+                del self._pending_hits[key]
+
+    async def close(self):
+        await self.flush()
+        with self._write_lock:  # a cancelled flush may still be writing
+            self._writer.close()
+        self._connection.close()
+
+    def _write(
+        self,
+        results: dict[tuple[str, str, str], SearchResult],
+        hits: dict[tuple[str, str, str], float],
+    ):
+        now: float = time.time()
+        with self._write_lock, self._writer:
+            inserted: int = self._writer.executemany(
+                "INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, result.best_move, result.depth, result.score, result.pv, now)
+                    for key, result in results.items()
+                ],
+            ).rowcount
+            # keep the deeper search if the position was already cached
+            self._writer.executemany(
+                "UPDATE evaluations SET best_move = ?, depth = ?, score = ?, pv = ?, "
+                "last_used = ? WHERE engine = ? AND settings = ? AND position = ? "
+                "AND depth <= ?",
+                [
+                    (
+                        result.best_move,
+                        result.depth,
+                        result.score,
+                        result.pv,
+                        now,
+                        *key,
+                        result.depth,
+                    )
+                    for key, result in results.items()
+                ],
+            )
+            self._writer.executemany(
+                "UPDATE evaluations SET last_used = ? "
+                "WHERE engine = ? AND settings = ? AND position = ?",
+                [(last_used, *key) for key, last_used in hits.items()],
+            )
+
+            self._count += inserted
+            if self._count > self.max_entries:
+                self._count -= self._writer.execute(
+                    "DELETE FROM evaluations WHERE rowid IN "
+                    "(SELECT rowid FROM evaluations ORDER BY last_used LIMIT ?)",
+                    (self._count - self.max_entries,),
+                ).rowcount
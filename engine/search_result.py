@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+# keywords of a UCI 'info' line followed by a single value
+SINGLE_VALUE_KEYWORDS: set[str] = {
+    "depth",
+    "seldepth",
+    "time",
+    "nodes",
+    "multipv",
+    "currmove",
+    "currmovenumber",
+    "hashfull",
+    "nps",
+    "tbhits",
+    "cpuload",
+}
+
+
+class SearchResult:
+    """Outcome of an engine search, from the 'bestmove' line and the last 'info' line"""
+
+    def __init__(
+        self,
+        best_move: str,
+        depth: int,
+        score: str | None = None,
+        pv: str = "",
+        nodes: int | None = None,
+        nps: int | None = None,
+        time: float | None = None,
+        settled_time: float | None = None,
+        seldepth: int | None = None,
+        hashfull: int | None = None,
+    ):
+        self.best_move: str = best_move
+        self.depth: int = depth
+        self.score: str | None = score  # e.g. "cp 34" or "mate -3"
+        self.pv: str = pv
+
+        # statistics of the search itself, not kept by the evaluation cache
+        self.nodes: int | None = nodes
+        self.nps: int | None = nps
+        self.time: float | None = time  # seconds from 'go' to 'bestmove'
+        self.settled_time: float | None = settled_time  # seconds until best move last changed
+        self.seldepth: int | None = seldepth
+        self.hashfull: int | None = hashfull  # permille
+
+
+def parse_info_line(line: str) -> dict[str, str]:
+    """
+    Parses UCI 'info' line into keyword and value pairs
+    e.g. "info depth 20 score cp 34 pv e2e4 e7e5" -> {"depth": "20", "score": "cp 34", ...}
+    """
+    tokens: list[str] = line.split()
+    info: dict[str, str] = {}
+    index: int = 1  # skip 'info'
+
+    while index < len(tokens):
+        keyword: str = tokens[index]
+        if keyword in ("pv", "string", "refutation", "currline"):  # consume rest of line
+            info[keyword] = " ".join(tokens[index + 1 :])
+            break
+        elif keyword == "score":
+            score_tokens: list[str] = tokens[index + 1 : index + 3]
+            index += 3
+            if index < len(tokens) and tokens[index] in ("lowerbound", "upperbound"):
+                score_tokens.append(tokens[index])
+                index += 1
+            info["score"] = " ".join(score_tokens)
+        elif keyword in SINGLE_VALUE_KEYWORDS and index + 1 < len(tokens):
+            info[keyword] = tokens[index + 1]
+            index += 2
+        else:
+            index += 1
+
+    return info
@@ -0,0 +1,218 @@
+"""
+Generates training positions from engine self-play, running several games at once.
+Only the engine processes search in parallel: the games share one event loop, so their board
+work (opening moves, move making, termination checks) runs on a single core between searches.
+Each game starts with a random number of random plies, then the engine plays both sides.
+Searched positions are sampled into a file of fixed-width records that readers can memory map
+and index directly: record i is at byte i * RECORD.size.
+
+usage: python -m engine.selfplay -e PATH [--games N] [--concurrency N] [--depth N | --movetime MS]
+                                 [--opening-plies MIN MAX] [--sample-rate P] [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import struct
+import time
+from typing import BinaryIO
+
+from model.board import PACKED_PIECE_CLASSES, Board
+from model.movement import Movement
+from model.pieces import Piece
+from model.repetition import RepetitionTracker
+from model.termination import Termination
+
+from .search_result import SearchResult
+from .uci_engine import UCIEngine, UCIEngineError
+
+# packed board of 4 bits per square, white to move, score for the side to move, game result
+RECORD: struct.Struct = struct.Struct("<32s?hb")
+
+# mate scores are stored beyond any centipawn score, closer to the limit for faster mates
+MATE_SCORE: int = 30_000
+MAX_CENTIPAWNS: int = 20_000
+
+
+def pack_board(board: Board) -> bytes:
+    """Packs squares in FEN order, from a8 to h1, two to a byte with the first in the low bits"""
+    return board.pack()[:32]  # pieces of the packed position, without its state
+
+
+def unpack_board(packed: bytes) -> dict[tuple[int, int], Piece]:
+    pieces: dict[tuple[int, int], Piece] = {}
+    for index in range(64):
+        code: int = (packed[index // 2] >> (4 * (index % 2))) & 0xF
+        if code:
+            pieces[(index % 8, index // 8)] = PACKED_PIECE_CLASSES[(code & 7) - 1](code < 8)
+    return pieces
+
+
+def get_score(score: str | None) -> int | None:
+    """Converts UCI score, e.g. "cp 34" or "mate -3", to a centipawn record value"""
+    if score is None:
+        return None
+    kind, value, *_ = score.split()
+    if kind == "mate":
+        plies: int = int(value)
+        return MATE_SCORE - plies if plies > 0 else -MATE_SCORE - plies
+    return max(-MAX_CENTIPAWNS, min(MAX_CENTIPAWNS, int(value)))
+
+
+class RecordWriter:
+    """Appends records to a file, buffering them until enough accumulate or time passes"""
+
+    def __init__(self, file: BinaryIO, buffer_records: int = 4096, flush_interval: float = 5):
+        self.file: BinaryIO = file
+        self.buffer: bytearray = bytearray()
+        self.buffer_size: int = buffer_records * RECORD.size
+        self.flush_interval: float = flush_interval
+        self.last_flush_time: float = time.perf_counter()
+        self.records_written: int = 0
+
+    def append(self, packed_board: bytes, white_turn: bool, score: int, result: int):
+        self.buffer += RECORD.pack(packed_board, white_turn, score, result)
+        self.records_written += 1
+        if (
+            len(self.buffer) >= self.buffer_size
+            or time.perf_counter() - self.last_flush_time >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+        self.last_flush_time = time.perf_counter()
+
+
+class SelfPlayGame:
+    def __init__(self, rng: random.Random, opening_plies: tuple[int, int], max_plies: int):
+        self.rng: random.Random = rng
+        self.board: Board = Board()
+        self.board.setup_pieces()
+        self.repetitions: RepetitionTracker = RepetitionTracker(self.board)
+        self.opening_plies: int = rng.randint(*opening_plies)
+        self.max_plies: int = max_plies
+        self.result: int = 0  # 1 if white won, -1 if black won, 0 for a draw
+
+        # packed board, white to move and score of sampled positions, labelled once finished
+        self.samples: list[tuple[bytes, bool, int]] = []
+
+    async def play(self, engine: UCIEngine, sample_rate: float):
+        # games end as soon as no legal movement is left, so there is always one to choose
+        for _ in range(self.opening_plies):
+            movements: list[Movement] = self.board.get_legal_movements(self.board.white_turn)
+            if self.move(self.rng.choice(movements)):
+                return
+
+        await engine.new_game()
+        for _ in range(self.max_plies):
+            result: SearchResult = await engine.search(self.board.fen_serialize())
+            if result.best_move in ("(none)", "0000"):
+                raise UCIEngineError(f"Engine found no move in '{self.board.fen_serialize()}'")
+
+            score: int | None = get_score(result.score)
+            if score is not None and self.rng.random() < sample_rate:
+                self.samples.append((pack_board(self.board), self.board.white_turn, score))
+            if self.move(Movement.create_from_algebraic(result.best_move)):
+                return
+
+    def move(self, movement: Movement) -> bool:
+        """Makes movement, returning whether it ends the game"""
+        self.board = self.board.move_piece(movement)
+        repetition_count: int = self.repetitions.push(self.board)
+        termination: Termination | None = self.board.get_termination()
+        if termination == Termination.CHECKMATE:
+            self.result = -1 if self.board.white_turn else 1
+        return termination is not None or repetition_count >= 3
+
+
+async def run_selfplay(
+    engine_path: str,
+    writer: RecordWriter,
+    games: int,
+    concurrency: int,
+    depth: int,
+    movetime: int | None = None,
+    opening_plies: tuple[int, int] = (4, 12),
+    max_plies: int = 300,
+    sample_rate: float = 1.0,
+    seed: int = 0,
+) -> dict[int, int]:
+    """Plays games with one engine process per concurrent game, returning counts of results"""
+    results: dict[int, int] = {1: 0, 0: 0, -1: 0}
+    game_indexes: list[int] = list(range(games))
+
+    async def run_worker():
+        engine: UCIEngine = UCIEngine(engine_path, depth, movetime=movetime)
+        await engine.start()
+        try:
+            while game_indexes:
+                # seeded by game rather than worker, so games do not depend on scheduling
+                game_index: int = game_indexes.pop(0)
+                game: SelfPlayGame = SelfPlayGame(
+                    random.Random(seed + game_index), opening_plies, max_plies
+                )
+                await game.play(engine, sample_rate)
+                for packed_board, white_turn, score in game.samples:
+                    writer.append(packed_board, white_turn, score, game.result)
+                results[game.result] += 1
+        finally:
+            await engine.terminate()
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(concurrency, games)):
+            group.create_task(run_worker())
+
+    return results
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-e", "--engine", dest="engine_path", required=True, metavar="PATH")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4, help="Games played at once")
+    parser.add_argument("-d", "--depth", type=int, default=8, help="Search depth, default 8")
+    parser.add_argument("--movetime", type=int, help="Search time per move instead of depth")
+    parser.add_argument(
+        "--opening-plies", type=int, nargs=2, default=(4, 12), metavar=("MIN", "MAX")
+    )
+    parser.add_argument("--max-plies", type=int, default=300, help="Adjudicate as draw after")
+    parser.add_argument("--sample-rate", type=float, default=1.0, help="Share of positions kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="selfplay.bin", help="Records are appended to PATH")
+    args: argparse.Namespace = parser.parse_args()
+
+    start_time: float = time.perf_counter()
+    with open(args.output, "ab") as file:
+        writer: RecordWriter = RecordWriter(file)
+        try:
+            results: dict[int, int] = asyncio.run(
+                run_selfplay(
+                    args.engine_path,
+                    writer,
+                    args.games,
+                    args.concurrency,
+                    args.depth,
+                    args.movetime,
+                    tuple(args.opening_plies),
+                    args.max_plies,
+                    args.sample_rate,
+                    args.seed,
+                )
+            )
+        finally:
+            writer.flush()  # records of finished games are kept if interrupted
+    elapsed: float = time.perf_counter() - start_time
+
+    print(f"Games: {args.games} (white {results[1]}, draw {results[0]}, black {results[-1]})")
+    print(f"Records: {writer.records_written} of {RECORD.size} bytes in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
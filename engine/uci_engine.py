@@ -1,24 +1,78 @@
+from __future__ import annotations
+
 import asyncio
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from util import log_async, logger
+
+from .search_result import SearchResult, parse_info_line
+from .uci_option import UCIOption
+
+if TYPE_CHECKING:
+    from .eval_cache import EvalCache  # only imported by the controller when caching
+
+
+# deadline for a move when none is configured, grows with the search depth
+MOVE_TIMEOUT_BASE: float = 30
+MOVE_TIMEOUT_PER_DEPTH: float = 10
+
+# time allowed for a 'bestmove' after 'stop', before the engine is restarted instead
+STOP_TIMEOUT: float = 5
 
 
 class UCIEngineError(Exception):
     pass
 
 
+class UCIEngineExitedError(UCIEngineError):
+    pass
+
+
 class UCIEngine:
-    def __init__(self, path: str, depth: int):
+    def __init__(
+        self,
+        path: str,
+        depth: int,
+        cache: EvalCache | None = None,
+        move_timeout: float | None = None,
+        max_restarts: int = 3,
+        movetime: int | None = None,
+        options: dict[str, str] | None = None,
+    ):
         self.path: Path = Path(path)
         self.depth: int = depth
+        self.movetime: int | None = movetime  # milliseconds, searches to depth when None
+        self.cache: EvalCache | None = cache
+        self.move_timeout: float | None = move_timeout
+        self.max_restarts: int = max_restarts
+        self.process: asyncio.subprocess.Process | None = None
+
+        # values for 'setoption', checked against the options the engine advertises
+        self.options: dict[str, str] = options or {}
+        self.advertised_options: dict[str, UCIOption] = {}  # by lowercase name
+
+        # result of the latest search, including cached ones
+        self.last_result: SearchResult | None = None
+
+        # set from 'go' until 'bestmove', so that a cancelled search can be stopped
+        self.searching: bool = False
+
+        # watchdog counters, reported when the game ends
+        self.timeouts: int = 0
+        self.crashes: int = 0
+        self.restarts: int = 0
 
     async def start(self):
+        self.searching = False
         try:
-            self.process: asyncio.subprocess.Process = await asyncio.wait_for(
+            self.process = await asyncio.wait_for(
                 asyncio.create_subprocess_exec(
                     program=self.path.resolve(),
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,  # never read, a full pipe would block
                 ),
                 timeout=5,
             )
@@ -26,7 +80,7 @@ class UCIEngine:
             raise UCIEngineError(f"Engine not found at '{self.path}'")
         except PermissionError:
             raise UCIEngineError(f"Permission denied for executing engine '{self.path}'")
-        except asyncio.TimeoutError:
+        except TimeoutError:
             raise UCIEngineError(f"Subprocess for engine '{self.path}' timed-out")
         except OSError:
             raise UCIEngineError(f"Unexpected OS error starting engine '{self.path}'")
@@ -46,14 +100,49 @@ class UCIEngine:
     async def _initialize_uci(self, timeout: float = 3):
         try:
             await asyncio.wait_for(self.write("uci"), timeout=timeout)
-            await asyncio.wait_for(self.wait_for("uciok"), timeout=timeout)
+            await asyncio.wait_for(self._read_options(), timeout=timeout)
+            await self._set_options()
             await asyncio.wait_for(self.write("ucinewgame"), timeout=timeout)
             await asyncio.wait_for(self.write("isready"), timeout=timeout)
             await asyncio.wait_for(self.wait_for("readyok"), timeout=timeout)
-        except asyncio.TimeoutError:
+        except TimeoutError:
             await self.terminate()
             raise UCIEngineError(f"Engine '{self.path}' did not respond to UCI initialisation")
 
+    async def _read_options(self):
+        """Reads reply to 'uci' up to 'uciok', keeping the options the engine advertises"""
+        self.advertised_options = {}
+        while True:
+            line: str = await self.read_line()
+            if line.startswith("uciok"):
+                return
+            if line.startswith("option "):
+                try:
+                    option: UCIOption = UCIOption.create_from_line(line)
+                except ValueError:
+                    await log_async(
+                        f"{self.path.name} advertised invalid option '{line}'", "warning"
+                    )
+                    continue
+                self.advertised_options[option.name.lower()] = option
+
+    async def _set_options(self):
+        for name, value in self.options.items():
+            option: UCIOption | None = self.advertised_options.get(name.lower())
+            if option is None:
+                await self.terminate()
+                raise UCIEngineError(f"Engine '{self.path}' has no option '{name}'")
+            try:
+                value = option.validate(value)
+            except ValueError as error:
+                await self.terminate()
+                raise UCIEngineError(f"Engine '{self.path}': {error}")
+
+            if option.type == "button":
+                await self.write(f"setoption name {option.name}")
+            else:
+                await self.write(f"setoption name {option.name} value {value}")
+
     async def idle(self):
         try:
             while True:
@@ -63,12 +152,24 @@ class UCIEngine:
             raise
 
     async def write(self, command: str):
-        self.stdin.write((command + "\n").encode())
-        await self.stdin.drain()
+        if logger.is_enabled_for("debug"):
+            await log_async(f"{self.path.name} < {command}", "debug")
+        if self.process is None or self.process.returncode is not None:
+            raise UCIEngineExitedError(f"Engine '{self.path}' is not running")
+        try:
+            self.stdin.write((command + "\n").encode())
+            await self.stdin.drain()
+        except ConnectionError:
+            raise UCIEngineExitedError(f"Engine '{self.path}' closed its input")
 
     async def read_line(self) -> str:
         line_bytes: bytes = await self.stdout.readline()
-        return line_bytes.decode().rstrip()
+        if len(line_bytes) == 0:  # end of file
+            raise UCIEngineExitedError(f"Engine '{self.path}' exited")
+        line: str = line_bytes.decode().rstrip()
+        if logger.is_enabled_for("debug"):
+            await log_async(f"{self.path.name} > {line}", "debug")
+        return line
 
     async def wait_for(self, text: str) -> str:
         while True:
@@ -76,18 +177,156 @@ class UCIEngine:
             if line.startswith(text):
                 return line
 
+    async def new_game(self):
+        """Tells the engine that following positions are unrelated, e.g. clearing its hash"""
+        await self.write("ucinewgame")
+        await self.write("isready")
+        await self.wait_for("readyok")
+
     async def get_move(self, fen_text: str) -> str:
+        return (await self.search(fen_text)).best_move
+
+    async def search(self, fen_text: str) -> SearchResult:
+        """
+        Searches position, using the evaluation cache first if there is one.
+        If the engine misses the move deadline or exits, it is restarted
+        and given the position again, up to `max_restarts` times.
+        """
+        if self.cache:
+            cached_result: SearchResult | None = self.cache.get(
+                self.path.name,
+                self.get_search_settings(),
+                fen_text,
+                self.depth if self.movetime is None else 0,  # any depth reached in movetime
+            )
+            if cached_result:
+                self.last_result = cached_result
+                return cached_result
+
+        await self.stop()  # in case an earlier search was cancelled while being stopped
+
+        attempt: int = 0
+        while True:
+            try:
+                result: SearchResult = await asyncio.wait_for(
+                    self._search(fen_text), timeout=self.get_move_timeout()
+                )
+                break
+            except TimeoutError:
+                self.timeouts += 1
+                await log_async(f"Engine '{self.path}' missed move deadline", "warning")
+            except asyncio.CancelledError:
+                await self.stop()
+                raise
+            except UCIEngineExitedError:
+                self.crashes += 1
+                code: int | None = self.process.returncode if self.process else None
+                await log_async(f"Engine '{self.path}' exited with code {code}", "warning")
+
+            if attempt == self.max_restarts:
+                raise UCIEngineError(
+                    f"Engine '{self.path}' failed to move after {self.max_restarts} restart(s)"
+                )
+            attempt += 1
+            await self.restart()
+
+        if self.cache:
+            await self.cache.put(self.path.name, self.get_search_settings(), fen_text, result)
+        self.last_result = result
+        return result
+
+    async def stop(self):
+        """Ends a search early and discards its result, leaving the engine ready for another"""
+        if not self.searching:
+            return
+        try:
+            await self.write("stop")
+            await asyncio.wait_for(self.wait_for("bestmove"), timeout=STOP_TIMEOUT)
+            self.searching = False
+        except (TimeoutError, UCIEngineExitedError):
+            await log_async(f"Engine '{self.path}' did not stop searching", "warning")
+            await self.restart()
+
+    def get_search_settings(self) -> str:
+        """Settings besides the depth that change results, which are cached separately"""
+        settings: list[str] = [] if self.movetime is None else [f"movetime={self.movetime}"]
+        settings.extend(f"{name.lower()}={value}" for name, value in sorted(self.options.items()))
+        return " ".join(settings)
+
+    def get_move_timeout(self) -> float:
+        if self.move_timeout is not None:
+            return self.move_timeout
+        if self.movetime is not None:
+            return MOVE_TIMEOUT_BASE + self.movetime / 1000
+        return MOVE_TIMEOUT_BASE + self.depth * MOVE_TIMEOUT_PER_DEPTH
+
+    async def restart(self):
+        self.restarts += 1
+        await log_async(f"Restarting engine '{self.path}'", "warning")
+        if self.process and self.process.returncode is None:
+            self.process.kill()  # may be unresponsive, so do not ask it to quit
+            await self.process.wait()
+        await self.start()
+
+    def get_watchdog_report(self) -> str:
+        return (
+            f"Engine '{self.path}': {self.timeouts} timeout(s), {self.crashes} crash(es), "
+            f"{self.restarts} restart(s)"
+        )
+
+    async def _search(self, fen_text: str) -> SearchResult:
         await self.write(f"position fen {fen_text}")
-        await self.write(f"go depth {self.depth}")
-        output: str = await self.wait_for("bestmove")
-        move: str = output.split(" ")[1]
-        return move
+        self.searching = True  # before writing, as 'go' is sent even if cancelled while draining
+        if self.movetime is not None:
+            await self.write(f"go movetime {self.movetime}")
+        else:
+            await self.write(f"go depth {self.depth}")
+        start_time: float = time.perf_counter()
+
+        info: dict[str, str] = {}
+        counters: dict[str, str] = {}  # latest statistics, which may come on their own lines
+        first_move: str = ""
+        settled_time: float = 0
+        while True:
+            line: str = await self.read_line()
+            if line.startswith("info"):
+                line_info: dict[str, str] = parse_info_line(line)
+                if "score" in line_info or "pv" in line_info:
+                    info = line_info
+                    pv_moves: list[str] = line_info.get("pv", "").split()
+                    if pv_moves and pv_moves[0] != first_move:
+                        first_move = pv_moves[0]
+                        settled_time = time.perf_counter() - start_time
+                counters.update(
+                    (key, line_info[key])
+                    for key in ("seldepth", "nodes", "nps", "hashfull")
+                    if key in line_info
+                )
+            elif line.startswith("bestmove"):
+                self.searching = False
+                break
+
+        search_time: float = time.perf_counter() - start_time
+        best_move: str = line.split(" ")[1]
+        statistics: dict[str, int] = {key: int(value) for key, value in counters.items()}
+        return SearchResult(
+            best_move,
+            int(info.get("depth", self.depth)),
+            info.get("score"),
+            info.get("pv", ""),
+            statistics.get("nodes"),
+            statistics.get("nps"),
+            search_time,
+            settled_time if first_move == best_move else search_time,
+            statistics.get("seldepth"),
+            statistics.get("hashfull"),
+        )
 
     async def terminate(self):
-        if self.process:
+        if self.process and self.process.returncode is None:
             try:
                 await self.write("quit")
                 await asyncio.wait_for(self.process.wait(), timeout=5)
-            except (asyncio.TimeoutError, OSError):
+            except (TimeoutError, OSError, UCIEngineExitedError):
                 self.process.kill()
                 await self.process.wait()
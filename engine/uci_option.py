@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+# keywords of a UCI 'option' line, the values between them may contain spaces
+OPTION_KEYWORDS: set[str] = {"name", "type", "default", "min", "max", "var"}
+
+
+class UCIOption:
+    """Option advertised by an engine in reply to 'uci', used to check values before sending"""
+
+    def __init__(
+        self,
+        name: str,
+        option_type: str,
+        default: str | None = None,
+        minimum: int | None = None,
+        maximum: int | None = None,
+        choices: list[str] | None = None,
+    ):
+        self.name: str = name
+        self.type: str = option_type  # check, spin, combo, button or string
+        self.default: str | None = default
+        self.minimum: int | None = minimum
+        self.maximum: int | None = maximum
+        self.choices: list[str] = choices or []  # values of a combo
+
+    @classmethod
+    def create_from_line(cls, line: str) -> UCIOption:
+        """
+        Parses UCI 'option' line
+        e.g. "option name Hash type spin default 16 min 1 max 33554432"
+        """
+        fields: dict[str, str] = {}
+        choices: list[str] = []
+        keyword: str | None = None
+        values: list[str] = []
+        for token in [*line.split()[1:], "name"]:  # trailing keyword flushes the last value
+            if token in OPTION_KEYWORDS and (keyword != "name" or token == "type"):
+                if keyword == "var":
+                    choices.append(" ".join(values))
+                elif keyword is not None:
+                    fields[keyword] = " ".join(values)
+                keyword, values = token, []
+            else:
+                values.append(token)
+
+        if "name" not in fields or "type" not in fields:
+            raise ValueError(f"Invalid UCI option '{line}'")
+
+        return cls(
+            fields["name"],
+            fields["type"],
+            fields.get("default"),
+            int(fields["min"]) if "min" in fields else None,
+            int(fields["max"]) if "max" in fields else None,
+            choices,
+        )
+
+    def validate(self, value: str) -> str:
+        """Returns value as sent by 'setoption', raising ValueError if the engine would reject it"""
+        match self.type:
+            case "spin":
+                try:
+                    number: int = int(value)
+                except ValueError:
+                    raise ValueError(f"Option '{self.name}' expects an integer, not '{value}'")
+                if (self.minimum is not None and number < self.minimum) or (
+                    self.maximum is not None and number > self.maximum
+                ):
+                    raise ValueError(
+                        f"Option '{self.name}' of '{value}' is outside "
+                        f"{self.minimum} to {self.maximum}"
+                    )
+                return str(number)
+            case "check":
+                if value.lower() not in ("true", "false"):
+                    raise ValueError(f"Option '{self.name}' expects true or false, not '{value}'")
+                return value.lower()
+            case "combo":
+                for choice in self.choices:
+                    if choice.lower() == value.lower():
+                        return choice
+                raise ValueError(f"Option '{self.name}' expects one of {', '.join(self.choices)}")
+            case "button":
+                if value:
+                    raise ValueError(f"Option '{self.name}' is a button and takes no value")
+                return value
+            case _:
+                return value
+
+
+def parse_option_assignment(assignment: str) -> tuple[str, str]:
+    """Splits "NAME=VALUE" given on the command line, e.g. "Threads=8" -> ("Threads", "8")"""
+    name, separator, value = assignment.partition("=")
+    if not separator or not name.strip():
+        raise ValueError(f"Invalid engine option '{assignment}', expected NAME=VALUE")
+    return name.strip(), value.strip()
@@ -0,0 +1,208 @@
+"""
+Vectorised attack, mobility and check features for many boards at once.
+Boards are packed into an (N, 12) array of uint64 bitboards, one per piece type and color,
+where bit `y * 8 + x` is set if the piece occupies square (x, y).
+Requires NumPy.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as error:
+    raise ImportError("model.batch requires NumPy, install it with 'pip install numpy'") from error
+
+from .board import Board
+from .pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+
+# plane index of each piece class, black pieces are offset by 6
+PIECE_PLANES: dict[type[Piece], int] = {Pawn: 0, Knight: 1, Bishop: 2, Rook: 3, Queen: 4, King: 5}
+
+KNIGHT_DIRECTIONS: list[tuple[int, int]] = [
+    (-1, -2),
+    (1, -2),
+    (2, -1),
+    (2, 1),
+    (-1, 2),
+    (1, 2),
+    (-2, -1),
+    (-2, 1),
+]
+KING_DIRECTIONS: list[tuple[int, int]] = [
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+]
+ROOK_DIRECTIONS: list[tuple[int, int]] = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS: list[tuple[int, int]] = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+FILE_MASKS: list[np.uint64] = [np.uint64(sum(1 << (y * 8 + x) for y in range(8))) for x in range(8)]
+RANK_MASKS: list[np.uint64] = [np.uint64(0xFF << (y * 8)) for y in range(8)]
+
+# number of set bits in each possible byte, used to count bits of whole bitboards
+BYTE_POPCOUNTS: npt.NDArray[np.uint8] = np.array(
+    [byte.bit_count() for byte in range(256)], dtype=np.uint8
+)
+
+
+class BoardBatch:
+    def __init__(self, bitboards: npt.NDArray[np.uint64], white_turn: npt.NDArray[np.bool_]):
+        self.bitboards: npt.NDArray[np.uint64] = bitboards
+        self.white_turn: npt.NDArray[np.bool_] = white_turn
+
+        self.white_occupancy: npt.NDArray[np.uint64] = np.bitwise_or.reduce(
+            bitboards[:, :6], axis=1
+        )
+        self.black_occupancy: npt.NDArray[np.uint64] = np.bitwise_or.reduce(
+            bitboards[:, 6:], axis=1
+        )
+        self.empty: npt.NDArray[np.uint64] = ~(self.white_occupancy | self.black_occupancy)
+
+    def __len__(self) -> int:
+        return len(self.bitboards)
+
+    @classmethod
+    def create_from_boards(cls, boards: Sequence[Board]) -> BoardBatch:
+        bitboards: npt.NDArray[np.uint64] = np.zeros((len(boards), 12), dtype=np.uint64)
+        white_turn: npt.NDArray[np.bool_] = np.zeros(len(boards), dtype=np.bool_)
+
+        for index, board in enumerate(boards):
+            masks: list[int] = [0] * 12
+            for (x, y), piece in board.get_pieces().items():
+                plane: int = PIECE_PLANES[type(piece)] + (0 if piece.is_white else 6)
+                masks[plane] |= 1 << (y * 8 + x)
+            bitboards[index] = masks
+            white_turn[index] = board.white_turn
+
+        return cls(bitboards, white_turn)
+
+    def get_planes(self) -> npt.NDArray[np.bool_]:
+        """Returns (N, 12, 64) array of piece occupancy, indexed by plane then square"""
+        bits: npt.NDArray[np.uint8] = np.unpackbits(
+            self.bitboards.astype("<u8").view(np.uint8), bitorder="little"
+        )
+        return bits.reshape(len(self), 12, 64).astype(np.bool_)
+
+    def get_attack_maps(self) -> npt.NDArray[np.uint64]:
+        """Returns (N, 2) bitboards of squares attacked by white and by black"""
+        return np.stack([self._get_attacks(True), self._get_attacks(False)], axis=1)
+
+    def get_attacked_squares(self) -> npt.NDArray[np.bool_]:
+        """Returns (N, 2, 64) array of squares attacked by white and by black"""
+        attack_maps: npt.NDArray[np.uint64] = self.get_attack_maps()
+        bits: npt.NDArray[np.uint8] = np.unpackbits(
+            attack_maps.astype("<u8").view(np.uint8), bitorder="little"
+        )
+        return bits.reshape(len(self), 2, 64).astype(np.bool_)
+
+    def get_in_check(self) -> npt.NDArray[np.bool_]:
+        """Returns (N, 2) array of whether the white and black kings are in check"""
+        white_in_check = (self.bitboards[:, 5] & self._get_attacks(False)) != 0
+        black_in_check = (self.bitboards[:, 11] & self._get_attacks(True)) != 0
+        return np.stack([white_in_check, black_in_check], axis=1)
+
+    def get_mobility(self) -> npt.NDArray[np.int64]:
+        """
+        Returns (N, 2) counts of pseudo-legal moves for white and black, matching the sum of
+        Piece.get_moveable_squares, i.e. without castling, en passant or check legality
+        """
+        return np.stack([self._get_mobility(True), self._get_mobility(False)], axis=1)
+
+    def _get_planes_for_color(self, is_white: bool) -> npt.NDArray[np.uint64]:
+        return self.bitboards[:, :6] if is_white else self.bitboards[:, 6:]
+
+    def _get_attacks(self, is_white: bool) -> npt.NDArray[np.uint64]:
+        planes: npt.NDArray[np.uint64] = self._get_planes_for_color(is_white)
+        attacks: npt.NDArray[np.uint64] = np.zeros(len(self), dtype=np.uint64)
+
+        pawn_direction: int = -1 if is_white else 1
+        for x_diff in (-1, 1):
+            attacks |= shift(planes[:, 0], x_diff, pawn_direction)
+
+        for direction in KNIGHT_DIRECTIONS:
+            attacks |= shift(planes[:, 1], *direction)
+        for direction in KING_DIRECTIONS:
+            attacks |= shift(planes[:, 5], *direction)
+
+        diagonal_sliders: npt.NDArray[np.uint64] = planes[:, 2] | planes[:, 4]
+        straight_sliders: npt.NDArray[np.uint64] = planes[:, 3] | planes[:, 4]
+        for sliders, directions in (
+            (diagonal_sliders, BISHOP_DIRECTIONS),
+            (straight_sliders, ROOK_DIRECTIONS),
+        ):
+            for direction in directions:
+                front: npt.NDArray[np.uint64] = sliders
+                for _ in range(7):
+                    front = shift(front, *direction)
+                    attacks |= front
+                    front = front & self.empty
+
+        return attacks
+
+    def _get_mobility(self, is_white: bool) -> npt.NDArray[np.int64]:
+        planes: npt.NDArray[np.uint64] = self._get_planes_for_color(is_white)
+        own: npt.NDArray[np.uint64] = self.white_occupancy if is_white else self.black_occupancy
+        enemy: npt.NDArray[np.uint64] = self.black_occupancy if is_white else self.white_occupancy
+        not_own: npt.NDArray[np.uint64] = ~own
+        mobility: npt.NDArray[np.int64] = np.zeros(len(self), dtype=np.int64)
+
+        # every direction maps each piece to a different square, so counts can be summed
+        pawn_direction: int = -1 if is_white else 1
+        start_rank: np.uint64 = RANK_MASKS[6 if is_white else 1]
+        single_pushes = shift(planes[:, 0], 0, pawn_direction) & self.empty
+        double_pushes = (
+            shift(
+                shift(planes[:, 0] & start_rank, 0, pawn_direction) & self.empty, 0, pawn_direction
+            )
+            & self.empty
+        )
+        mobility += popcount(single_pushes) + popcount(double_pushes)
+        for x_diff in (-1, 1):
+            mobility += popcount(shift(planes[:, 0], x_diff, pawn_direction) & enemy)
+
+        for direction in KNIGHT_DIRECTIONS:
+            mobility += popcount(shift(planes[:, 1], *direction) & not_own)
+        for direction in KING_DIRECTIONS:
+            mobility += popcount(shift(planes[:, 5], *direction) & not_own)
+
+        # a ray stops at the first piece, so rays of different sliders never overlap
+        for sliders, directions in (
+            (planes[:, 2], BISHOP_DIRECTIONS),
+            (planes[:, 3], ROOK_DIRECTIONS),
+            (planes[:, 4], BISHOP_DIRECTIONS + ROOK_DIRECTIONS),
+        ):
+            for direction in directions:
+                front: npt.NDArray[np.uint64] = sliders
+                for _ in range(7):
+                    front = shift(front, *direction)
+                    mobility += popcount(front & not_own)
+                    front = front & self.empty
+
+        return mobility
+
+
+def shift(bitboards: npt.NDArray[np.uint64], x_diff: int, y_diff: int) -> npt.NDArray[np.uint64]:
+    """Moves every set square by (x_diff, y_diff), dropping squares that leave the board"""
+    for column in range(8):
+        if not 0 <= column + x_diff < 8:
+            bitboards = bitboards & ~FILE_MASKS[column]
+
+    offset: int = y_diff * 8 + x_diff
+    if offset > 0:
+        return bitboards << np.uint64(offset)
+    else:
+        return bitboards >> np.uint64(-offset)
+
+
+def popcount(bitboards: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+    """Counts set squares of each bitboard"""
+    as_bytes: npt.NDArray[np.uint8] = bitboards.astype("<u8").view(np.uint8)
+    return BYTE_POPCOUNTS[as_bytes].reshape(len(bitboards), 8).sum(axis=1, dtype=np.int64)
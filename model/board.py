@@ -1,18 +1,48 @@
 from __future__ import annotations  # lazy loads type annotations
 import copy
+import struct
+from typing import ClassVar
 
 from .movement import Movement
 from .pieces import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from .termination import Termination
+
+# packed position of 4 bits per square, flags, en passant file, termination and move clocks
+PACKED_BOARD: struct.Struct = struct.Struct("<32sBbBHH")
+
+# square nibble is 1 + index of the piece class, plus 8 for black pieces, and 0 when empty
+PACKED_PIECE_CLASSES: list[type[Piece]] = [Pawn, Knight, Bishop, Rook, Queen, King]
+
+# flag bits of a packed position, castling rights as (flag, king square, rook square)
+WHITE_TURN_FLAG: int = 1
+GAME_OVER_FLAG: int = 1 << 1
+CASTLING_FLAGS: list[tuple[int, tuple[int, int], tuple[int, int]]] = [
+    (1 << 2, (4, 7), (7, 7)),
+    (1 << 3, (4, 7), (0, 7)),
+    (1 << 4, (4, 0), (7, 0)),
+    (1 << 5, (4, 0), (0, 0)),
+]
+TERMINATIONS: list[Termination] = list(Termination)
 
 
 class Board:
     width: int = 8
     height: int = 8
 
+    _fen_piece_classes: ClassVar[dict[str, type[Piece]]] = {
+        "p": Pawn,
+        "n": Knight,
+        "b": Bishop,
+        "r": Rook,
+        "q": Queen,
+        "k": King,
+    }
+
     def __init__(self):
         self._pieces: dict[tuple[int, int], Piece] = {}
         self.white_turn: bool = True
         self.game_over: bool = False
+        self.termination: Termination | None = None
 
         # keeps track of pawn two square movements for en passant
         # set to new position of moved pawn
@@ -22,6 +52,107 @@ class Board:
         self.halfmove_clock: int = 0
         self.fullmove_number: int = 1
 
+    @classmethod
+    def create_from_fen(cls, fen_text: str) -> Board:
+        """Creates board from a FEN string, e.g. to continue a game mid-way through"""
+        fields: list[str] = fen_text.split()
+        if len(fields) != 6:
+            raise ValueError(f"Invalid FEN '{fen_text}'")
+
+        placements, active_color, castling_rights, en_passant_target, halfmove, fullmove = fields
+        board: Board = cls()
+
+        rows: list[str] = placements.split("/")
+        if len(rows) != board.height:
+            raise ValueError(f"Invalid FEN piece placements '{placements}'")
+
+        for y, row in enumerate(rows):
+            x: int = 0
+            for character in row:
+                if character.isdigit():
+                    x += int(character)
+                    continue
+                if character.lower() not in cls._fen_piece_classes or x >= board.width:
+                    raise ValueError(f"Invalid FEN piece placements '{placements}'")
+
+                piece: Piece = cls._fen_piece_classes[character.lower()](character.isupper())
+                if isinstance(piece, Pawn):
+                    piece.has_moved = y != (6 if piece.is_white else 1)
+                elif isinstance(piece, (King, Rook)):
+                    piece.has_moved = True  # cleared below using castling rights
+                board._pieces[(x, y)] = piece
+                x += 1
+
+            if x != board.width:
+                raise ValueError(f"Invalid FEN piece placements '{placements}'")
+
+        if active_color not in ("w", "b"):
+            raise ValueError(f"Invalid FEN active color '{active_color}'")
+        board.white_turn = active_color == "w"
+
+        if castling_rights != "-":
+            for character in castling_rights:
+                if character.lower() not in ("k", "q"):
+                    raise ValueError(f"Invalid FEN castling rights '{castling_rights}'")
+                castling_row: int = 7 if character.isupper() else 0
+                rook_column: int = 7 if character.lower() == "k" else 0
+                for square in ((4, castling_row), (rook_column, castling_row)):
+                    if square in board._pieces:
+                        board._pieces[square].has_moved = False
+
+        if en_passant_target != "-":
+            target_square: tuple[int, int] = Movement.algebraic_to_square(en_passant_target)
+            if target_square[1] == 5:  # white pawn moved to fourth rank
+                board.pawn_double_move = (target_square[0], 4)
+            elif target_square[1] == 2:  # black pawn moved to fifth rank
+                board.pawn_double_move = (target_square[0], 3)
+            else:
+                raise ValueError(f"Invalid FEN en passant target '{en_passant_target}'")
+
+        try:
+            board.halfmove_clock = int(halfmove)
+            board.fullmove_number = int(fullmove)
+        except ValueError:
+            raise ValueError(f"Invalid FEN move clocks '{halfmove} {fullmove}'")
+
+        # raises if either king is missing
+        board._get_king_square(True)
+        board._get_king_square(False)
+
+        return board
+
+    @classmethod
+    def create_from_packed(cls, packed: bytes) -> Board:
+        """Creates board from the output of `pack`, without parsing any text"""
+        fields: tuple[bytes, int, int, int, int, int] = PACKED_BOARD.unpack(packed)
+        pieces, flags, en_passant_file, termination, halfmove, fullmove = fields
+        board: Board = cls()
+
+        for index in range(board.width * board.height):
+            code: int = (pieces[index // 2] >> (4 * (index % 2))) & 0xF
+            if code:
+                x, y = index % 8, index // 8
+                piece: Piece = PACKED_PIECE_CLASSES[(code & 7) - 1](code < 8)
+                if isinstance(piece, Pawn):
+                    piece.has_moved = y != (6 if piece.is_white else 1)
+                elif isinstance(piece, (King, Rook)):
+                    piece.has_moved = True  # cleared below using castling rights
+                board._pieces[(x, y)] = piece
+
+        for flag, king_square, rook_square in CASTLING_FLAGS:
+            if flags & flag:
+                board._pieces[king_square].has_moved = False
+                board._pieces[rook_square].has_moved = False
+
+        board.white_turn = bool(flags & WHITE_TURN_FLAG)
+        board.game_over = bool(flags & GAME_OVER_FLAG)
+        board.termination = TERMINATIONS[termination - 1] if termination else None
+        if en_passant_file >= 0:  # pawn of the side that just moved
+            board.pawn_double_move = (en_passant_file, 3 if board.white_turn else 4)
+        board.halfmove_clock = halfmove
+        board.fullmove_number = fullmove
+        return board
+
     def setup_pieces(self):
         """Setups chess board with standard configuration"""
         self._pieces = {}
@@ -69,6 +200,33 @@ class Board:
 
         return valid_squares
 
+    def get_all_moveable_squares(
+        self, is_white: bool
+    ) -> dict[tuple[int, int], set[tuple[int, int]]]:
+        """Returns legal target squares for every piece of the given color"""
+        all_moveable_squares: dict[tuple[int, int], set[tuple[int, int]]] = {}
+        for square in list(self._pieces):
+            if self._pieces[square].is_white == is_white:
+                all_moveable_squares[square] = self.get_moveable_squares(square)
+        return all_moveable_squares
+
+    def get_legal_movements(self, is_white: bool) -> list[Movement]:
+        """Returns every legal movement of a color, with one per promotion piece"""
+        movements: list[Movement] = []
+        for square, moveable_squares in self.get_all_moveable_squares(is_white).items():
+            for moveable_square in moveable_squares:
+                movement: Movement = Movement(square, moveable_square)
+                if self.is_promotion(movement):
+                    for promotion in (Queen, Rook, Bishop, Knight):
+                        movements.append(Movement(square, moveable_square, promotion))
+                else:
+                    movements.append(movement)
+        return movements
+
+    def is_promotion(self, movement: Movement) -> bool:
+        piece: Piece | None = self._pieces.get(movement.origin_square)
+        return isinstance(piece, Pawn) and movement.target_square[1] in (0, self.height - 1)
+
     def get_en_passant_movement(self, square: tuple[int, int]) -> set[tuple[int, int]]:
         movements: set[tuple[int, int]] = set()
         if isinstance(self._pieces[square], Pawn):
@@ -143,23 +301,80 @@ class Board:
         return True
 
     def is_king_in_check(self, is_white: bool) -> bool:
+        return self._is_square_attacked(self._pieces, self._get_king_square(is_white), not is_white)
+
+    def is_king_in_checkmate(self, is_white: bool) -> bool:
+        return self.is_king_in_check(is_white) and not self.has_legal_movement(is_white)
+
+    def has_legal_movement(self, is_white: bool) -> bool:
+        """
+        Returns whether a color has any legal movement, stopping at the first one found.
+        Movements are tried on a shallow copy of the pieces rather than a cloned board,
+        and castling is skipped as it is only legal if the king can step towards the rook.
+        """
         king_square: tuple[int, int] = self._get_king_square(is_white)
-        for square in self._pieces:
-            if self._pieces[square].is_white != is_white:
-                if king_square in self._pieces[square].get_moveable_squares(self._pieces, square):
+        for square, piece in self._pieces.items():
+            if piece.is_white != is_white:
+                continue
+
+            moveable_squares: set[tuple[int, int]] = piece.get_moveable_squares(
+                self._pieces, square
+            ).union(self.get_en_passant_movement(square))
+            for moveable_square in moveable_squares:
+                pieces: dict[tuple[int, int], Piece] = dict(self._pieces)
+                del pieces[square]
+                if (
+                    isinstance(piece, Pawn)
+                    and moveable_square[0] != square[0]
+                    and moveable_square not in self._pieces
+                ):
+                    del pieces[(moveable_square[0], square[1])]  # en passant capture
+                pieces[moveable_square] = piece
+
+                new_king_square: tuple[int, int] = (
+                    moveable_square if isinstance(piece, King) else king_square
+                )
+                if not self._is_square_attacked(pieces, new_king_square, not is_white):
                     return True
+
         return False
 
-    def is_king_in_checkmate(self, is_white: bool) -> bool:
-        if not self.is_king_in_check(is_white):
-            return False
+    def is_insufficient_material(self) -> bool:
+        """
+        Returns whether neither side can checkmate by any sequence of legal moves,
+        i.e. kings with at most one minor piece, or with bishops all on one square color
+        """
+        minor_pieces: list[tuple[tuple[int, int], Piece]] = []
+        for square, piece in self._pieces.items():
+            if isinstance(piece, (Pawn, Rook, Queen)):
+                return False
+            if not isinstance(piece, King):
+                minor_pieces.append((square, piece))
 
-        for square in self._pieces:
-            if self._pieces[square].is_white == is_white:
-                if len(self.get_moveable_squares(square)) != 0:
-                    return False
+        if len(minor_pieces) <= 1:
+            return True
+        return all(isinstance(piece, Bishop) for _, piece in minor_pieces) and (
+            len({(x + y) % 2 for (x, y), _ in minor_pieces}) == 1
+        )
 
-        return True
+    def get_termination(self, claim_fifty_move: bool = True) -> Termination | None:
+        """
+        Returns how the game ends in this position, if it does, with checkmate taking
+        precedence over the move rules. The fifty-move rule is treated as claimed
+        unless `claim_fifty_move` is False, leaving only the seventy-five-move rule.
+        Repetitions depend on earlier positions, so are left to a RepetitionTracker.
+        """
+        if self.is_insufficient_material():
+            return Termination.INSUFFICIENT_MATERIAL
+        if not self.has_legal_movement(self.white_turn):
+            if self.is_king_in_check(self.white_turn):
+                return Termination.CHECKMATE
+            return Termination.STALEMATE
+        if self.halfmove_clock >= 150:
+            return Termination.SEVENTY_FIVE_MOVE
+        if claim_fifty_move and self.halfmove_clock >= 100:
+            return Termination.FIFTY_MOVE
+        return None
 
     def move_piece(self, movement: Movement) -> Board:
         new_board: Board = self.deep_clone()
@@ -167,7 +382,9 @@ class Board:
         if movement.origin_square not in self._pieces:
             raise Exception(f"Piece not found at {movement.origin_square}")
 
-        if isinstance(new_board._pieces[movement.origin_square], Pawn):
+        # checked before moving, as a promotion replaces the pawn
+        is_pawn_movement: bool = isinstance(new_board._pieces[movement.origin_square], Pawn)
+        if is_pawn_movement:
             new_board.pawn_movement(
                 movement.origin_square, movement.target_square, movement.pawn_promotion
             )
@@ -178,7 +395,7 @@ class Board:
             new_board.king_movement(movement.origin_square, movement.target_square)
 
         # fifty move rule
-        if isinstance(new_board._pieces[movement.origin_square], Pawn):
+        if is_pawn_movement:
             new_board.halfmove_clock = 0
         elif movement.target_square in new_board._pieces:
             new_board.halfmove_clock = 0
@@ -244,6 +461,9 @@ class Board:
     def set_pieces(self, pieces: dict[tuple[int, int], Piece]):
         self._pieces = pieces
 
+    def get_king_square(self, is_white: bool) -> tuple[int, int]:
+        return self._get_king_square(is_white)
+
     def deep_clone(self) -> Board:
         return copy.deepcopy(self)
 
@@ -258,6 +478,57 @@ class Board:
         ]
         return " ".join(fen_strings)
 
+    def pack(self) -> bytes:
+        """Packs the position into PACKED_BOARD.size bytes, squares in FEN order from a8"""
+        pieces: bytearray = bytearray(32)
+        for (x, y), piece in self._pieces.items():
+            index: int = y * 8 + x
+            code: int = PACKED_PIECE_CLASSES.index(type(piece)) + 1 + (0 if piece.is_white else 8)
+            pieces[index // 2] |= code << (4 * (index % 2))
+
+        flags: int = WHITE_TURN_FLAG if self.white_turn else 0
+        if self.game_over:
+            flags |= GAME_OVER_FLAG
+        for flag, king_square, rook_square in CASTLING_FLAGS:
+            is_white: bool = king_square[1] == 7
+            valid_king: bool = self._is_castling_piece_valid(king_square, King, is_white)
+            if valid_king and self._is_castling_piece_valid(rook_square, Rook, is_white):
+                flags |= flag
+
+        return PACKED_BOARD.pack(
+            bytes(pieces),
+            flags,
+            -1 if self.pawn_double_move is None else self.pawn_double_move[0],
+            TERMINATIONS.index(self.termination) + 1 if self.termination else 0,
+            self.halfmove_clock,
+            self.fullmove_number,
+        )
+
+    def get_position_key(self) -> str:
+        """
+        Returns key identifying the position for repetition purposes,
+        i.e. FEN without move clocks and with en passant only if it can be captured
+        """
+        en_passant_target: str = "-"
+        if self.pawn_double_move is not None:
+            for x_diff in (-1, 1):
+                square: tuple[int, int] = (
+                    self.pawn_double_move[0] + x_diff,
+                    self.pawn_double_move[1],
+                )
+                if square in self._pieces:
+                    piece: Piece = self._pieces[square]
+                    if isinstance(piece, Pawn) and piece.is_white == self.white_turn:
+                        en_passant_target = self._get_fen_en_passant_target()
+
+        key_strings: list[str] = [
+            self._get_fen_piece_placements(),
+            self._get_fen_active_color(),
+            self._get_fen_castling_rights(),
+            en_passant_target,
+        ]
+        return " ".join(key_strings)
+
     def _get_fen_piece_placements(self) -> str:
         row_strings: list[str] = []
         for row in range(self.height):
@@ -355,6 +626,16 @@ class Board:
 
         return f"{column}{row}"
 
+    def _is_square_attacked(
+        self, pieces: dict[tuple[int, int], Piece], square: tuple[int, int], by_white: bool
+    ) -> bool:
+        for attacker_square, piece in pieces.items():
+            if piece.is_white == by_white and square in piece.get_moveable_squares(
+                pieces, attacker_square
+            ):
+                return True
+        return False
+
     def _get_king_square(self, is_white: bool) -> tuple[int, int]:
         for square in self._pieces:
             piece: Piece = self._pieces[square]
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterator
+
+from .board import Board
+from .movement import Movement
+from .pieces import Bishop, Knight, Piece, Queen, Rook
+
+# promotion piece stored in bits 12-13 of a move code, bit 14 is set if the move promotes
+PROMOTION_CLASSES: list[type[Piece]] = [Queen, Rook, Bishop, Knight]
+PROMOTION_FLAG: int = 1 << 14
+
+
+class GameHistory:
+    """
+    Stores the moves of a game as packed 16-bit codes, with a FEN checkpoint every
+    `checkpoint_interval` plies. Any position is reconstructed by replaying from
+    the nearest checkpoint, so a long game only takes a few kilobytes.
+    Moves after the current ply are kept after an undo so they can be redone.
+    """
+
+    def __init__(self, board: Board, checkpoint_interval: int = 16):
+        self.checkpoint_interval: int = checkpoint_interval
+
+        self._codes: array[int] = array("H")
+        self._checkpoints: dict[int, str] = {0: board.fen_serialize()}
+
+        # most recently reconstructed position, as (ply, board)
+        self._cached: tuple[int, Board] = (0, board)
+
+        self.ply: int = 0
+
+    @classmethod
+    def create_from_codes(
+        cls,
+        start_fen: str,
+        codes: bytes,
+        ply: int,
+        board: Board,
+        checkpoint_interval: int = 16,
+    ) -> GameHistory:
+        """
+        Restores history from the output of `get_codes`, given the position at `ply`,
+        so that no moves are replayed until an earlier position is needed
+        """
+        history: GameHistory = cls(board, checkpoint_interval)
+        history._codes.frombytes(codes)
+        if sys.byteorder == "big":
+            history._codes.byteswap()
+        if not 0 <= ply <= len(history._codes):
+            raise ValueError(f"Ply {ply} outside of history of {len(history._codes)} moves")
+
+        history._checkpoints = {0: start_fen}
+        history._cached = (ply, board)
+        history.ply = ply
+        return history
+
+    def __len__(self) -> int:
+        """Number of stored moves, including any that can be redone"""
+        return len(self._codes)
+
+    @staticmethod
+    def pack_movement(movement: Movement, is_promotion: bool = False) -> int:
+        origin: int = movement.origin_square[1] * 8 + movement.origin_square[0]
+        target: int = movement.target_square[1] * 8 + movement.target_square[0]
+        promotion: int = PROMOTION_CLASSES.index(movement.pawn_promotion)
+        return origin | target << 6 | promotion << 12 | (PROMOTION_FLAG if is_promotion else 0)
+
+    @staticmethod
+    def unpack_movement(code: int) -> Movement:
+        origin: int = code & 0x3F
+        target: int = code >> 6 & 0x3F
+        return Movement(
+            (origin % 8, origin // 8),
+            (target % 8, target // 8),
+            PROMOTION_CLASSES[code >> 12 & 0x3],
+        )
+
+    def push(self, movement: Movement, new_board: Board, is_promotion: bool = False):
+        """Records movement made from the current ply, discarding any redoable moves"""
+        if self.ply < len(self._codes):
+            del self._codes[self.ply :]
+            for ply in [ply for ply in self._checkpoints if ply > self.ply]:
+                del self._checkpoints[ply]
+
+        self._codes.append(self.pack_movement(movement, is_promotion))
+        self.ply += 1
+        self._cached = (self.ply, new_board)
+        if self.ply % self.checkpoint_interval == 0:
+            self._checkpoints[self.ply] = new_board.fen_serialize()
+
+    def get_codes(self) -> bytes:
+        """Returns every stored move as little-endian 16-bit codes, e.g. to save the game"""
+        if sys.byteorder == "big":
+            codes: array[int] = array("H", self._codes)
+            codes.byteswap()
+            return codes.tobytes()
+        return self._codes.tobytes()
+
+    def get_start_fen(self) -> str:
+        return self._checkpoints[0]
+
+    def get_movement(self, index: int) -> Movement:
+        """Returns the movement that was made from ply `index`"""
+        return self.unpack_movement(self._codes[index])
+
+    def get_movements(self) -> list[Movement]:
+        return [self.unpack_movement(code) for code in self._codes[: self.ply]]
+
+    def get_algebraic_movements(self) -> list[str]:
+        """Returns movements up to the current ply in long algebraic notation"""
+        return [
+            self.unpack_movement(code).to_algebraic(bool(code & PROMOTION_FLAG))
+            for code in self._codes[: self.ply]
+        ]
+
+    def get_board(self, ply: int) -> Board:
+        if not 0 <= ply <= len(self._codes):
+            raise IndexError(f"Ply {ply} outside of history of {len(self._codes)} moves")
+
+        # start from the cached position, unless a checkpoint is closer
+        start_ply, board = self._cached
+        if start_ply > ply or ply - start_ply > self.checkpoint_interval:
+            checkpoint_ply: int = ply - ply % self.checkpoint_interval
+            while checkpoint_ply not in self._checkpoints:
+                checkpoint_ply -= self.checkpoint_interval
+            if start_ply > ply or checkpoint_ply > start_ply:
+                start_ply = checkpoint_ply
+                board = Board.create_from_fen(self._checkpoints[checkpoint_ply])
+
+        for replayed_board in self._replay(board, start_ply, ply):
+            board = replayed_board
+
+        self._cached = (ply, board)
+        return board
+
+    def iterate_boards(self, start_ply: int, end_ply: int) -> Iterator[Board]:
+        """Yields the positions from `start_ply` to `end_ply` inclusive"""
+        board: Board = self.get_board(start_ply)
+        yield board
+        yield from self._replay(board, start_ply, end_ply)
+
+    def can_undo(self, plies: int = 1) -> bool:
+        return self.ply - plies >= 0
+
+    def can_redo(self, plies: int = 1) -> bool:
+        return self.ply + plies <= len(self._codes)
+
+    def undo(self, plies: int = 1) -> Board:
+        if not self.can_undo(plies):
+            raise IndexError(f"Cannot undo {plies} plies from ply {self.ply}")
+        self.ply -= plies
+        return self.get_board(self.ply)
+
+    def redo(self, plies: int = 1) -> Board:
+        if not self.can_redo(plies):
+            raise IndexError(f"Cannot redo {plies} plies from ply {self.ply}")
+        self.ply += plies
+        return self.get_board(self.ply)
+
+    def _replay(self, board: Board, start_ply: int, end_ply: int) -> Iterator[Board]:
+        """Yields positions after each move from `start_ply`, filling in missing checkpoints"""
+        for ply in range(start_ply, end_ply):
+            board = board.move_piece(self.unpack_movement(self._codes[ply]))
+            if (ply + 1) % self.checkpoint_interval == 0 and ply + 1 not in self._checkpoints:
+                self._checkpoints[ply + 1] = board.fen_serialize()
+            yield board
@@ -28,6 +28,8 @@ class Movement:
         if len(notation) == 5:
             promotion: type[Piece] = Queen
             match notation[4]:
+                case "q":
+                    promotion = Queen
                 case "r":
                     promotion = Rook
                 case "b":
@@ -42,6 +44,17 @@ class Movement:
         else:
             return cls(origin_square, target_square)
 
+    def to_algebraic(self, is_promotion: bool = False) -> str:
+        """
+        Converts movement to long algebraic notation used by UCI
+        e.g. Movement((4, 6), (4, 4)) -> "e2e4"
+        """
+        notation: str = Movement.square_to_algebraic(self.origin_square)
+        notation += Movement.square_to_algebraic(self.target_square)
+        if is_promotion:
+            notation += self.pawn_promotion._character
+        return notation
+
     @staticmethod
     def algebraic_to_square(coordinate_pair: str) -> tuple[int, int]:
         """
@@ -52,3 +65,14 @@ class Movement:
         row: int = 8 - int(coordinate_pair[1])
 
         return (column, row)
+
+    @staticmethod
+    def square_to_algebraic(square: tuple[int, int]) -> str:
+        """
+        Converts square tuple to algebraic coordinate pair
+        e.g. tuple(4, 2) -> "e6"
+        """
+        column: str = chr(square[0] + 97)  # 97 is code for 'a'
+        row: str = str(8 - square[1])
+
+        return f"{column}{row}"
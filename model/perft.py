@@ -0,0 +1,129 @@
+"""
+Perft move generator validation, counting the leaf positions reachable at a given depth.
+The parallel mode splits the first plies across a process pool, sending positions to
+workers as FEN strings and moves in long algebraic notation.
+
+usage: python -m model.perft [--fen FEN] [--depth N] [--workers N] [--split-depth N] [--compare]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .board import Board
+from .movement import Movement
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+class PerftMismatchError(Exception):
+    pass
+
+
+def perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+
+    movements: list[Movement] = board.get_legal_movements(board.white_turn)
+    if depth == 1:  # bulk count leaves
+        return len(movements)
+
+    return sum(perft(board.move_piece(movement), depth - 1) for movement in movements)
+
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    """Returns perft count below each root movement"""
+    counts: dict[str, int] = {}
+    for movement in board.get_legal_movements(board.white_turn):
+        notation: str = movement.to_algebraic(board.is_promotion(movement))
+        counts[notation] = perft(board.move_piece(movement), depth - 1)
+    return counts
+
+
+def parallel_divide(
+    fen_text: str, depth: int, workers: int | None = None, split_depth: int = 1
+) -> dict[str, int]:
+    """
+    Same as divide, but each sequence of `split_depth` movements is counted in a worker
+    process. Splitting at the second ply gives smaller, better balanced jobs.
+    """
+    split_depth = max(1, min(split_depth, depth))
+    sequences: list[list[str]] = _get_movement_sequences(
+        Board.create_from_fen(fen_text), split_depth
+    )
+
+    counts: dict[str, int] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _perft_after_movements,
+            [fen_text] * len(sequences),
+            sequences,
+            [depth - split_depth] * len(sequences),
+            chunksize=max(1, len(sequences) // ((workers or os.cpu_count() or 1) * 4)),
+        )
+        for sequence, count in zip(sequences, results):
+            counts[sequence[0]] = counts.get(sequence[0], 0) + count
+
+    return counts
+
+
+def _get_movement_sequences(board: Board, depth: int) -> list[list[str]]:
+    if depth == 0:
+        return [[]]
+
+    sequences: list[list[str]] = []
+    for movement in board.get_legal_movements(board.white_turn):
+        notation: str = movement.to_algebraic(board.is_promotion(movement))
+        for sequence in _get_movement_sequences(board.move_piece(movement), depth - 1):
+            sequences.append([notation, *sequence])
+    return sequences
+
+
+def _perft_after_movements(fen_text: str, notations: list[str], depth: int) -> int:
+    """Worker job, receives plain strings so no Board needs to be pickled"""
+    board: Board = Board.create_from_fen(fen_text)
+    for notation in notations:
+        board = board.move_piece(Movement.create_from_algebraic(notation))
+    return perft(board, depth)
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fen", default=START_FEN, help="Position to count from")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument(
+        "--split-depth", type=int, default=1, help="Plies expanded before distributing jobs"
+    )
+    parser.add_argument(
+        "--compare", action="store_true", help="Also run on a single core to report speedup"
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    start_time: float = time.perf_counter()
+    counts: dict[str, int] = parallel_divide(args.fen, args.depth, args.workers, args.split_depth)
+    parallel_time: float = time.perf_counter() - start_time
+
+    for notation in sorted(counts):
+        print(f"{notation}: {counts[notation]}")
+    print(f"\nNodes: {sum(counts.values())}")
+    print(f"Time with {args.workers} workers: {parallel_time:.2f} s")
+
+    if args.compare:
+        start_time = time.perf_counter()
+        single_counts: dict[str, int] = divide(Board.create_from_fen(args.fen), args.depth)
+        single_time: float = time.perf_counter() - start_time
+
+        if single_counts != counts:
+            raise PerftMismatchError("Single-core and parallel counts differ")
+        print(f"Time on a single core: {single_time:.2f} s")
+        print(f"Speedup: {single_time / parallel_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Reading of PGN game collections, keeping the byte offset of each game so it can be read again later.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+
+from .board import Board
+
+HEADER_PATTERN: re.Pattern[str] = re.compile(r'\[(\w+)\s+"(.*)"\]')
+COMMENT_PATTERN: re.Pattern[str] = re.compile(r"\{[^}]*\}|;[^\n]*")
+VARIATION_PATTERN: re.Pattern[str] = re.compile(r"\([^()]*\)")  # innermost only
+MOVE_NUMBER_PATTERN: re.Pattern[str] = re.compile(r"^\d+\.+")
+RESULTS: set[str] = {"1-0", "0-1", "1/2-1/2", "*"}
+
+
+class PGNGame:
+    def __init__(self, offset: int, headers: dict[str, str], movements: list[str]):
+        self.offset: int = offset  # of the first byte of the game in its file
+        self.headers: dict[str, str] = headers
+        self.movements: list[str] = movements  # in SAN
+
+    def get_start_board(self) -> Board:
+        if "FEN" in self.headers:
+            return Board.create_from_fen(self.headers["FEN"])
+        board: Board = Board()
+        board.setup_pieces()
+        return board
+
+
+def read_games(path: str, start_offset: int = 0) -> Iterator[PGNGame]:
+    """Yields games of a PGN file in order, starting from the game at the given byte offset"""
+    with open(path, "rb") as file:
+        file.seek(start_offset)
+        offset: int = start_offset
+        game_offset: int | None = None
+        headers: dict[str, str] = {}
+        movetext_lines: list[str] = []
+
+        for line_bytes in file:
+            line: str = line_bytes.decode("utf-8", errors="replace").strip()
+            if line.startswith("["):
+                if movetext_lines:  # headers after movetext start the next game
+                    yield PGNGame(game_offset or 0, headers, get_san_movements(movetext_lines))
+                    game_offset, headers, movetext_lines = None, {}, []
+                if game_offset is None:
+                    game_offset = offset
+                header: re.Match[str] | None = HEADER_PATTERN.match(line)
+                if header:
+                    headers[header.group(1)] = header.group(2)
+            elif line and not line.startswith("%"):
+                if game_offset is None:
+                    game_offset = offset
+                movetext_lines.append(line)
+            offset += len(line_bytes)
+
+        if game_offset is not None:
+            yield PGNGame(game_offset, headers, get_san_movements(movetext_lines))
+
+
+def read_game_at(path: str, offset: int) -> PGNGame:
+    for game in read_games(path, offset):
+        return game
+    raise ValueError(f"No game found at offset {offset} of '{path}'")
+
+
+def get_san_movements(movetext_lines: list[str]) -> list[str]:
+    """Returns the main line of a game, without comments, variations, move numbers or NAGs"""
+    text: str = COMMENT_PATTERN.sub(" ", "\n".join(movetext_lines))
+    removed: int = 1
+    while removed:
+        text, removed = VARIATION_PATTERN.subn(" ", text)
+
+    movements: list[str] = []
+    for token in text.split():
+        token = MOVE_NUMBER_PATTERN.sub("", token, count=1)
+        if token and not token.startswith("$") and token not in RESULTS:
+            movements.append(token)
+    return movements
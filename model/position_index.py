@@ -0,0 +1,197 @@
+"""
+Index of the positions reached by games of a PGN collection, to find games by position.
+The index file is a header followed by fixed-size (position hash, game offset) records sorted
+by hash. Queries memory map it and binary search, so neither the index nor the collection
+is loaded into memory.
+
+usage: python -m model.position_index build PGN INDEX
+       python -m model.position_index query INDEX [--fen FEN] [--pgn PGN]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from .board import Board
+from .pgn import PGNGame, read_game_at, read_games
+from .san import parse_san
+
+MAGIC: bytes = b"CHPIDX01"
+RECORD: struct.Struct = struct.Struct("<QQ")  # position hash, game offset
+HASH: struct.Struct = struct.Struct("<Q")
+
+
+def get_position_hash(board: Board) -> int:
+    """Stable 64-bit hash of the position key, the same across processes unlike `hash`"""
+    digest: bytes = hashlib.blake2b(board.get_position_key().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def get_game_hashes(game: PGNGame) -> set[int]:
+    """Replays the game, returning hashes of every position reached including the start"""
+    board: Board = game.get_start_board()
+    hashes: set[int] = {get_position_hash(board)}
+    for san in game.movements:
+        board = board.move_piece(parse_san(board, san))
+        hashes.add(get_position_hash(board))
+    return hashes
+
+
+def build_index(pgn_path: str, index_path: str, chunk_size: int = 1_000_000) -> tuple[int, int]:
+    """
+    Writes index of the PGN collection, returning counts of indexed and skipped games.
+    Records are sorted in chunks written to temporary files, then merged, so memory use
+    is bounded by `chunk_size` records however large the collection is.
+    """
+    indexed: int = 0
+    skipped: int = 0
+    records: list[tuple[int, int]] = []
+    runs: list[BinaryIO] = []
+    directory: str = os.path.dirname(os.path.abspath(index_path))
+
+    with contextlib.ExitStack() as stack:  # closes, so deletes, the temporary files
+        for game in read_games(pgn_path):
+            try:
+                hashes: set[int] = get_game_hashes(game)
+            except Exception:  # noqa: BLE001 - bad FEN or SAN, or a move the board cannot make
+                skipped += 1
+                continue
+            indexed += 1
+            records.extend((position_hash, game.offset) for position_hash in hashes)
+
+            if len(records) >= chunk_size:
+                run: BinaryIO = stack.enter_context(tempfile.TemporaryFile(dir=directory))
+                _write_run(records, run)
+                runs.append(run)
+                records = []
+
+        records.sort()
+        with open(index_path, "wb") as file:
+            file.write(MAGIC)
+            merged: Iterator[tuple[int, int]] = heapq.merge(
+                iter(records), *(_read_run(run) for run in runs)
+            )
+            buffer: bytearray = bytearray()
+            for record in merged:
+                buffer += RECORD.pack(*record)
+                if len(buffer) >= 1 << 20:
+                    file.write(buffer)
+                    buffer.clear()
+            file.write(buffer)
+
+    return indexed, skipped
+
+
+def _write_run(records: list[tuple[int, int]], run: BinaryIO):
+    records.sort()
+    run.write(b"".join(RECORD.pack(*record) for record in records))
+    run.seek(0)
+
+
+def _read_run(run: BinaryIO) -> Iterator[tuple[int, int]]:
+    while chunk := run.read(RECORD.size * 4096):
+        yield from RECORD.iter_unpack(chunk)  # pyright: ignore[reportReturnType]
+
+
+class PositionIndex:
+    def __init__(self, path: str):
+        self.path: str = path
+        # the mapping stays valid once the file is closed
+        with open(path, "rb") as file:
+            try:
+                self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file cannot be mapped
+                raise ValueError(f"Invalid position index '{path}'") from None
+
+        if self.data[: len(MAGIC)] != MAGIC or (len(self.data) - len(MAGIC)) % RECORD.size:
+            self.close()
+            raise ValueError(f"Invalid position index '{path}'")
+        self.record_count: int = (len(self.data) - len(MAGIC)) // RECORD.size
+
+    def get_game_offsets(self, board: Board) -> list[int]:
+        """Returns offsets in the PGN file of games which reached the position, in file order"""
+        position_hash: int = get_position_hash(board)
+
+        # binary search for the first record of the hash
+        low: int = 0
+        high: int = self.record_count
+        while low < high:
+            middle: int = (low + high) // 2
+            if self._get_hash(middle) < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        offsets: list[int] = []
+        while low < self.record_count and self._get_hash(low) == position_hash:
+            offsets.append(RECORD.unpack_from(self.data, len(MAGIC) + low * RECORD.size)[1])
+            low += 1
+        return offsets
+
+    def count_games(self, board: Board) -> int:
+        return len(self.get_game_offsets(board))
+
+    def close(self):
+        self.data.close()
+
+    def _get_hash(self, index: int) -> int:
+        return HASH.unpack_from(self.data, len(MAGIC) + index * RECORD.size)[0]
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser: argparse.ArgumentParser = subparsers.add_parser("build", help="Index PGN file")
+    build_parser.add_argument("pgn_path", metavar="PGN")
+    build_parser.add_argument("index_path", metavar="INDEX")
+
+    query_parser: argparse.ArgumentParser = subparsers.add_parser("query", help="Find games")
+    query_parser.add_argument("index_path", metavar="INDEX")
+    query_parser.add_argument("--fen", help="Position to find, default is standard setup")
+    query_parser.add_argument("--pgn", dest="pgn_path", help="Show headers of games found")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.command == "build":
+        start_time: float = time.perf_counter()
+        indexed, skipped = build_index(args.pgn_path, args.index_path)
+        print(f"Indexed {indexed} games, skipped {skipped}")
+        print(f"Time: {time.perf_counter() - start_time:.2f} s")
+        return
+
+    if args.fen:
+        board: Board = Board.create_from_fen(args.fen)
+    else:
+        board = Board()
+        board.setup_pieces()
+
+    index: PositionIndex = PositionIndex(args.index_path)
+    start_time = time.perf_counter()
+    offsets: list[int] = index.get_game_offsets(board)
+    query_time: float = time.perf_counter() - start_time
+    index.close()
+
+    for offset in offsets:
+        if args.pgn_path:
+            headers: dict[str, str] = read_game_at(args.pgn_path, offset).headers
+            print(f"{offset}: {headers.get('White', '?')} - {headers.get('Black', '?')}", end="")
+            print(f", {headers.get('Event', '?')} {headers.get('Date', '?')}")
+        else:
+            print(offset)
+    print(f"\n{len(offsets)} games found in {query_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .board import Board
+
+
+class RepetitionTracker:
+    """
+    Counts how often each position has occurred since the last irreversible move.
+    Positions before a pawn move or capture can never repeat, so the history is
+    pruned whenever the halfmove clock resets, keeping each check O(1).
+    """
+
+    def __init__(self, board: Board):
+        self._keys: list[str] = []
+        self._counts: dict[str, int] = {}
+        self.reset(board)
+
+    def reset(self, board: Board):
+        """Starts a new history from the given (possibly mid-game) position"""
+        self._keys = []
+        self._counts = {}
+        self.push(board)
+
+    def rebuild(self, boards: Iterable[Board]):
+        """Starts a new history from consecutive positions, e.g. after a takeback"""
+        self._keys = []
+        self._counts = {}
+        for board in boards:
+            self.push(board)
+
+    def restore(self, keys: list[str]):
+        """Starts a new history from keys returned by `get_keys`, without the boards"""
+        self._keys = list(keys)
+        self._counts = {}
+        for key in self._keys:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get_keys(self) -> list[str]:
+        """Returns keys of the positions since the last irreversible move, oldest first"""
+        return list(self._keys)
+
+    def push(self, board: Board) -> int:
+        """Records the position after a move and returns how often it has occurred"""
+        if board.halfmove_clock == 0:
+            self._keys = []
+            self._counts = {}
+
+        key: str = board.get_position_key()
+        self._keys.append(key)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        return self._counts[key]
+
+    def get_count(self, board: Board) -> int:
+        return self._counts.get(board.get_position_key(), 0)
+
+    def is_threefold_repetition(self, board: Board) -> bool:
+        return self.get_count(board) >= 3
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+
+from .board import Board
+from .movement import Movement
+from .pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+
+SAN_PATTERN: re.Pattern[str] = re.compile(
+    r"([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?"
+)
+SAN_PIECE_CLASSES: dict[str, type[Piece]] = {
+    "N": Knight,
+    "B": Bishop,
+    "R": Rook,
+    "Q": Queen,
+    "K": King,
+}
+
+
+def get_san(
+    board: Board,
+    movement: Movement,
+    is_check: bool = False,
+    is_checkmate: bool = False,
+    all_moveable_squares: Mapping[tuple[int, int], set[tuple[int, int]]] | None = None,
+) -> str:
+    """
+    Returns standard algebraic notation of a movement made from the given board, e.g. "Nbxd7+".
+    Check and checkmate are passed in as the caller has already evaluated the new position.
+    Disambiguation uses `all_moveable_squares` when the legal moves are already known,
+    otherwise only other pieces of the same type are searched.
+    """
+    pieces: dict[tuple[int, int], Piece] = board.get_pieces()
+    piece: Piece = pieces[movement.origin_square]
+    origin: str = Movement.square_to_algebraic(movement.origin_square)
+    target: str = Movement.square_to_algebraic(movement.target_square)
+
+    if isinstance(piece, King) and abs(movement.origin_square[0] - movement.target_square[0]) == 2:
+        san: str = "O-O" if movement.target_square[0] == 6 else "O-O-O"
+    elif isinstance(piece, Pawn):
+        if movement.origin_square[0] != movement.target_square[0]:  # captures, incl. en passant
+            san = f"{origin[0]}x{target}"
+        else:
+            san = target
+        if board.is_promotion(movement):
+            san += f"={movement.pawn_promotion(True).character}"
+    else:
+        capture: str = "x" if movement.target_square in pieces else ""
+        disambiguation: str = _get_disambiguation(board, movement, all_moveable_squares)
+        san = f"{piece.character.upper()}{disambiguation}{capture}{target}"
+
+    if is_checkmate:
+        san += "#"
+    elif is_check:
+        san += "+"
+    return san
+
+
+def _get_disambiguation(
+    board: Board,
+    movement: Movement,
+    all_moveable_squares: Mapping[tuple[int, int], set[tuple[int, int]]] | None,
+) -> str:
+    """Returns origin file, rank or both if another piece of the same type could also move"""
+    pieces: dict[tuple[int, int], Piece] = board.get_pieces()
+    piece: Piece = pieces[movement.origin_square]
+
+    rivals: list[tuple[int, int]] = []
+    for square, other in pieces.items():
+        if square == movement.origin_square or type(other) is not type(piece):
+            continue
+        if other.is_white != piece.is_white:
+            continue
+        if all_moveable_squares is not None:
+            moveable_squares: set[tuple[int, int]] = all_moveable_squares.get(square, set())
+        elif movement.target_square in other.get_moveable_squares(pieces, square):
+            moveable_squares = board.get_moveable_squares(square)  # only check legality if needed
+        else:
+            continue
+        if movement.target_square in moveable_squares:
+            rivals.append(square)
+
+    if len(rivals) == 0:
+        return ""
+
+    origin: str = Movement.square_to_algebraic(movement.origin_square)
+    if all(square[0] != movement.origin_square[0] for square in rivals):
+        return origin[0]
+    elif all(square[1] != movement.origin_square[1] for square in rivals):
+        return origin[1]
+    else:
+        return origin
+
+
+def parse_san(board: Board, san: str) -> Movement:
+    """
+    Returns the movement described by standard algebraic notation, e.g. "Nbxd7+".
+    Like `get_san`, legality of candidates is only checked when the notation is ambiguous.
+    """
+    text: str = san.rstrip("+#!?")
+    if text in ("O-O", "O-O-O", "0-0", "0-0-0"):
+        king_square: tuple[int, int] = board.get_king_square(board.white_turn)
+        target_x: int = 6 if len(text) == 3 else 2
+        return Movement(king_square, (target_x, king_square[1]))
+
+    match: re.Match[str] | None = SAN_PATTERN.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid SAN '{san}'")
+    piece_letter, origin_file, origin_rank, target, promotion_letter = match.groups()
+    piece_class: type[Piece] = SAN_PIECE_CLASSES[piece_letter] if piece_letter else Pawn
+    target_square: tuple[int, int] = Movement.algebraic_to_square(target)
+
+    pieces: dict[tuple[int, int], Piece] = board.get_pieces()
+    candidates: list[tuple[int, int]] = []
+    for square, piece in pieces.items():
+        if type(piece) is not piece_class or piece.is_white != board.white_turn:
+            continue
+        origin: str = Movement.square_to_algebraic(square)
+        if (origin_file and origin[0] != origin_file) or (origin_rank and origin[1] != origin_rank):
+            continue
+        moveable_squares: set[tuple[int, int]] = piece.get_moveable_squares(pieces, square)
+        if piece_class is Pawn:
+            moveable_squares = moveable_squares | board.get_en_passant_movement(square)
+        if target_square in moveable_squares:
+            candidates.append(square)
+
+    if len(candidates) > 1:  # e.g. one of the pieces is pinned
+        candidates = [
+            square for square in candidates if target_square in board.get_moveable_squares(square)
+        ]
+    if len(candidates) != 1:
+        raise ValueError(f"SAN '{san}' matches {len(candidates)} movements")
+
+    if promotion_letter:
+        return Movement(candidates[0], target_square, SAN_PIECE_CLASSES[promotion_letter])
+    return Movement(candidates[0], target_square)
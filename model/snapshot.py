@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from types import MappingProxyType, MemberDescriptorType
+from typing import Any, NoReturn, override
+
+from .board import Board
+from .movement import Movement
+from .pieces import Piece
+from .termination import Termination
+
+
+class PieceSnapshot:
+    """Read-only view of a Piece, so that the view cannot change pieces it draws"""
+
+    __slots__: tuple[str, ...] = ("_piece",)
+
+    def __init__(self, piece: Piece):
+        _PIECE_SLOT.__set__(self, piece)
+
+    @override
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        raise AttributeError(f"Cannot set '{name}' of read-only PieceSnapshot")
+
+    @override
+    def __delattr__(self, name: str) -> NoReturn:
+        raise AttributeError(f"Cannot delete '{name}' of read-only PieceSnapshot")
+
+    @override
+    def __str__(self) -> str:
+        return str(_PIECE_SLOT.__get__(self))
+
+    @property
+    def piece_class(self) -> type[Piece]:
+        return type(_PIECE_SLOT.__get__(self))
+
+    @property
+    def name(self) -> str:
+        return _PIECE_SLOT.__get__(self).name
+
+    @property
+    def is_white(self) -> bool:
+        return _PIECE_SLOT.__get__(self).is_white
+
+    @property
+    def has_moved(self) -> bool:
+        return _PIECE_SLOT.__get__(self).has_moved
+
+    @property
+    def character(self) -> str:
+        return _PIECE_SLOT.__get__(self).character
+
+    @property
+    def nerdfont_character(self) -> str:
+        return _PIECE_SLOT.__get__(self).nerdfont_character
+
+
+class BoardSnapshot:
+    """
+    Read-only view of a Board, created in O(1) by wrapping rather than copying it.
+    Boards are never modified once published by the controller (moves create new
+    boards), so a snapshot can be shared with the view without a deep copy.
+    Pieces are handed out as PieceSnapshots, created once on first use.
+    """
+
+    __slots__: tuple[str, ...] = ("_board", "_pieces")
+
+    width: int = Board.width
+    height: int = Board.height
+
+    def __init__(self, board: Board):
+        _BOARD_SLOT.__set__(self, board)
+        _PIECES_SLOT.__set__(self, None)
+
+    @override
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        raise AttributeError(f"Cannot set '{name}' of read-only BoardSnapshot")
+
+    @override
+    def __delattr__(self, name: str) -> NoReturn:
+        raise AttributeError(f"Cannot delete '{name}' of read-only BoardSnapshot")
+
+    @property
+    def white_turn(self) -> bool:
+        return _BOARD_SLOT.__get__(self).white_turn
+
+    @property
+    def game_over(self) -> bool:
+        return _BOARD_SLOT.__get__(self).game_over
+
+    @property
+    def termination(self) -> Termination | None:
+        return _BOARD_SLOT.__get__(self).termination
+
+    @property
+    def halfmove_clock(self) -> int:
+        return _BOARD_SLOT.__get__(self).halfmove_clock
+
+    @property
+    def fullmove_number(self) -> int:
+        return _BOARD_SLOT.__get__(self).fullmove_number
+
+    @property
+    def pawn_double_move(self) -> tuple[int, int] | None:
+        return _BOARD_SLOT.__get__(self).pawn_double_move
+
+    def get_pieces(self) -> Mapping[tuple[int, int], PieceSnapshot]:
+        pieces: Mapping[tuple[int, int], PieceSnapshot] | None = _PIECES_SLOT.__get__(self)
+        if pieces is None:
+            pieces = MappingProxyType(
+                {
+                    square: PieceSnapshot(piece)
+                    for square, piece in _BOARD_SLOT.__get__(self).get_pieces().items()
+                }
+            )
+            _PIECES_SLOT.__set__(self, pieces)
+        return pieces
+
+    def get_moveable_squares(self, square: tuple[int, int]) -> set[tuple[int, int]]:
+        return _BOARD_SLOT.__get__(self).get_moveable_squares(square)
+
+    def get_all_moveable_squares(
+        self, is_white: bool
+    ) -> dict[tuple[int, int], set[tuple[int, int]]]:
+        return _BOARD_SLOT.__get__(self).get_all_moveable_squares(is_white)
+
+    def is_king_in_check(self, is_white: bool) -> bool:
+        return _BOARD_SLOT.__get__(self).is_king_in_check(is_white)
+
+    def is_king_in_checkmate(self, is_white: bool) -> bool:
+        return _BOARD_SLOT.__get__(self).is_king_in_checkmate(is_white)
+
+    def is_promotion(self, movement: Movement) -> bool:
+        return _BOARD_SLOT.__get__(self).is_promotion(movement)
+
+    def move_piece(self, movement: Movement) -> Board:
+        """Returns new board with the movement made, the snapshot is unchanged"""
+        return _BOARD_SLOT.__get__(self).move_piece(movement)
+
+    def fen_serialize(self) -> str:
+        return _BOARD_SLOT.__get__(self).fen_serialize()
+
+    def get_position_key(self) -> str:
+        return _BOARD_SLOT.__get__(self).get_position_key()
+
+    def is_snapshot_of(self, board: Board) -> bool:
+        return _BOARD_SLOT.__get__(self) is board
+
+    def to_board(self) -> Board:
+        """Returns a mutable copy of the board"""
+        return _BOARD_SLOT.__get__(self).deep_clone()
+
+
+# slot descriptors are taken off the classes, so the wrapped objects can only be reached here
+_PIECE_SLOT: MemberDescriptorType = PieceSnapshot.__dict__["_piece"]
+_BOARD_SLOT: MemberDescriptorType = BoardSnapshot.__dict__["_board"]
+_PIECES_SLOT: MemberDescriptorType = BoardSnapshot.__dict__["_pieces"]
+del PieceSnapshot._piece
+del BoardSnapshot._board
+del BoardSnapshot._pieces
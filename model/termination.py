@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class Termination(Enum):
+    """Reasons for a game ending, values are used for display"""
+
+    CHECKMATE = "checkmate"
+    FIFTY_MOVE = "fifty-move rule"
+    THREEFOLD_REPETITION = "threefold repetition"
+    STALEMATE = "stalemate"
+    INSUFFICIENT_MATERIAL = "insufficient material"
+    SEVENTY_FIVE_MOVE = "seventy-five-move rule"
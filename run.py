@@ -1,14 +1,16 @@
 import argparse
 import sys
 
-from controller.game_config import GameConfig
-from controller.game_controller import GameController
+from util import logger
+from util.logger import LEVELS
 
 
-def main():
+def create_parser() -> argparse.ArgumentParser:
     desc: str = (
         "A simple Chess TUI.\n\n"
-        "Use arrow keys to move cursor, press 'Space' to confirm, 'Esc' to cancel and 'q' to quit.\n\n"
+        "Use arrow keys to move cursor, press 'Space' to confirm, 'Esc' to cancel and 'q' to quit.\n"
+        "Press 'u' to take back a move, including the one that ended the game, and 'r' to redo it.\n"
+        "Press ',' and '.' to step through earlier positions, '<' and '>' to jump to either end.\n\n"
         "Engines used must be UCI compliant. If engine(s) are not specified, player input will be used."
     )
     parser: argparse.ArgumentParser = argparse.ArgumentParser(
@@ -47,13 +49,209 @@ def main():
         action="store_true",
         help="Use ASCII characters for pieces instead of NerdFont",
     )
-    args: argparse.Namespace = parser.parse_args()
+    parser.add_argument(
+        "-f",
+        "--fen",
+        dest="fen",
+        type=str,
+        help="FEN of position to start from, default is standard setup",
+        metavar="FEN",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile_path",
+        type=str,
+        help="Record timings of hot paths and write JSON report to PATH on exit",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--cprofile",
+        dest="cprofile_path",
+        type=str,
+        help="Also write cProfile stats to PATH, requires --profile",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--log",
+        dest="log_path",
+        type=str,
+        help="Write log messages to PATH",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--log-level",
+        dest="log_level",
+        default="info",
+        choices=list(LEVELS),
+        help="Minimum level of logged messages, default info",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache_path",
+        type=str,
+        help="Reuse engine evaluations stored in SQLite database at PATH",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        default=100_000,
+        type=int,
+        help="Maximum number of cached evaluations, default 100000",
+        metavar="INTEGER",
+    )
+    parser.add_argument(
+        "--broadcast",
+        dest="broadcast_port",
+        type=int,
+        help="Stream the game to spectators connecting to localhost PORT",
+        metavar="PORT",
+    )
+    parser.add_argument(
+        "--move-timeout",
+        dest="move_timeout",
+        type=float,
+        help="Restart an engine taking longer than SECONDS to move, default 30 + 10 * depth",
+        metavar="SECONDS",
+    )
+    parser.add_argument(
+        "--max-restarts",
+        dest="max_restarts",
+        default=3,
+        type=int,
+        help="Restarts allowed for each engine move before giving up, default 3",
+        metavar="INTEGER",
+    )
+    parser.add_argument(
+        "--max-fps",
+        dest="max_fps",
+        default=60,
+        type=int,
+        help="Maximum frames drawn per second, default 60",
+        metavar="INTEGER",
+    )
+    parser.add_argument(
+        "--index",
+        dest="index_path",
+        type=str,
+        help="Show how many games of position index at PATH reached the position",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--telemetry",
+        dest="telemetry_path",
+        type=str,
+        help="Write statistics of each engine move to PATH as CSV, or JSON if it ends with .json",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--simul",
+        dest="simul",
+        type=int,
+        help="Play COUNT engine games at once, tiled, with engines swapping sides on every other",
+        metavar="COUNT",
+    )
+    parser.add_argument(
+        "--white-depth",
+        dest="white_depth",
+        type=int,
+        help="Search depth of white engine, default --depth",
+        metavar="INTEGER",
+    )
+    parser.add_argument(
+        "--black-depth",
+        dest="black_depth",
+        type=int,
+        help="Search depth of black engine, default --depth",
+        metavar="INTEGER",
+    )
+    parser.add_argument(
+        "--white-movetime",
+        dest="white_movetime",
+        type=int,
+        help="Search white engine moves for MS milliseconds instead of to a depth",
+        metavar="MS",
+    )
+    parser.add_argument(
+        "--black-movetime",
+        dest="black_movetime",
+        type=int,
+        help="Search black engine moves for MS milliseconds instead of to a depth",
+        metavar="MS",
+    )
+    parser.add_argument(
+        "--white-option",
+        dest="white_options",
+        action="append",
+        help="Set UCI option of white engine, e.g. Threads=8, can be repeated",
+        metavar="NAME=VALUE",
+    )
+    parser.add_argument(
+        "--black-option",
+        dest="black_options",
+        action="append",
+        help="Set UCI option of black engine, e.g. Hash=1024, can be repeated",
+        metavar="NAME=VALUE",
+    )
+    parser.add_argument(
+        "--engine-options",
+        dest="engine_options_path",
+        type=str,
+        help='Read UCI options from JSON at PATH, e.g. {"white": {"Threads": 8}, "black": {}}',
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--save",
+        dest="save_path",
+        type=str,
+        help="Save the game to PATH after every move, so that it can be resumed after quitting",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="resume_path",
+        type=str,
+        help="Continue the game saved at PATH with its engines, saving it there unless --save",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--analyse",
+        dest="analysis_engine_path",
+        type=str,
+        help="Show evaluations of the viewed position by engine at PATH, searched to --depth",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--prefetch",
+        dest="analysis_prefetch",
+        default=8,
+        type=int,
+        help="Plies after the viewed one analysed in the background, default 8",
+        metavar="INTEGER",
+    )
+    return parser
+
+
+def main():
+    args: argparse.Namespace = create_parser().parse_args()
+
+    # deferred so that help and argument errors are shown without loading the game
+    from controller.game_config import GameConfig
+    from controller.game_controller import GameController
+    from controller.simul_controller import SimulController
 
     try:
         config: GameConfig = GameConfig(**vars(args))  # pyright: ignore[reportAny]
-        controller: GameController = GameController(config)
+        controller: GameController | SimulController
+        if config.simul:
+            controller = SimulController(config)
+        else:
+            controller = GameController(config)
         controller.start()
     except Exception as error:
+        if logger.path:
+            logger.log(f"{error!r}", "error")
+            logger.dump(f"{logger.path}.crash")
         print(f"ERROR: {error}")
         sys.exit(1)
 
@@ -0,0 +1,85 @@
+import asyncio
+from typing import override
+
+from engine.analyser import Analyser
+from engine.search_result import SearchResult
+from engine.uci_engine import UCIEngine
+
+FENS: list[str] = [f"4k3/8/8/8/8/8/8/4K3 w - - 0 {number}" for number in range(1, 8)]
+
+
+class FakeEngine(UCIEngine):
+    """Engine without a process, whose searches take a fixed time"""
+
+    def __init__(self, search_time: float):
+        super().__init__("fake", 1)
+        self.search_time: float = search_time
+        self.searched: list[str] = []
+
+    @override
+    async def start(self):
+        pass
+
+    @override
+    async def terminate(self):
+        pass
+
+    @override
+    async def search(self, fen_text: str) -> SearchResult:
+        self.searched.append(fen_text)
+        await asyncio.sleep(self.search_time)
+        return SearchResult("e1e2", 1, "cp 0")
+
+
+async def wait_for_results(analyser: Analyser, count: int):
+    while len(analyser.results) < count:
+        await asyncio.sleep(0.001)
+
+
+def test_viewed_ply_and_following_plies_are_evaluated_once():
+    engine: FakeEngine = FakeEngine(0.001)
+    sent: list[str] = []
+
+    async def send_result(fen: str, _result: SearchResult):
+        sent.append(fen)
+
+    async def run():
+        analyser: Analyser = Analyser(engine, 2, send_result)
+        task: asyncio.Task[None] = asyncio.create_task(analyser.run())
+        analyser.focus(FENS[0:4])
+        await asyncio.wait_for(wait_for_results(analyser, 3), timeout=5)
+
+        # evaluated positions are not searched again
+        analyser.focus(FENS[1:5])
+        await asyncio.wait_for(wait_for_results(analyser, 4), timeout=5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert sent == FENS[0:4]
+    assert engine.searched == FENS[0:4]
+
+
+def test_search_skipped_past_is_cancelled():
+    engine: FakeEngine = FakeEngine(10)
+
+    async def send_result(_fen: str, _result: SearchResult):
+        pass
+
+    async def run():
+        analyser: Analyser = Analyser(engine, 1, send_result)
+        task: asyncio.Task[None] = asyncio.create_task(analyser.run())
+        analyser.focus(FENS[0:2])
+        while not engine.searched:
+            await asyncio.sleep(0.001)
+
+        analyser.focus(FENS[4:6])
+        while len(engine.searched) < 2:
+            await asyncio.sleep(0.001)
+        assert analyser.cancelled_searches == 1
+        assert engine.searched == [FENS[0], FENS[4]]
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
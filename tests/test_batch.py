@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from model.board import Board
+from model.movement import Movement
+from model.pieces import Pawn, Piece
+
+np = pytest.importorskip("numpy")
+
+from model.batch import BoardBatch  # imported once NumPy is known to be installed
+
+
+def generate_positions(count: int, rng: random.Random) -> list[Board]:
+    """Plays random legal moves, restarting whenever a game ends"""
+    boards: list[Board] = []
+    board: Board = Board()
+    board.setup_pieces()
+
+    while len(boards) < count:
+        movements: list[Movement] = [
+            Movement(square, target_square)
+            for square, target_squares in sorted(
+                board.get_all_moveable_squares(board.white_turn).items()
+            )
+            for target_square in sorted(target_squares)
+        ]
+        if len(movements) == 0 or board.halfmove_clock > 100:
+            board = Board()
+            board.setup_pieces()
+            continue
+        board = board.move_piece(rng.choice(movements))
+        boards.append(board)
+
+    return boards
+
+
+def get_scalar_attacks(board: Board, is_white: bool) -> set[tuple[int, int]]:
+    """Squares attacked by a color, including squares of its own defended pieces"""
+    pieces: dict[tuple[int, int], Piece] = board.get_pieces()
+    attacks: set[tuple[int, int]] = set()
+    for square, piece in pieces.items():
+        if piece.is_white != is_white:
+            continue
+        if isinstance(piece, Pawn):
+            direction: int = -1 if is_white else 1
+            for x_diff in (-1, 1):
+                target_square: tuple[int, int] = (square[0] + x_diff, square[1] + direction)
+                if 0 <= target_square[0] < 8 and 0 <= target_square[1] < 8:
+                    attacks.add(target_square)
+        else:
+            # make every other piece capturable so defended squares are included
+            flipped: dict[tuple[int, int], Piece] = {
+                other_square: type(other)(not is_white) for other_square, other in pieces.items()
+            }
+            flipped[square] = piece
+            attacks |= piece.get_moveable_squares(flipped, square)
+    return attacks
+
+
+def get_scalar_mobility(board: Board, is_white: bool) -> int:
+    pieces: dict[tuple[int, int], Piece] = board.get_pieces()
+    return sum(
+        len(piece.get_moveable_squares(pieces, square))
+        for square, piece in pieces.items()
+        if piece.is_white == is_white
+    )
+
+
+def test_batch_features_match_board():
+    boards: list[Board] = generate_positions(300, random.Random(0))
+    batch: BoardBatch = BoardBatch.create_from_boards(boards)
+    attacked_squares = batch.get_attacked_squares()
+    mobility = batch.get_mobility()
+    in_check = batch.get_in_check()
+
+    for index, board in enumerate(boards):
+        fen: str = board.fen_serialize()
+        for color_index, is_white in enumerate((True, False)):
+            actual_attacks: set[tuple[int, int]] = {
+                (square % 8, square // 8)
+                for square in np.flatnonzero(attacked_squares[index, color_index])
+            }
+            assert actual_attacks == get_scalar_attacks(board, is_white), fen
+            assert mobility[index, color_index] == get_scalar_mobility(board, is_white), fen
+            assert in_check[index, color_index] == board.is_king_in_check(is_white), fen
@@ -0,0 +1,95 @@
+import pytest
+
+from model.board import Board
+from model.movement import Movement
+from model.termination import Termination
+
+FENS: list[str] = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/8/8/8/8/8/8/R3K2R b Kq - 12 40",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "4k3/8/8/8/8/8/8/4K3 b - - 99 120",
+]
+
+
+def play(board: Board, notations: list[str]) -> Board:
+    for notation in notations:
+        board = board.move_piece(Movement.create_from_algebraic(notation))
+    return board
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_fen_round_trip(fen: str):
+    assert Board.create_from_fen(fen).fen_serialize() == fen
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    ],
+)
+def test_invalid_fen_is_rejected(fen: str):
+    with pytest.raises(ValueError):
+        Board.create_from_fen(fen)
+
+
+def test_fen_after_moves():
+    board: Board = Board.create_from_fen(FENS[0])
+    board = play(board, ["e2e4", "c7c5", "g1f3"])
+    assert board.fen_serialize() == "rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+
+    # moving a rook loses castling on its side only
+    board = play(Board.create_from_fen(FENS[3]), ["a8a7"])
+    assert board.fen_serialize() == "4k2r/r7/8/8/8/8/8/R3K2R w K - 13 41"
+
+
+def test_castling_and_en_passant():
+    board: Board = play(Board.create_from_fen(FENS[2]), ["e1g1"])
+    assert board.fen_serialize().split()[:3] == [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R4RK1",
+        "b",
+        "kq",
+    ]
+
+    board = play(Board.create_from_fen(FENS[1]), ["f2f4", "e5f4", "g2g4"])
+    assert board.get_en_passant_movement((5, 4)) == {(6, 5)}
+    board = play(board, ["f4g3"])
+    assert (6, 4) not in board.get_pieces()
+    assert board.fen_serialize() == "rnbqkbnr/pppp1ppp/8/8/4P3/6p1/PPPP3P/RNBQKBNR w KQkq - 0 4"
+
+
+@pytest.mark.parametrize(
+    ("fen", "termination"),
+    [
+        ("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3", Termination.CHECKMATE),
+        ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", Termination.STALEMATE),
+        ("4k3/8/8/8/8/8/8/4K3 w - - 0 1", Termination.INSUFFICIENT_MATERIAL),
+        ("4k3/8/8/8/8/8/8/4KN2 w - - 0 1", Termination.INSUFFICIENT_MATERIAL),
+        ("2b1k3/8/8/8/8/8/8/4KB2 w - - 0 1", Termination.INSUFFICIENT_MATERIAL),  # same color
+        ("4k3/8/8/8/8/8/8/R3K3 w - - 100 80", Termination.FIFTY_MOVE),
+        ("4k3/8/8/8/8/8/8/R3K3 w - - 150 100", Termination.SEVENTY_FIVE_MOVE),
+        ("3bk3/8/8/8/8/8/8/4KB2 w - - 0 1", None),  # bishops on both colors
+        ("4k3/8/8/8/8/8/8/3NKN2 w - - 0 1", None),
+        ("4k3/8/8/8/8/8/8/R3K3 w - - 99 80", None),
+        ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", None),
+    ],
+)
+def test_get_termination(fen: str, termination: Termination | None):
+    assert Board.create_from_fen(fen).get_termination() == termination
+
+
+def test_fifty_move_rule_can_be_left_unclaimed():
+    board: Board = Board.create_from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 100 80")
+    assert board.get_termination(claim_fifty_move=False) is None
+
+
+def test_checkmate_takes_precedence_over_move_rules():
+    board: Board = Board.create_from_fen("R5k1/5ppp/8/8/8/8/8/6K1 b - - 150 100")
+    assert board.get_termination() == Termination.CHECKMATE
+    assert board.is_king_in_checkmate(False)
+    assert not board.has_legal_movement(False)
@@ -0,0 +1,107 @@
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from controller.broadcast_server import BroadcastServer
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+CLOCKS: dict[str, int] = {"white": 0, "black": 0}
+
+
+@contextlib.asynccontextmanager
+async def run_server(server: BroadcastServer) -> AsyncIterator[None]:
+    """Runs the server on a free local port until the block ends"""
+    task: asyncio.Task[None] = asyncio.create_task(server.run())
+    try:
+        while server.port == 0:
+            await asyncio.sleep(0.001)
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def connect(
+    server: BroadcastServer,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    while len(server.spectators) == 0:
+        await asyncio.sleep(0.001)
+    return reader, writer
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict[str, Any]:
+    return json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+
+
+def test_spectator_receives_snapshot_then_moves():
+    server: BroadcastServer = BroadcastServer("127.0.0.1", 0)
+    server.reset(START_FEN, ["e2e4"], CLOCKS)
+    server.publish_status({"result": None})
+
+    async def run():
+        async with run_server(server):
+            reader, writer = await connect(server)
+            assert await read_message(reader) == {
+                "type": "snapshot",
+                "fen": START_FEN,
+                "moves": ["e2e4"],
+                "clocks": CLOCKS,
+                "status": {"result": None},
+            }
+
+            server.publish_move("e7e5", {"white": 1, "black": 2})
+            assert await read_message(reader) == {
+                "type": "move",
+                "ply": 2,
+                "move": "e7e5",
+                "clocks": {"white": 1, "black": 2},
+            }
+            writer.close()
+
+    asyncio.run(run())
+
+
+def test_full_queue_is_replaced_by_snapshot():
+    server: BroadcastServer = BroadcastServer("127.0.0.1", 0, queue_size=2)
+    server.reset(START_FEN, [], CLOCKS)
+
+    async def run():
+        async with run_server(server):
+            reader, writer = await connect(server)
+            assert (await read_message(reader))["moves"] == []
+
+            # published without yielding, so the third move finds the queue full
+            for movement_text in ["e2e4", "e7e5", "g1f3"]:
+                server.publish_move(movement_text, CLOCKS)
+            message: dict[str, Any] = await read_message(reader)
+            assert message["type"] == "snapshot"
+            assert message["moves"] == ["e2e4", "e7e5", "g1f3"]
+
+            server.publish_move("b8c6", CLOCKS)
+            assert (await read_message(reader))["ply"] == 4
+            writer.close()
+
+    asyncio.run(run())
+
+
+def test_spectator_that_stops_reading_is_dropped():
+    server: BroadcastServer = BroadcastServer("127.0.0.1", 0, queue_size=2, write_timeout=0.1)
+    server.reset(START_FEN, [], CLOCKS)
+
+    async def run():
+        async with run_server(server):
+            _, writer = await connect(server)
+
+            # large moves fill the socket buffers, as nothing is read from them
+            for _ in range(1000):
+                server.publish_move("x" * 100_000, CLOCKS)
+                await asyncio.sleep(0.01)
+                if len(server.spectators) == 0:
+                    break
+            assert len(server.spectators) == 0
+            writer.close()
+
+    asyncio.run(run())
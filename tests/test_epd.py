@@ -0,0 +1,66 @@
+import pytest
+
+from engine.epd import EPDPosition, EPDResult, get_summaries
+from engine.search_result import SearchResult
+
+WAC_001: str = '2rr3k/pp3pp1/1nnqbN1p/3pN3/2pP4/2P3Q1/PPB4P/R4RK1 w - - bm Qg6; id "WAC.001";'
+PROMOTION: str = 'k7/4P3/8/8/8/8/8/7K w - - bm e8=Q e8=R; am Kg1; hmvc 3; fmvn 40; id "a; b";'
+
+
+def test_epd_answers_are_converted_to_engine_moves():
+    position: EPDPosition = EPDPosition.create_from_epd(WAC_001)
+    assert position.fen == "2rr3k/pp3pp1/1nnqbN1p/3pN3/2pP4/2P3Q1/PPB4P/R4RK1 w - - 0 1"
+    assert position.id == "WAC.001"
+    assert position.best_moves == {"g3g6"}
+    assert position.avoid_moves == set()
+
+    # move clocks are operations, and quoted values may contain semicolons
+    position = EPDPosition.create_from_epd(PROMOTION)
+    assert position.fen == "k7/4P3/8/8/8/8/8/7K w - - 3 40"
+    assert position.id == "a; b"
+    assert position.best_moves == {"e7e8q", "e7e8r"}
+    assert position.avoid_moves == {"h1g1"}
+
+
+def test_positions_are_solved_by_best_moves_unless_avoided():
+    position: EPDPosition = EPDPosition.create_from_epd(PROMOTION)
+    assert position.is_solved_by("e7e8r")
+    assert not position.is_solved_by("h1g1")
+    assert not position.is_solved_by("e7e8b")
+
+    # only avoid moves, any other move solves it
+    position = EPDPosition.create_from_epd("k7/4P3/8/8/8/8/8/7K w - - am Kg1;")
+    assert position.is_solved_by("h1h2")
+    assert not position.is_solved_by("h1g1")
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "k7/4P3/8/8 w",  # too few fields
+        "k7/4P3/8/8/8/8/8/7K w - - bm Qe8;",  # no queen to move
+    ],
+)
+def test_invalid_epd_is_rejected(line: str):
+    with pytest.raises(ValueError):
+        EPDPosition.create_from_epd(line)
+
+
+def test_summaries_only_time_solved_positions():
+    wac: EPDPosition = EPDPosition.create_from_epd(WAC_001)
+    promotion: EPDPosition = EPDPosition.create_from_epd(PROMOTION)
+    results: list[EPDResult] = [
+        EPDResult("engine", wac, SearchResult("g3g6", 8, nodes=600, time=1, settled_time=0.5)),
+        EPDResult("engine", promotion, SearchResult("h1g1", 8, nodes=400, time=1)),
+    ]
+    assert [result.to_dict()["time_to_solution"] for result in results] == [0.5, None]
+    assert get_summaries(results) == {
+        "engine": {
+            "positions": 2,
+            "solved": 1,
+            "solve_rate": 0.5,
+            "mean_time_to_solution": 0.5,
+            "nodes": 1000,
+            "nps": 500,
+        }
+    }
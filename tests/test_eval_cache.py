@@ -0,0 +1,64 @@
+import asyncio
+from pathlib import Path
+
+from engine.eval_cache import EvalCache
+from engine.search_result import SearchResult
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def get_fen(castling: str) -> str:
+    return START_FEN.replace("KQkq", castling)
+
+
+def test_results_are_kept_by_engine_and_settings(tmp_path: Path):
+    async def run():
+        cache: EvalCache = EvalCache(str(tmp_path / "cache.sqlite"), batch_size=1)
+        await cache.put("stockfish", "", START_FEN, SearchResult("e2e4", 20, "cp 30"))
+        await cache.put("stockfish", "movetime=100", START_FEN, SearchResult("d2d4", 8))
+
+        result: SearchResult | None = cache.get("stockfish", "", START_FEN, 10)
+        assert result is not None and result.best_move == "e2e4"
+        assert cache.get("stockfish", "", START_FEN, 21) is None
+        assert cache.get("stockfish", "threads=8", START_FEN, 1) is None
+        assert cache.get("berserk", "", START_FEN, 1) is None
+        result = cache.get("stockfish", "movetime=100", START_FEN.replace("0 1", "5 9"), 0)
+        assert result is not None and result.best_move == "d2d4"
+        await cache.close()
+
+        # persisted, and the deeper result is kept
+        cache = EvalCache(str(tmp_path / "cache.sqlite"), batch_size=100)
+        await cache.put("stockfish", "", START_FEN, SearchResult("g1f3", 12))
+        result = cache.get("stockfish", "", START_FEN, 10)
+        assert result is not None and result.best_move == "e2e4"  # not the shallower pending
+        await cache.close()
+
+        cache = EvalCache(str(tmp_path / "cache.sqlite"))
+        result = cache.get("stockfish", "", START_FEN, 0)
+        assert result is not None and result.depth == 20
+        await cache.close()
+
+    asyncio.run(run())
+
+
+def test_least_recently_used_are_evicted(tmp_path: Path):
+    async def run():
+        # written one at a time, so that every entry is last used at a different time
+        cache: EvalCache = EvalCache(str(tmp_path / "cache.sqlite"), max_entries=4, batch_size=1)
+        fens: list[str] = [get_fen(castling) for castling in ("KQkq", "Kkq", "Qkq", "kq")]
+        for fen in fens:
+            await cache.put("stockfish", "", fen, SearchResult("e2e4", 10))
+        assert cache.get("stockfish", "", fens[0], 0) is not None  # used, so kept
+
+        for castling in ("KQ", "-"):
+            await cache.put("stockfish", "", get_fen(castling), SearchResult("e2e4", 10))
+        await cache.close()
+
+        cache = EvalCache(str(tmp_path / "cache.sqlite"), max_entries=4)
+        assert cache.get("stockfish", "", fens[0], 0) is not None
+        assert cache.get("stockfish", "", fens[1], 0) is None
+        assert cache.get("stockfish", "", fens[2], 0) is None
+        assert cache.get("stockfish", "", fens[3], 0) is not None
+        await cache.close()
+
+    asyncio.run(run())
@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
+import pytest
+
+from controller.game_config import GameConfig
+from controller.game_controller import GameController
+from model.movement import Movement
+from model.snapshot import BoardSnapshot
+from model.termination import Termination
+from run import create_parser
+from view.game_view import GameView, NoInputState
+from view.simul_view import BoardTile
+
+FOOLS_MATE: list[str] = ["f2f3", "e7e5", "g2g4", "d8h4"]
+
+
+def create_controller(arguments: list[str]) -> GameController:
+    return GameController(GameConfig(**vars(create_parser().parse_args(arguments))))
+
+
+@contextlib.asynccontextmanager
+async def process_movements(arguments: list[str]) -> AsyncIterator[GameController]:
+    """Controller processing moves, as if its view was drawn and its engines were ready"""
+    controller: GameController = create_controller(arguments)
+    assert isinstance(controller.view, GameView)
+    controller.view.is_ready = True
+    controller.engines_ready.set()
+    task: asyncio.Task[None] = asyncio.create_task(controller.process_movements())
+    try:
+        yield controller
+    finally:
+        if task.done():
+            task.result()  # raises the error that stopped move processing
+        task.cancel()
+
+
+async def wait_for_ply(controller: GameController, ply: int):
+    while controller.history.ply != ply or controller.movements_queue:
+        await asyncio.sleep(0.001)
+
+
+def test_takeback_of_final_move():
+    async def play():
+        async with process_movements([]) as controller:
+            for notation in FOOLS_MATE:
+                await controller.handle_human_movement(Movement.create_from_algebraic(notation))
+            await wait_for_ply(controller, 4)
+            assert controller.board.game_over
+            assert controller.board.termination == Termination.CHECKMATE
+            assert controller.move_texts == ["f3", "e5", "g4", "Qh4#"]
+
+            await controller.handle_takeback()
+            assert controller.history.ply == 3
+            assert not controller.board.game_over
+            assert controller.board.termination is None
+
+            # game continues from the earlier position
+            await controller.handle_human_movement(Movement.create_from_algebraic("g8f6"))
+            await wait_for_ply(controller, 4)
+            assert not controller.board.game_over
+
+    asyncio.run(play())
+
+
+def test_final_position_is_terminal_after_redo():
+    async def play():
+        async with process_movements([]) as controller:
+            for notation in FOOLS_MATE:
+                await controller.handle_human_movement(Movement.create_from_algebraic(notation))
+            await wait_for_ply(controller, 4)
+
+            await controller.handle_takeback()
+            await controller.handle_redo()
+            assert controller.history.ply == 4
+            assert controller.board.game_over
+            assert controller.board.termination == Termination.CHECKMATE
+
+    asyncio.run(play())
+
+
+def test_browsed_position_is_published_to_view():
+    async def play():
+        async with process_movements([]) as controller:
+            for notation in FOOLS_MATE:
+                await controller.handle_human_movement(Movement.create_from_algebraic(notation))
+            await wait_for_ply(controller, 4)
+            view: GameView | BoardTile = controller.view
+            assert isinstance(view, GameView)
+
+            await view.browse(",")
+            await view.browse(",")
+            assert view.browse_ply == 2
+            assert view.browse_board is not None
+            assert view.browse_board.fen_serialize() == (
+                "rnbqkbnr/pppp1ppp/8/4p3/8/5P2/PPPPP1PP/RNBQKBNR w KQkq e6 0 2"
+            )
+            assert view.board.termination == Termination.CHECKMATE
+
+            await view.browse(">")
+            assert view.browse_ply is None
+            assert view.browse_board is None
+
+    asyncio.run(play())
+
+
+def test_takeback_to_browsed_position_copies_board():
+    async def play():
+        async with process_movements([]) as controller:
+            for notation in ["e2e4", "e7e5", "g1f3", "b8c6"]:
+                await controller.handle_human_movement(Movement.create_from_algebraic(notation))
+            await wait_for_ply(controller, 4)
+            view: GameView | BoardTile = controller.view
+            assert isinstance(view, GameView)
+
+            await view.browse(",")
+            browsed: BoardSnapshot | None = view.browse_board
+            assert browsed is not None
+            await view.browse(">")
+
+            # the published board is never the one the controller goes on to end or move
+            await controller.handle_takeback()
+            assert controller.history.ply == 3
+            assert controller.board.fen_serialize() == browsed.fen_serialize()
+            assert not browsed.is_snapshot_of(controller.board)
+
+    asyncio.run(play())
+
+
+def test_threefold_repetition_ends_game():
+    async def play():
+        async with process_movements([]) as controller:
+            for notation in ["g1f3", "g8f6", "f3g1", "f6g8"] * 2:
+                await controller.handle_human_movement(Movement.create_from_algebraic(notation))
+            await wait_for_ply(controller, 8)
+            assert controller.board.game_over
+            assert controller.board.termination == Termination.THREEFOLD_REPETITION
+
+            # the repetition is undone with the move
+            await controller.handle_takeback()
+            assert not controller.board.game_over
+
+    asyncio.run(play())
+
+
+@pytest.mark.parametrize(
+    ("arguments", "termination"),
+    [
+        (["--fen", "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"], Termination.STALEMATE),
+        # an engine to move is never asked for a move
+        (
+            ["--fen", "4k3/8/8/8/8/8/8/4K3 b - - 0 1", "-b", "engine"],
+            Termination.INSUFFICIENT_MATERIAL,
+        ),
+        (["--fen", "4k3/8/8/8/8/8/8/R3K3 w - - 100 80"], Termination.FIFTY_MOVE),
+    ],
+)
+def test_game_starting_from_finished_position(arguments: list[str], termination: Termination):
+    async def play():
+        async with process_movements(arguments) as controller:
+            assert controller.board.game_over
+            assert controller.board.termination == termination
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            assert isinstance(controller.view, GameView)
+            assert isinstance(controller.view.state, NoInputState)
+            assert not controller.movements_queue
+
+    asyncio.run(play())
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from controller.game_config import GameConfig
+from controller.game_controller import GameController
+from run import create_parser
+from view.cursor import Cursor
+from view.game_view import GameView, SelectingState
+from view.simul_view import BoardTile
+
+
+def create_view() -> GameView:
+    config: GameConfig = GameConfig(**vars(create_parser().parse_args([])))
+    view: GameView | BoardTile = GameController(config).view
+    assert isinstance(view, GameView)
+    return view
+
+
+def test_failed_frame_ends_view():
+    view: GameView = create_view()
+    draw_board = view.draw_board
+    frames: int = 0
+
+    async def draw_frame(draw_cursors: bool, moveable_squares: set[tuple[int, int]] | None = None):
+        nonlocal frames
+        frames += 1
+        if frames > 1:  # the first frame is drawn before the render loop starts
+            raise RuntimeError("Frame failed")
+        await draw_board(draw_cursors, moveable_squares)
+
+    view.draw_board = draw_frame
+
+    async def run():
+        task: asyncio.Task[None] = asyncio.create_task(view.run())
+        while not view.is_ready:
+            await asyncio.sleep(0.001)
+        view.request_redraw()
+        await asyncio.wait_for(task, timeout=5)
+
+    with pytest.raises(RuntimeError, match="Frame failed"):
+        asyncio.run(run())
+
+
+def test_legal_moves_are_computed_when_input_is_enabled():
+    view: GameView = create_view()
+
+    async def run():
+        await view.enable_input()
+        assert isinstance(view.state, SelectingState)
+        assert await view.get_moveable_squares((4, 6)) == {(4, 5), (4, 4)}  # e2 pawn
+        assert view.all_moveable_squares is not None
+        assert len(view.all_moveable_squares) == 16
+
+    asyncio.run(run())
+
+    # back rank pieces other than the knights are blocked in
+    immobile_squares: set[tuple[int, int]] = view.get_immobile_squares()
+    assert immobile_squares == {(0, 7), (2, 7), (3, 7), (4, 7), (5, 7), (7, 7)}
+
+    # the selection cursor steps over them, or stays put when none are left to land on
+    cursor: Cursor = Cursor(0, 0, 7, 7, (1, 7))
+    cursor.move(1, 0, immobile_squares)
+    assert cursor.square == (6, 7)
+    cursor.move(1, 0, immobile_squares)
+    assert cursor.square == (6, 7)
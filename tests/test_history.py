@@ -0,0 +1,86 @@
+from model.board import Board
+from model.history import GameHistory
+from model.movement import Movement
+from model.pieces import Knight
+
+GAME: list[str] = ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5a4", "g8f6", "e1g1"]
+
+
+def create_history(
+    moves: list[str], checkpoint_interval: int = 4
+) -> tuple[GameHistory, list[Board]]:
+    """Plays moves from the start position, returning the history and the board after each ply"""
+    board: Board = Board()
+    board.setup_pieces()
+    history: GameHistory = GameHistory(board, checkpoint_interval)
+    boards: list[Board] = [board]
+    for notation in moves:
+        movement: Movement = Movement.create_from_algebraic(notation)
+        is_promotion: bool = board.is_promotion(movement)
+        board = board.move_piece(movement)
+        history.push(movement, board, is_promotion)
+        boards.append(board)
+    return history, boards
+
+
+def test_get_board_replays_every_ply():
+    history, boards = create_history(GAME)
+    # out of order, so positions come from the cache, checkpoints and the start
+    for ply in [9, 0, 5, 4, 8, 1, 7, 3, 2, 6]:
+        assert history.get_board(ply).fen_serialize() == boards[ply].fen_serialize()
+
+
+def test_undo_and_redo():
+    history, boards = create_history(GAME)
+
+    assert history.undo(2).fen_serialize() == boards[7].fen_serialize()
+    assert history.ply == 7
+    assert history.get_algebraic_movements() == GAME[:7]
+    assert history.can_redo(2)
+    assert not history.can_redo(3)
+
+    assert history.redo(1).fen_serialize() == boards[8].fen_serialize()
+    assert history.undo(8).fen_serialize() == boards[0].fen_serialize()
+    assert not history.can_undo()
+
+
+def test_push_after_undo_discards_redoable_moves():
+    history, _ = create_history(GAME)
+    history.undo(3)
+    board: Board = history.get_board(history.ply)
+    movement: Movement = Movement.create_from_algebraic("d2d3")
+
+    new_board: Board = board.move_piece(movement)
+    history.push(movement, new_board)
+
+    assert len(history) == 7
+    assert not history.can_redo()
+    assert history.get_algebraic_movements() == [*GAME[:6], "d2d3"]
+    assert history.get_board(7).fen_serialize() == new_board.fen_serialize()
+    # a checkpoint after the discarded moves must not be reused
+    history.get_board(0)
+    assert history.get_board(7).fen_serialize() == new_board.fen_serialize()
+
+
+def test_promotion_is_kept():
+    board: Board = Board.create_from_fen("8/P6k/8/8/8/8/8/K7 w - - 0 1")
+    history: GameHistory = GameHistory(board)
+    movement: Movement = Movement((0, 1), (0, 0), Knight)
+    history.push(movement, board.move_piece(movement), board.is_promotion(movement))
+
+    assert history.get_algebraic_movements() == ["a7a8n"]
+    assert history.get_board(1).fen_serialize() == "N7/7k/8/8/8/8/8/K7 b - - 0 1"
+
+
+def test_create_from_codes_restores_history():
+    history, boards = create_history(GAME)
+    history.undo(2)
+
+    restored: GameHistory = GameHistory.create_from_codes(
+        history.get_start_fen(), history.get_codes(), history.ply, boards[7], 4
+    )
+
+    assert restored.ply == 7
+    assert len(restored) == len(GAME)
+    assert restored.redo(2).fen_serialize() == boards[9].fen_serialize()
+    assert restored.get_board(2).fen_serialize() == boards[2].fen_serialize()
@@ -0,0 +1,54 @@
+import asyncio
+from pathlib import Path
+
+from util.logger import Logger
+
+
+def test_flush_sync_writes_records_once(tmp_path: Path):
+    path: Path = tmp_path / "game.log"
+    logger: Logger = Logger(str(path), "info")
+    logger.log("kept")
+    logger.log("skipped", "debug")
+
+    logger.flush_sync()
+    logger.flush_sync()
+
+    lines: list[str] = path.read_text().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("INFO    kept")
+
+
+def test_records_logged_after_run_are_written_by_flush_sync(tmp_path: Path):
+    path: Path = tmp_path / "game.log"
+    logger: Logger = Logger(str(path), "info", flush_interval=60)
+
+    async def run():
+        task: asyncio.Task[None] = asyncio.create_task(logger.run())
+        await asyncio.sleep(0)
+        logger.log("during")
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    logger.log("after")  # e.g. reports once the event loop has stopped
+    logger.flush_sync()
+
+    assert [line.split()[-1] for line in path.read_text().splitlines()] == ["during", "after"]
+
+
+def test_log_async_waits_instead_of_dropping(tmp_path: Path):
+    path: Path = tmp_path / "game.log"
+    logger: Logger = Logger(str(path), "info", capacity=5, flush_interval=0.001)
+
+    async def run():
+        task: asyncio.Task[None] = asyncio.create_task(logger.run())
+        await asyncio.sleep(0)
+        for index in range(50):
+            await logger.log_async(str(index))
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert logger.dropped == 0
+    assert len(path.read_text().splitlines()) == 50
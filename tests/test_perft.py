@@ -0,0 +1,36 @@
+import pytest
+
+from model.board import Board
+from model.perft import START_FEN, divide, parallel_divide, perft
+
+# standard positions with their known counts, kept to depths that run in seconds
+POSITIONS: list[tuple[str, list[int]]] = [
+    (START_FEN, [20, 400, 8902]),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039]),
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812]),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467]),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486]),
+    ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", [46, 2079]),
+]
+
+
+@pytest.mark.parametrize(("fen", "counts"), POSITIONS)
+def test_perft(fen: str, counts: list[int]):
+    board: Board = Board.create_from_fen(fen)
+    for depth, count in enumerate(counts, start=1):
+        assert perft(board, depth) == count, f"Depth {depth} of {fen}"
+
+
+def test_divide_sums_to_perft():
+    board: Board = Board.create_from_fen(POSITIONS[1][0])
+    counts: dict[str, int] = divide(board, 2)
+    assert len(counts) == 48
+    assert counts["e1g1"] == 43
+    assert sum(counts.values()) == 2039
+
+
+def test_parallel_divide_matches_divide():
+    fen: str = POSITIONS[3][0]
+    assert parallel_divide(fen, 2, workers=2, split_depth=2) == divide(
+        Board.create_from_fen(fen), 2
+    )
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+
+from model.board import Board
+from model.movement import Movement
+from model.pgn import read_game_at, read_games
+from model.position_index import PositionIndex, build_index
+
+PGN: str = """[Event "Open game"]
+[White "A"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Event "Sicilian"]
+[White "B"]
+
+1. e4 c5 {the transposition below is not reached} 2. Nf3 (2. c3) d6 0-1
+
+[Event "Illegal move"]
+
+1. e4 Ke5 *
+
+[Event "No rook to castle with"]
+[FEN "4k3/8/8/8/8/8/8/4K3 w - - 0 1"]
+
+1. O-O *
+
+[Event "No kings"]
+[FEN "8/8/8/8/8/8/8/8 w - - 0 1"]
+
+1. e4 *
+
+[Event "From a position"]
+[FEN "4k3/8/8/8/8/8/8/R3K3 w Q - 0 1"]
+
+1. O-O-O Kd7 *
+"""
+
+
+def create_board(moves: list[str], fen: str | None = None) -> Board:
+    if fen:
+        board: Board = Board.create_from_fen(fen)
+    else:
+        board = Board()
+        board.setup_pieces()
+    for notation in moves:
+        board = board.move_piece(Movement.create_from_algebraic(notation))
+    return board
+
+
+@pytest.fixture
+def pgn_path(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1_000_000, 3])  # in memory, and merged from runs
+def test_build_index_skips_unreadable_games(pgn_path: Path, tmp_path: Path, chunk_size: int):
+    index_path: Path = tmp_path / "games.idx"
+    assert build_index(str(pgn_path), str(index_path), chunk_size) == (3, 3)
+
+    offsets: list[int] = [game.offset for game in read_games(str(pgn_path))]
+    index: PositionIndex = PositionIndex(str(index_path))
+    try:
+        assert index.get_game_offsets(create_board([])) == [offsets[0], offsets[1]]
+        assert index.get_game_offsets(create_board(["e2e4", "e7e5", "g1f3"])) == [offsets[0]]
+        assert index.count_games(create_board(["e2e4", "c7c5"])) == 1
+        assert index.count_games(create_board(["d2d4"])) == 0
+        castled: Board = create_board(["e1c1"], "4k3/8/8/8/8/8/8/R3K3 w Q - 0 1")
+        assert index.get_game_offsets(castled) == [offsets[5]]
+    finally:
+        index.close()
+
+    assert read_game_at(str(pgn_path), offsets[1]).headers["Event"] == "Sicilian"
+
+
+def test_invalid_index_is_rejected(tmp_path: Path):
+    empty_path: Path = tmp_path / "empty.idx"
+    empty_path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        PositionIndex(str(empty_path))
+
+    truncated_path: Path = tmp_path / "truncated.idx"
+    truncated_path.write_bytes(b"CHPIDX01" + bytes(15))
+    with pytest.raises(ValueError):
+        PositionIndex(str(truncated_path))
@@ -0,0 +1,54 @@
+from model.board import Board
+from model.movement import Movement
+from model.repetition import RepetitionTracker
+
+# knights out and back, repeating the start position every four plies
+KNIGHT_SHUFFLE: list[str] = ["g1f3", "g8f6", "f3g1", "f6g8"]
+
+
+def play(notations: list[str]) -> tuple[RepetitionTracker, list[Board], list[int]]:
+    """Plays from the start position, returning the tracker, the boards and each count"""
+    board: Board = Board()
+    board.setup_pieces()
+    tracker: RepetitionTracker = RepetitionTracker(board)
+    boards: list[Board] = [board]
+    counts: list[int] = []
+    for notation in notations:
+        board = board.move_piece(Movement.create_from_algebraic(notation))
+        counts.append(tracker.push(board))
+        boards.append(board)
+    return tracker, boards, counts
+
+
+def test_threefold_repetition():
+    tracker, boards, counts = play(KNIGHT_SHUFFLE * 2)
+    assert counts == [1, 1, 1, 2, 2, 2, 2, 3]
+    assert tracker.is_threefold_repetition(boards[-1])
+    assert not tracker.is_threefold_repetition(boards[-2])
+
+
+def test_irreversible_move_resets_counts():
+    tracker, boards, counts = play([*KNIGHT_SHUFFLE, "e2e4", *KNIGHT_SHUFFLE])
+    assert counts[-1] == 2  # of the position after e2e4, not the start position
+    assert tracker.get_count(boards[0]) == 0
+    assert len(tracker.get_keys()) == 5
+
+
+def test_en_passant_right_changes_position():
+    # the same placement with and without an en passant capture available
+    _, boards, counts = play(["e2e4", "a7a6", "e4e5", "d7d5", "g1f3", "g8f6", "f3g1"])
+    assert counts[-1] == 1
+    assert boards[4].get_position_key() != boards[0].get_position_key()
+
+
+def test_restore_and_rebuild():
+    tracker, boards, _ = play(KNIGHT_SHUFFLE * 2)
+
+    restored: RepetitionTracker = RepetitionTracker(boards[0])
+    restored.restore(tracker.get_keys())
+    assert restored.get_count(boards[-1]) == 3
+
+    # e.g. after taking back the last two plies
+    restored.rebuild(boards[:-2])
+    assert restored.get_count(boards[0]) == 2
+    assert restored.get_keys() == tracker.get_keys()[:-2]
@@ -0,0 +1,84 @@
+import pytest
+
+from model.board import Board
+from model.movement import Movement
+from model.pgn import get_san_movements
+from model.san import get_san, parse_san
+from model.termination import Termination
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# position, movement and its SAN
+CASES: list[tuple[str, str, str]] = [
+    (START_FEN, "e2e4", "e4"),
+    (START_FEN, "g1f3", "Nf3"),
+    ("4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1", "b1d2", "Nbd2"),
+    ("4k3/8/8/R7/8/8/8/R3K3 w - - 0 1", "a1a3", "R1a3"),
+    ("4k3/8/8/8/8/Q7/8/Q1Q1K3 w - - 0 1", "a1b2", "Qa1b2"),
+    ("4k3/8/8/4b3/8/2N3N1/7K/8 w - - 0 1", "c3e4", "Ne4"),  # other knight is pinned
+    ("4k3/8/8/8/8/8/8/4K2R w K - 0 1", "e1g1", "O-O"),
+    ("r3k3/8/8/8/8/8/8/4K3 b q - 0 1", "e8c8", "O-O-O"),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", "exd6"),
+    ("3r2k1/4P3/8/8/8/8/8/4K3 w - - 0 1", "e7d8q", "exd8=Q+"),
+    ("rnbqkbnr/pppp1ppp/8/4p3/6P1/5P2/PPPPP2P/RNBQKBNR b KQkq - 0 2", "d8h4", "Qh4#"),
+]
+
+
+def get_move_san(board: Board, movement: Movement, use_moveable_squares: bool) -> str:
+    """Returns SAN with check and checkmate taken from the new position, as the controller does"""
+    new_board: Board = board.move_piece(movement)
+    all_moveable_squares: dict[tuple[int, int], set[tuple[int, int]]] | None = (
+        board.get_all_moveable_squares(board.white_turn) if use_moveable_squares else None
+    )
+    return get_san(
+        board,
+        movement,
+        new_board.is_king_in_check(new_board.white_turn),
+        new_board.get_termination() == Termination.CHECKMATE,
+        all_moveable_squares,
+    )
+
+
+@pytest.mark.parametrize("use_moveable_squares", [False, True])
+@pytest.mark.parametrize(("fen", "notation", "san"), CASES)
+def test_get_san(fen: str, notation: str, san: str, use_moveable_squares: bool):
+    board: Board = Board.create_from_fen(fen)
+    movement: Movement = Movement.create_from_algebraic(notation)
+    assert get_move_san(board, movement, use_moveable_squares) == san
+
+
+@pytest.mark.parametrize(("fen", "notation", "san"), CASES)
+def test_parse_san(fen: str, notation: str, san: str):
+    board: Board = Board.create_from_fen(fen)
+    movement: Movement = parse_san(board, san)
+    assert movement.to_algebraic(board.is_promotion(movement)) == notation
+
+
+def test_parse_san_rejects_ambiguous_and_impossible_moves():
+    board: Board = Board.create_from_fen("4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1")
+    with pytest.raises(ValueError):
+        parse_san(board, "Nd2")
+    with pytest.raises(ValueError):
+        parse_san(board, "Nd4")
+    with pytest.raises(ValueError):
+        parse_san(board, "N-d2")
+
+
+def test_movetext_main_line():
+    movetext_lines: list[str] = [
+        "1. e4 {best by test} e5 2. Nf3 (2. f4 exf4 (2... d5)) Nc6 $1",
+        "3. Bb5 a6; the Morphy defence",
+        "4. Ba4 1/2-1/2",
+    ]
+    san_movements: list[str] = get_san_movements(movetext_lines)
+    assert san_movements == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4"]
+
+    # the notation of each move is reproduced when replaying it
+    board: Board = Board.create_from_fen(START_FEN)
+    for san in san_movements:
+        movement: Movement = parse_san(board, san)
+        assert get_move_san(board, movement, False) == san
+        board = board.move_piece(movement)
+    assert board.fen_serialize() == (
+        "r1bqkbnr/1ppp1ppp/p1n5/4p3/B3P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 1 4"
+    )
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+from controller.saved_game import SavedGame
+from model.board import PACKED_BOARD, Board
+from model.termination import Termination
+from tests.test_game_controller import create_controller
+from tests.test_history import GAME, create_history
+
+PACKED_FENS: list[str] = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/8/8/8/8/8/8/R3K2R b Kq - 7 40",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "4k3/8/8/8/8/8/8/4K3 w - - 99 120",
+]
+
+
+def get_legal_notations(board: Board) -> list[str]:
+    """Legal moves of the side to move, which include castling and en passant"""
+    return sorted(
+        movement.to_algebraic(board.is_promotion(movement))
+        for movement in board.get_legal_movements(board.white_turn)
+    )
+
+
+@pytest.mark.parametrize("fen", PACKED_FENS)
+def test_board_pack_round_trip(fen: str):
+    board: Board = Board.create_from_fen(fen)
+    packed: bytes = board.pack()
+    assert len(packed) == PACKED_BOARD.size
+
+    unpacked: Board = Board.create_from_packed(packed)
+    assert unpacked.fen_serialize() == fen
+    assert unpacked.get_position_key() == board.get_position_key()
+    assert get_legal_notations(unpacked) == get_legal_notations(board)
+
+
+def test_board_pack_keeps_termination():
+    board: Board = Board.create_from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+    board.game_over = True
+    board.termination = Termination.INSUFFICIENT_MATERIAL
+
+    unpacked: Board = Board.create_from_packed(board.pack())
+    assert unpacked.game_over
+    assert unpacked.termination == Termination.INSUFFICIENT_MATERIAL
+
+
+def test_saved_game_round_trip(tmp_path: Path):
+    history, boards = create_history(GAME)
+    history.undo(2)  # moves that can be redone are saved too
+    settings: dict[str, object] = {"white_engine_path": "engines/stockfish", "white_depth": 12}
+    path: Path = tmp_path / "game.save"
+    SavedGame(boards[7], history, ["key 1", "key 2"], ["e4", "e5"], settings).write(str(path))
+
+    saved_game: SavedGame = SavedGame.read(str(path))
+    assert saved_game.board.fen_serialize() == boards[7].fen_serialize()
+    assert saved_game.history.ply == 7
+    assert saved_game.history.get_algebraic_movements() == GAME[:7]
+    assert saved_game.history.redo(2).fen_serialize() == boards[9].fen_serialize()
+    assert saved_game.repetition_keys == ["key 1", "key 2"]
+    assert saved_game.move_texts == ["e4", "e5"]
+    assert saved_game.engine_settings == settings
+    assert not (tmp_path / "game.save.tmp").exists()
+
+
+def test_saved_game_rejects_other_files(tmp_path: Path):
+    history, boards = create_history(GAME[:2])
+    path: Path = tmp_path / "game.save"
+    SavedGame(boards[2], history, [], [], {}).write(str(path))
+    data: bytes = path.read_bytes()
+
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        SavedGame.read(str(path))
+
+    # ends within the sections, or within the packed board after them
+    for length in (12, 40):
+        path.write_bytes(data[:length])
+        with pytest.raises(ValueError, match="truncated"):
+            SavedGame.read(str(path))
+
+    path.write_bytes(b"[Event]" + data)
+    with pytest.raises(ValueError):
+        SavedGame.read(str(path))
+
+
+def test_controller_resumes_saved_game(tmp_path: Path):
+    history, boards = create_history(GAME)
+    path: Path = tmp_path / "game.save"
+    settings: dict[str, object] = {"engine_depth": 3}
+    SavedGame(boards[9], history, [], ["e4"] * 9, settings).write(str(path))
+
+    controller = create_controller(["--resume", str(path)])
+    assert controller.board.fen_serialize() == boards[9].fen_serialize()
+    assert controller.history.ply == 9
+    assert controller.config.engine_depth == 3
+    assert controller.save_path == str(path)
+    assert controller.engine_settings["engine_depth"] == 3
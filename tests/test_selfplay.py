@@ -0,0 +1,58 @@
+import io
+import random
+
+import pytest
+
+from engine.selfplay import RECORD, RecordWriter, SelfPlayGame, get_score, pack_board, unpack_board
+from model.board import Board
+from model.movement import Movement
+from model.pieces import Piece
+
+
+@pytest.mark.parametrize(
+    ("score", "expected"),
+    [
+        (None, None),
+        ("cp 34", 34),
+        ("cp -25000", -20000),
+        ("cp 25000 lowerbound", 20000),
+        ("mate 3", 29997),
+        ("mate -2", -29998),
+    ],
+)
+def test_scores_are_stored_as_centipawns(score: str | None, expected: int | None):
+    assert get_score(score) == expected
+
+
+def test_packed_boards_unpack_to_same_pieces():
+    board: Board = Board.create_from_fen(
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    )
+    pieces: dict[tuple[int, int], Piece] = unpack_board(pack_board(board))
+    assert {square: (type(piece), piece.is_white) for square, piece in pieces.items()} == {
+        square: (type(piece), piece.is_white) for square, piece in board.get_pieces().items()
+    }
+
+
+def test_records_are_written_once_buffer_fills():
+    file: io.BytesIO = io.BytesIO()
+    writer: RecordWriter = RecordWriter(file, buffer_records=2, flush_interval=60)
+    board: Board = Board()
+    board.setup_pieces()
+
+    writer.append(pack_board(board), True, 30, 1)
+    assert file.getvalue() == b""
+    writer.append(pack_board(board), False, -30, 1)
+    assert len(file.getvalue()) == 2 * RECORD.size
+
+    records = list(RECORD.iter_unpack(file.getvalue()))
+    assert [record[1:] for record in records] == [(True, 30, 1), (False, -30, 1)]
+    assert writer.records_written == 2
+
+
+def test_game_result_is_labelled_from_white():
+    game: SelfPlayGame = SelfPlayGame(random.Random(0), (0, 0), 10)
+    for notation in ["f2f3", "e7e5", "g2g4"]:
+        assert not game.move(Movement.create_from_algebraic(notation))
+    assert game.move(Movement.create_from_algebraic("d8h4"))
+    assert game.result == -1
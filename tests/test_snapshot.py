@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+
+import pytest
+
+from model.board import Board
+from model.movement import Movement
+from model.pieces import Pawn
+from model.snapshot import BoardSnapshot, PieceSnapshot
+
+
+def create_board() -> Board:
+    board: Board = Board()
+    board.setup_pieces()
+    return board.move_piece(Movement.create_from_algebraic("e2e4"))
+
+
+def get_state(board: Board) -> tuple[str, list[tuple[tuple[int, int], str, bool, bool]]]:
+    """FEN and every piece with its flags, which the FEN alone does not cover"""
+    return board.fen_serialize(), [
+        (square, piece.name, piece.is_white, piece.has_moved)
+        for square, piece in sorted(board.get_pieces().items())
+    ]
+
+
+def test_snapshot_cannot_change_board():
+    board: Board = create_board()
+    state: tuple[str, list[tuple[tuple[int, int], str, bool, bool]]] = get_state(board)
+    snapshot: BoardSnapshot = BoardSnapshot(board)
+
+    with pytest.raises(AttributeError):
+        snapshot.white_turn = False  # pyright: ignore[reportAttributeAccessIssue]
+    with pytest.raises(AttributeError):
+        snapshot.game_over = True  # pyright: ignore[reportAttributeAccessIssue]
+    with pytest.raises(AttributeError):
+        del snapshot.halfmove_clock  # pyright: ignore[reportAttributeAccessIssue]
+    with pytest.raises(AttributeError):
+        snapshot._board  # pyright: ignore[reportAttributeAccessIssue]  # noqa: B018
+
+    pieces: Mapping[tuple[int, int], PieceSnapshot] = snapshot.get_pieces()
+    with pytest.raises(TypeError):
+        pieces[(4, 4)] = pieces[(0, 0)]  # pyright: ignore[reportIndexIssue]
+    with pytest.raises(TypeError):
+        del pieces[(0, 0)]  # pyright: ignore[reportIndexIssue]
+
+    piece: PieceSnapshot = pieces[(4, 4)]
+    with pytest.raises(AttributeError):
+        piece.has_moved = True  # pyright: ignore[reportAttributeAccessIssue]
+    with pytest.raises(AttributeError):
+        piece.is_white = False  # pyright: ignore[reportAttributeAccessIssue]
+    with pytest.raises(AttributeError):
+        piece._piece  # pyright: ignore[reportAttributeAccessIssue]  # noqa: B018
+
+    # moves and copies are made on new boards
+    snapshot.move_piece(Movement.create_from_algebraic("e7e5"))
+    copied: Board = snapshot.to_board()
+    copied.get_pieces()[(0, 7)].has_moved = True
+    copied.white_turn = True
+
+    assert get_state(board) == state
+
+
+def test_snapshot_reads_board():
+    board: Board = create_board()
+    snapshot: BoardSnapshot = BoardSnapshot(board)
+
+    assert snapshot.fen_serialize() == board.fen_serialize()
+    assert not snapshot.white_turn
+    assert snapshot.pawn_double_move == (4, 4)
+    assert snapshot.get_pieces() is snapshot.get_pieces()  # created once
+    assert len(snapshot.get_pieces()) == 32
+
+    pawn: PieceSnapshot = snapshot.get_pieces()[(4, 4)]
+    assert pawn.piece_class is Pawn
+    assert pawn.is_white
+    assert pawn.has_moved
+    assert pawn.character == "P"
+    assert snapshot.get_moveable_squares((4, 1)) == {(4, 2), (4, 3)}
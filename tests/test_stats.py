@@ -0,0 +1,10 @@
+from util.stats import get_percentile
+
+
+def test_get_percentile_uses_nearest_rank():
+    samples: list[float] = [float(value) for value in range(1, 11)]
+    assert get_percentile(samples, 50) == 5
+    assert get_percentile(samples, 90) == 9
+    assert get_percentile(samples, 99) == 10
+    assert get_percentile(samples, 0) == 1
+    assert get_percentile([3.0], 99) == 3
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from engine.uci_engine import UCIEngine, UCIEngineError
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# engine with a Hash option that fails its first searches by hanging or exiting on 'go',
+# then moves normally, counting its starts in a file next to it
+STUB_ENGINE: str = """#!{executable}
+import sys
+from pathlib import Path
+
+starts_path = Path(__file__).with_suffix(".starts")
+starts = int(starts_path.read_text()) if starts_path.exists() else 0
+starts_path.write_text(str(starts + 1))
+
+for line in sys.stdin:
+    command = line.split()
+    if command == ["uci"]:
+        print("option name Hash type spin default 16 min 1 max 1024", flush=True)
+        print("uciok", flush=True)
+    elif command == ["isready"]:
+        print("readyok", flush=True)
+    elif command and command[0] == "go":
+        if starts < {failed_starts}:
+            print("info depth 1 score cp 10 pv e2e4", flush=True)
+            if "{failure}" == "exit":
+                sys.exit(1)
+            continue  # hangs, never sending 'bestmove'
+        print("bestmove d2d4", flush=True)
+    elif command == ["quit"]:
+        break
+"""
+
+
+def create_engine(
+    tmp_path: Path,
+    failure: str = "hang",
+    failed_starts: int = 0,
+    max_restarts: int = 3,
+    options: dict[str, str] | None = None,
+) -> UCIEngine:
+    path: Path = tmp_path / "engine.py"
+    path.write_text(
+        STUB_ENGINE.format(executable=sys.executable, failure=failure, failed_starts=failed_starts)
+    )
+    path.chmod(0o755)
+    return UCIEngine(str(path), 1, move_timeout=0.5, max_restarts=max_restarts, options=options)
+
+
+def get_starts(tmp_path: Path) -> int:
+    return int((tmp_path / "engine.starts").read_text())
+
+
+@pytest.mark.parametrize("failure", ["hang", "exit"])
+def test_engine_is_restarted_after_failed_search(tmp_path: Path, failure: str):
+    engine: UCIEngine = create_engine(tmp_path, failure, failed_starts=2, max_restarts=3)
+
+    async def run():
+        await engine.start()
+        try:
+            assert await engine.get_move(START_FEN) == "d2d4"
+        finally:
+            await engine.terminate()
+
+    asyncio.run(run())
+    assert engine.restarts == 2
+    assert get_starts(tmp_path) == 3
+    if failure == "hang":
+        assert (engine.timeouts, engine.crashes) == (2, 0)
+    else:
+        assert (engine.timeouts, engine.crashes) == (0, 2)
+    assert engine.get_watchdog_report().endswith(
+        f"{engine.timeouts} timeout(s), {engine.crashes} crash(es), 2 restart(s)"
+    )
+
+
+@pytest.mark.parametrize("failure", ["hang", "exit"])
+def test_engine_error_surfaces_after_restart_limit(tmp_path: Path, failure: str):
+    engine: UCIEngine = create_engine(tmp_path, failure, failed_starts=10, max_restarts=2)
+
+    async def run():
+        await engine.start()
+        try:
+            with pytest.raises(UCIEngineError, match="after 2 restart"):
+                await engine.get_move(START_FEN)
+        finally:
+            await engine.terminate()
+
+    asyncio.run(run())
+    assert engine.restarts == 2
+    assert engine.timeouts + engine.crashes == 3
+    assert get_starts(tmp_path) == 3
+
+
+def test_options_are_checked_against_advertised_ones(tmp_path: Path):
+    async def start(options: dict[str, str]):
+        engine: UCIEngine = create_engine(tmp_path, options=options)
+        await engine.start()
+        await engine.terminate()
+
+    asyncio.run(start({"hash": "64"}))  # names are matched case insensitively
+    with pytest.raises(UCIEngineError, match="has no option 'Threads'"):
+        asyncio.run(start({"Threads": "8"}))
+    with pytest.raises(UCIEngineError, match="outside 1 to 1024"):
+        asyncio.run(start({"Hash": "4096"}))
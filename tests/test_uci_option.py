@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from controller.game_config import GameConfig
+from engine.uci_option import UCIOption, parse_option_assignment
+from run import create_parser
+
+
+def create_config(arguments: list[str]) -> GameConfig:
+    return GameConfig(**vars(create_parser().parse_args(arguments)))
+
+
+def test_option_lines_are_parsed():
+    option: UCIOption = UCIOption.create_from_line(
+        "option name Hash type spin default 16 min 1 max 33554432"
+    )
+    assert (option.name, option.type, option.default) == ("Hash", "spin", "16")
+    assert (option.minimum, option.maximum) == (1, 33554432)
+
+    # names and choices may contain spaces
+    option = UCIOption.create_from_line(
+        "option name Analysis Contempt type combo default Both var Off var White var Both"
+    )
+    assert option.name == "Analysis Contempt"
+    assert option.choices == ["Off", "White", "Both"]
+
+    with pytest.raises(ValueError):
+        UCIOption.create_from_line("option name Hash")
+
+
+def test_spin_values_are_checked_against_range():
+    option: UCIOption = UCIOption("Threads", "spin", "1", 1, 512)
+    assert option.validate("8") == "8"
+    assert option.validate("512") == "512"
+    with pytest.raises(ValueError, match="outside 1 to 512"):
+        option.validate("0")
+    with pytest.raises(ValueError, match="outside 1 to 512"):
+        option.validate("513")
+    with pytest.raises(ValueError, match="expects an integer"):
+        option.validate("eight")
+
+
+def test_check_and_combo_values_are_normalised():
+    check: UCIOption = UCIOption("Ponder", "check", "false")
+    assert check.validate("TRUE") == "true"
+    assert check.validate("False") == "false"
+    with pytest.raises(ValueError, match="true or false"):
+        check.validate("yes")
+
+    combo: UCIOption = UCIOption("Style", "combo", "Normal", choices=["Solid", "Normal", "Risky"])
+    assert combo.validate("risky") == "Risky"
+    with pytest.raises(ValueError, match="one of Solid, Normal, Risky"):
+        combo.validate("Wild")
+
+    button: UCIOption = UCIOption("Clear Hash", "button")
+    assert button.validate("") == ""
+    with pytest.raises(ValueError, match="takes no value"):
+        button.validate("true")
+
+
+@pytest.mark.parametrize(
+    ("assignment", "expected"),
+    [("Threads=8", ("Threads", "8")), (" Hash = 1024 ", ("Hash", "1024")), ("Path=", ("Path", ""))],
+)
+def test_option_assignments_are_split(assignment: str, expected: tuple[str, str]):
+    assert parse_option_assignment(assignment) == expected
+
+
+@pytest.mark.parametrize("assignment", ["Threads", "=8", " =8", ""])
+def test_malformed_option_assignments_are_rejected(assignment: str):
+    with pytest.raises(ValueError, match="expected NAME=VALUE"):
+        parse_option_assignment(assignment)
+
+
+def test_engine_options_file_is_overridden_by_command_line(tmp_path: Path):
+    path: Path = tmp_path / "options.json"
+    path.write_text(
+        json.dumps({"white": {"Threads": 8, "Ponder": True}, "black": {"Style": "Risky"}})
+    )
+    config: GameConfig = create_config(
+        ["--engine-options", str(path), "--white-option", "Threads=2"]
+    )
+    assert config.white_options == {"Threads": "2", "Ponder": "true"}
+    assert config.black_options == {"Style": "Risky"}
+
+
+@pytest.mark.parametrize(
+    "options",
+    [[], {"red": {}}, {"white": ["Threads", 8]}],
+)
+def test_invalid_engine_options_file_is_rejected(tmp_path: Path, options: object):
+    path: Path = tmp_path / "options.json"
+    path.write_text(json.dumps(options))
+    with pytest.raises(ValueError, match="must map 'white' and 'black'"):
+        create_config(["--engine-options", str(path)])
@@ -1,7 +1,13 @@
-def log(message: str):
-    with open("log", "a") as log_file:
-        log_file.write(f"{message}\n")
+from .logger import Logger
 
+# shared by the whole application, configured and flushed by the controller
+logger: Logger = Logger()
 
-def clear_log():
-    open("log", "w")
+
+def log(message: str, level: str = "info"):
+    logger.log(message, level)
+
+
+async def log_async(message: str, level: str = "info"):
+    """Logs without dropping records, waiting for the next flush if the buffer is full"""
+    await logger.log_async(message, level)
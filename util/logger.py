@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+
+LEVELS: dict[str, int] = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+
+class Logger:
+    """
+    Buffers log records in memory and writes them in batches from a background task,
+    so logging never waits on the disk. When the buffer is full of unwritten records
+    the oldest are dropped, or callers of log_async wait for the next flush instead.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        level: str = "info",
+        capacity: int = 10_000,
+        flush_interval: float = 0.5,
+    ):
+        self.path: str | None = path
+        self.level: int = LEVELS[level]
+        self.flush_interval: float = flush_interval
+
+        # ring buffer of (timestamp, level, message), keeps recently written records for dumps
+        self._buffer: deque[tuple[float, str, str]] = deque(maxlen=capacity)
+        self._unflushed: int = 0
+        self._flushed: asyncio.Event | None = None
+        self._running: bool = False
+
+        self.dropped: int = 0
+
+    def configure(self, path: str | None, level: str):
+        if level not in LEVELS:
+            raise ValueError(f"Invalid log level '{level}'")
+        self.path = path
+        self.level = LEVELS[level]
+
+    def is_enabled_for(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def log(self, message: str, level: str = "info"):
+        """Adds record to the buffer without blocking, dropping the oldest if full"""
+        if LEVELS[level] < self.level:
+            return
+
+        if self._unflushed == self._buffer.maxlen:
+            self.dropped += 1
+        else:
+            self._unflushed += 1
+        self._buffer.append((time.time(), level, message))
+
+    async def log_async(self, message: str, level: str = "info"):
+        """Adds record to the buffer, waiting for a flush if it is full"""
+        while self._unflushed == self._buffer.maxlen and self._running:
+            if self._flushed is None:
+                self._flushed = asyncio.Event()
+            await self._flushed.wait()
+        self.log(message, level)
+
+    async def run(self):
+        """Background task that periodically writes buffered records"""
+        self._running = True
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            self.flush_sync()
+            raise
+        finally:
+            self._running = False
+
+    async def flush(self):
+        records: list[tuple[float, str, str]] = self._take_unflushed()
+        if len(records) != 0:
+            # write in a worker thread so a slow disk does not stall the event loop
+            await asyncio.to_thread(self._write, records)
+
+        if self._flushed:
+            self._flushed.set()
+            self._flushed = None
+
+    def flush_sync(self):
+        """Writes buffered records on the calling thread, e.g. after the event loop has stopped"""
+        self._write(self._take_unflushed())
+
+    def dump(self, path: str):
+        """Writes everything still in the buffer, e.g. after a crash"""
+        with open(path, "w") as dump_file:
+            dump_file.writelines(self._format(record) for record in self._buffer)
+            if self.dropped != 0:
+                dump_file.write(f"{self.dropped} record(s) dropped\n")
+
+    def _take_unflushed(self) -> list[tuple[float, str, str]]:
+        start: int = len(self._buffer) - self._unflushed
+        records: list[tuple[float, str, str]] = list(itertools.islice(self._buffer, start, None))
+        self._unflushed = 0
+        return records
+
+    def _write(self, records: list[tuple[float, str, str]]):
+        if self.path is None or len(records) == 0:
+            return
+        with open(self.path, "a") as log_file:
+            log_file.writelines(self._format(record) for record in records)
+
+    def _format(self, record: tuple[float, str, str]) -> str:
+        timestamp, level, message = record
+        clock: str = time.strftime("%H:%M:%S", time.localtime(timestamp))
+        milliseconds: int = int(timestamp % 1 * 1000)
+        return f"{clock}.{milliseconds:03d} {level.upper():<7} {message}\n"
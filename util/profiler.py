@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .stats import get_percentile
+
+
+class Profiler:
+    """
+    Records call counts and timings of instrumented methods.
+    Methods are only wrapped while the profiler is running,
+    so there is no overhead when profiling is disabled.
+    """
+
+    def __init__(self, cprofile_path: str | None = None):
+        self.cprofile_path: str | None = cprofile_path
+        self._cprofile: cProfile.Profile | None = None
+        self._samples: dict[str, list[float]] = {}
+        self._patched: list[tuple[type, str, Any]] = []
+        self._start_time: float = 0
+
+    def start(self, targets: list[tuple[type, str, str]]):
+        """Instruments each (class, method name, metric name) target"""
+        for cls, method_name, metric_name in targets:
+            self.instrument(cls, method_name, metric_name)
+
+        self._start_time = time.perf_counter()
+        if self.cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+
+        for cls, method_name, original in reversed(self._patched):
+            setattr(cls, method_name, original)
+        self._patched = []
+
+    def instrument(self, cls: type, method_name: str, metric_name: str):
+        original: Callable[..., Any] = getattr(cls, method_name)
+        samples: list[float] = self._samples.setdefault(metric_name, [])
+
+        if inspect.iscoroutinefunction(original):
+
+            @functools.wraps(original)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start_time: float = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start_time)
+
+            setattr(cls, method_name, async_wrapper)
+
+        else:
+
+            @functools.wraps(original)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                start_time: float = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start_time)
+
+            setattr(cls, method_name, wrapper)
+
+        self._patched.append((cls, method_name, original))
+
+    def get_report(self) -> dict[str, Any]:
+        metrics: dict[str, dict[str, float]] = {}
+        for metric_name, samples in self._samples.items():
+            if len(samples) == 0:
+                continue
+            ordered: list[float] = sorted(samples)
+            metrics[metric_name] = {
+                "calls": len(ordered),
+                "total_ms": sum(ordered) * 1000,
+                "mean_ms": sum(ordered) / len(ordered) * 1000,
+                "p50_ms": get_percentile(ordered, 50) * 1000,
+                "p90_ms": get_percentile(ordered, 90) * 1000,
+                "p99_ms": get_percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+
+        return {
+            "wall_time_s": time.perf_counter() - self._start_time,
+            "metrics": metrics,
+        }
+
+    def write_report(self, path: str):
+        with open(path, "w") as report_file:
+            json.dump(self.get_report(), report_file, indent=2)
@@ -0,0 +1,4 @@
+def get_percentile(ordered_samples: list[float], percentile: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index: int = max(0, round(percentile / 100 * len(ordered_samples)) - 1)
+    return ordered_samples[min(index, len(ordered_samples) - 1)]
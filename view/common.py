@@ -0,0 +1,41 @@
+"""Colors and texts shared by the game view and the boards of a simul"""
+
+from __future__ import annotations
+
+from blessed import Terminal
+
+from controller.game_config import GameConfig
+from model.snapshot import BoardSnapshot
+from model.termination import Termination
+
+
+def get_board_colors(term: Terminal) -> dict[str, str]:
+    """Returns colors of the squares and pieces"""
+    return {
+        "white_square_background": term.on_seashell4,
+        "black_square_background": term.on_gray40,
+        "white_piece_foreground": term.gray100,
+        "black_piece_foreground": term.gray0,
+    }
+
+
+def get_player_name(game_config: GameConfig, white: bool) -> str:
+    """Returns name of engine (based on filename) or 'Human' if no engine"""
+    engine_path: str | None = (
+        game_config.white_engine_path if white else game_config.black_engine_path
+    )
+    if engine_path:
+        return engine_path.rsplit("/")[-1]
+    else:
+        return "Human"
+
+
+def get_result_text(board: BoardSnapshot) -> str:
+    """Returns how a finished game ended, e.g. 'Checkmate. White wins!'"""
+    if board.termination == Termination.CHECKMATE:
+        winner: str = "Black" if board.white_turn else "White"
+        return f"Checkmate. {winner} wins!"
+    elif board.termination:
+        return f"Draw by {board.termination.value}."
+    else:
+        return "Draw."
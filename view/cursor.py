@@ -9,8 +9,13 @@ class Cursor:
 
         self.square: tuple[int, int] = start_pos
 
-    def move(self, x_diff: int, y_diff: int):
+    def move(self, x_diff: int, y_diff: int, skip_squares: set[tuple[int, int]] | None = None):
+        """Moves cursor, stepping over any skip squares, or stays put if none are left"""
         new_x: int = self.square[0] + x_diff
         new_y: int = self.square[1] + y_diff
-        if self.min_x <= new_x <= self.max_x and self.min_y <= new_y <= self.max_y:
-            self.square = (new_x, new_y)
+        while self.min_x <= new_x <= self.max_x and self.min_y <= new_y <= self.max_y:
+            if skip_squares is None or (new_x, new_y) not in skip_squares:
+                self.square = (new_x, new_y)
+                return
+            new_x += x_diff
+            new_y += y_diff
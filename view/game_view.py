@@ -1,39 +1,51 @@
 from __future__ import annotations
 import asyncio
-from collections.abc import Awaitable, Callable
+import time
+from collections.abc import Awaitable, Callable, Mapping
 from typing import override
 
 from blessed import Terminal
 from blessed.keyboard import Keystroke
 
+from .common import get_board_colors, get_player_name, get_result_text
 from .cursor import Cursor
 from controller.exceptions import EndGameException
 from controller.game_config import GameConfig
-from model.board import Board
+from engine.search_result import SearchResult
+from model.history import GameHistory
 from model.movement import Movement
-from model.pieces import Piece
+from model.snapshot import BoardSnapshot, PieceSnapshot
+from util import log
 
 PADDING: int = 2
 
+# move list panel is drawn right of the board, below the player names
+MOVE_LIST_COLUMN: int = 34
+MOVE_LIST_FIRST_ROW: int = 3
+MOVE_LIST_WIDTH: int = 16
+
 
 class GameView:
     def __init__(
         self,
-        board: Board,
+        board: BoardSnapshot,
         send_movement: Callable[[Movement], Awaitable[None]],
+        send_takeback: Callable[[], Awaitable[None]],
+        send_redo: Callable[[], Awaitable[None]],
+        send_browse: Callable[[], Awaitable[None]],
+        history: GameHistory,
         game_config: GameConfig,
     ):
         self.term: Terminal = Terminal()
         self.game_config: GameConfig = game_config
 
         self.colors: dict[str, str] = {
-            "white_square_background": self.term.on_seashell4,
-            "black_square_background": self.term.on_gray40,
+            **get_board_colors(self.term),
             "cursor_background": self.term.on_cyan3,
             "selected_square_background": self.term.on_darkslategray4,
             "moveable_square_background": self.term.on_lightblue4,
-            "white_piece_foreground": self.term.gray100,
-            "black_piece_foreground": self.term.gray0,
+            "immobile_white_piece_foreground": self.term.gray70,
+            "immobile_black_piece_foreground": self.term.gray25,
         }
 
         # used to choose a piece
@@ -42,20 +54,61 @@ class GameView:
         # used to choose a square to move to
         self.movement_cursor: Cursor = Cursor(0, 0, board.width - 1, board.height - 1)
 
-        self.board: Board = board
+        self.board: BoardSnapshot = board
         self.send_movement: Callable[[Movement], Awaitable[None]] = send_movement
+        self.send_takeback: Callable[[], Awaitable[None]] = send_takeback
+        self.send_redo: Callable[[], Awaitable[None]] = send_redo
+        self.send_browse: Callable[[], Awaitable[None]] = send_browse
+
+        # ply being viewed when stepping through earlier positions and its board,
+        # published by the controller, None when live
+        self.history: GameHistory = history
+        self.browse_ply: int | None = None
+        self.browse_board: BoardSnapshot | None = None
+
+        # games of the position index which reached the live position, None without an index
+        self.archive_games: int | None = None
+
+        # evaluation of the viewed position when analysing, None until the engine finishes it
+        self.analysing: bool = game_config.analysis_engine_path is not None
+        self.evaluation: SearchResult | None = None
+
+        # SAN of each ply and index of the first one shown in the move list panel
+        self.move_texts: list[str] = []
+        self.move_list_start: int = 0
+
+        # move list lines waiting for the render task, or the whole panel after it scrolls
+        self.move_list_lines: set[int] = set()
+        self.move_list_dirty: bool = False
+
+        # legal moves of the side to move, computed in the background once input is enabled
+        self.all_moveable_squares: dict[tuple[int, int], set[tuple[int, int]]] | None = None
+        self._moveable_squares_task: (
+            asyncio.Task[dict[tuple[int, int], set[tuple[int, int]]]] | None
+        ) = None
+
+        # set when the board needs drawing, frames are drawn by the render task at most at max fps
+        self.dirty: asyncio.Event = asyncio.Event()
+        self.frames_drawn: int = 0
+        self.dropped_frames: int = 0
 
         self.is_ready: bool = False
         self.state: GameViewState = NoInputState(self)
 
-    async def set_board(self, new_board: Board):
+    async def set_board(self, new_board: BoardSnapshot):
         self.board = new_board
-        await self.state.draw_board()
+        self._cancel_moveable_squares_task()
+        self.request_redraw()
 
     async def enable_input(self):
+        if self._moveable_squares_task is None:
+            self._moveable_squares_task = asyncio.create_task(
+                self._compute_all_moveable_squares(self.board)
+            )
         await self._change_state(SelectingState(self))
 
     async def disable_input(self):
+        self._cancel_moveable_squares_task()
         await self._change_state(NoInputState(self))
 
     async def exit_selection(self):
@@ -66,28 +119,111 @@ class GameView:
             with self.term.hidden_cursor(), self.term.cbreak():
                 print(self.term.home + self.term.clear)
                 await self.state.draw_board()
+                self.draw_move_list()
                 self.is_ready = True
 
-                while True:
-                    user_input: Keystroke = self.term.inkey(timeout=0.01)
-                    if user_input == "q":
-                        print(self.term.home + self.term.clear)
-                        raise EndGameException()
-                    else:
-                        await self.state.handle_input(user_input)
+                # a failed frame ends the input loop too, instead of leaving the board frozen
+                try:
+                    async with asyncio.TaskGroup() as group:
+                        group.create_task(self.render())
+                        group.create_task(self.read_input())
 
-                    await asyncio.sleep(0.01)
+                except* Exception as errors:  # noqa: BLE001 - re-raised without the group
+                    for error in errors.exceptions:
+                        raise error
 
         except asyncio.CancelledError:
             print(self.term.home + self.term.clear)
             raise
+        finally:
+            log(f"Frames drawn: {self.frames_drawn}, dropped: {self.dropped_frames}", "debug")
+
+    async def read_input(self):
+        while True:
+            user_input: Keystroke = self.term.inkey(timeout=0.01)
+            # handle every pending key before yielding, so held or pasted keys cost one frame
+            while user_input:
+                state: GameViewState = self.state
+                await self.handle_key(user_input)
+                if self.state is not state:
+                    break  # let the game catch up before reading keys meant for the new state
+                user_input = self.term.inkey(timeout=0)
+
+            await asyncio.sleep(0.01)
+
+    async def handle_key(self, user_input: Keystroke):
+        if user_input == "q":
+            print(self.term.home + self.term.clear)
+            raise EndGameException()
+        elif user_input in (",", ".", "<", ">"):
+            await self.browse(user_input)
+        elif self.browse_ply is not None:
+            await self.set_browse_ply(None)  # any other key returns to the live position
+        else:
+            await self.state.handle_input(user_input)
+
+    def request_redraw(self):
+        """Marks the board as needing a redraw, a pending redraw absorbs this one"""
+        if self.dirty.is_set():
+            self.dropped_frames += 1
+        else:
+            self.dirty.set()
+
+    async def render(self):
+        """Draws the latest state whenever the view is dirty, at most once per frame interval"""
+        frame_interval: float = 1 / self.game_config.max_fps
+        last_frame_time: float = 0
+        while True:
+            await self.dirty.wait()
+            delay: float = last_frame_time + frame_interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            self.dirty.clear()
+            await self.state.draw_board()
+            self.draw_pending_move_list()
+            self.frames_drawn += 1
+            last_frame_time = time.perf_counter()
+
+    async def browse(self, key: str):
+        """Steps through positions of the game, ',' and '.' by one ply, '<' and '>' to the ends"""
+        ply: int = self.history.ply if self.browse_ply is None else self.browse_ply
+        match key:
+            case ",":
+                ply = max(0, ply - 1)
+            case ".":
+                ply = min(self.history.ply, ply + 1)
+            case "<":
+                ply = 0
+            case _:
+                ply = self.history.ply
+        await self.set_browse_ply(None if ply == self.history.ply else ply)
+
+    async def set_browse_ply(self, ply: int | None):
+        if ply != self.browse_ply:
+            self.browse_ply = ply
+            await self.send_browse()
+
+    async def set_browse_board(self, board: BoardSnapshot | None):
+        self.browse_board = board
+        self.request_redraw()
+
+    async def set_evaluation(self, evaluation: SearchResult | None):
+        self.evaluation = evaluation
+        self.request_redraw()
 
     async def draw_board(
         self, draw_cursors: bool, moveable_squares: set[tuple[int, int]] | None = None
     ):
         print(self.term.home)
 
-        pieces: dict[tuple[int, int], Piece] = self.board.get_pieces()
+        board: BoardSnapshot = self.board
+        if self.browse_board is not None:
+            board = self.browse_board
+            draw_cursors = False
+
+        pieces: Mapping[tuple[int, int], PieceSnapshot] = board.get_pieces()
+        immobile_squares: set[tuple[int, int]] = self.get_immobile_squares()
 
         for y in range(self.board.height):
             print(" " * PADDING, end="")
@@ -116,12 +252,14 @@ class GameView:
                 piece_character: str = " "
 
                 if (x, y) in pieces:
-                    piece: Piece = pieces[(x, y)]
+                    piece: PieceSnapshot = pieces[(x, y)]
+                    color_name: str = "white" if piece.is_white else "black"
 
-                    if piece.is_white:
-                        foreground_color = self.colors["white_piece_foreground"]
+                    in_selection: bool = draw_cursors and isinstance(self.state, SelectingState)
+                    if in_selection and (x, y) in immobile_squares:
+                        foreground_color = self.colors[f"immobile_{color_name}_piece_foreground"]
                     else:
-                        foreground_color = self.colors["black_piece_foreground"]
+                        foreground_color = self.colors[f"{color_name}_piece_foreground"]
 
                     if self.game_config.ascii:
                         piece_character = piece.character
@@ -140,42 +278,92 @@ class GameView:
 
             # white player status
             if y == 0:
-                white_text: str = f"White: {self.get_player_name(white=True)}"
-                if self.board.white_turn:
+                white_text: str = f"White: {get_player_name(self.game_config, white=True)}"
+                if board.white_turn:
                     white_text = f"{self.term.bold}{white_text}{self.term.normal}"
                 print(white_text, end="")
 
             # black player status
             elif y == 1:
-                black_text: str = f"Black: {self.get_player_name(white=False)}"
-                if not self.board.white_turn:
+                black_text: str = f"Black: {get_player_name(self.game_config, white=False)}"
+                if not board.white_turn:
                     black_text = f"{self.term.bold}{black_text}{self.term.normal}"
                 print(black_text, end="")
 
             print()  # move down to next row
 
         # pad check status to fully clear previous line
-        print(f"{self.get_check_status(self.board):<22}")
-
-    def get_player_name(self, white: bool) -> str:
-        """Returns name of engine (based on filename) or 'Human' if no engine"""
-        engine_path: str | None = (
-            self.game_config.white_engine_path if white else self.game_config.black_engine_path
+        if self.browse_ply is not None:
+            print(f"{f'Viewing ply {self.browse_ply} of {self.history.ply}.':<32}")
+        else:
+            print(f"{self.get_check_status(self.board):<32}")
+
+        if self.analysing:
+            print(f"{self.get_evaluation_text(board)[:32]:<32}")
+
+        # position index matches, below the board as the move list is beside it
+        if self.archive_games is not None:
+            print(f"{f'Archive: {self.archive_games} games':<32}")
+
+    async def append_move_text(self, move_text: str):
+        """Adds ply to the move list panel, only drawing the new line unless it has to scroll"""
+        self.move_texts.append(move_text)
+        index: int = len(self.move_texts) - 1
+        if index - self.move_list_start >= self.get_move_list_height():
+            # scroll by half a panel so that most plies are drawn as a single line
+            self.move_list_start = index - self.get_move_list_height() // 2
+            self.move_list_dirty = True
+        else:
+            self.move_list_lines.add(index)
+        self.request_redraw()
+
+    async def set_move_texts(self, move_texts: list[str]):
+        self.move_texts = list(move_texts)
+        self.move_list_start = max(0, len(self.move_texts) - self.get_move_list_height() // 2)
+        self.move_list_dirty = True
+        self.request_redraw()
+
+    def get_move_list_height(self) -> int:
+        return max(
+            self.board.height - MOVE_LIST_FIRST_ROW + 1, self.term.height - MOVE_LIST_FIRST_ROW
         )
-        if engine_path:
-            return engine_path.rsplit("/")[-1]
+
+    def draw_pending_move_list(self):
+        """Draws the move list lines changed since the last frame"""
+        if self.move_list_dirty:
+            self.draw_move_list()
         else:
-            return "Human"
+            for index in sorted(self.move_list_lines):
+                self.draw_move_list_line(index)
+        self.move_list_dirty = False
+        self.move_list_lines.clear()
+
+    def draw_move_list(self):
+        for row in range(self.get_move_list_height()):
+            index: int = self.move_list_start + row
+            if index < len(self.move_texts):
+                self.draw_move_list_line(index)
+            else:
+                position: str = self.term.move_xy(MOVE_LIST_COLUMN, MOVE_LIST_FIRST_ROW + row)
+                print(f"{position}{'':<{MOVE_LIST_WIDTH}}", end="", flush=True)
+
+    def draw_move_list_line(self, index: int):
+        # number plies from the starting position, which may be loaded mid-game
+        start_fields: list[str] = self.history.get_start_fen().split()
+        ply: int = index + (0 if start_fields[1] == "w" else 1)
+        number: int = int(start_fields[5]) + ply // 2
+        text: str = f"{number}. {self.move_texts[index]}"
+        if ply % 2 == 1:
+            text = f"{number}... {self.move_texts[index]}"
+
+        position: str = self.term.move_xy(
+            MOVE_LIST_COLUMN, MOVE_LIST_FIRST_ROW + index - self.move_list_start
+        )
+        print(f"{position}{text:<{MOVE_LIST_WIDTH}}", end="", flush=True)
 
-    def get_check_status(self, board: Board) -> str:
+    def get_check_status(self, board: BoardSnapshot) -> str:
         if board.game_over:
-            if board.is_king_in_checkmate(board.white_turn):
-                if board.white_turn:
-                    return "Checkmate. Black wins!"
-                else:
-                    return "Checkmate. White wins!"
-            else:
-                return "Draw."
+            return get_result_text(board)
         else:
             if board.is_king_in_check(board.white_turn):
                 if board.white_turn:
@@ -185,10 +373,58 @@ class GameView:
             else:
                 return ""
 
+    def get_evaluation_text(self, board: BoardSnapshot) -> str:
+        """Returns evaluation from white's side and the line, e.g. +0.34 d20 e2e4 e7e5"""
+        if self.evaluation is None:
+            return "Evaluating..."
+
+        score_text: str = ""
+        if self.evaluation.score:
+            # engines score from the side to move's point of view
+            kind, value, *_ = self.evaluation.score.split()
+            score: int = int(value) if board.white_turn else -int(value)
+            score_text = f"#{score} " if kind == "mate" else f"{score / 100:+.2f} "
+        line: str = self.evaluation.pv or self.evaluation.best_move
+        return f"{score_text}d{self.evaluation.depth} {line}"
+
+    def get_immobile_squares(self) -> set[tuple[int, int]]:
+        """Returns squares of pieces without legal moves, empty until they are computed"""
+        if self.all_moveable_squares is None:
+            return set()
+        return {
+            square
+            for square, moveable_squares in self.all_moveable_squares.items()
+            if len(moveable_squares) == 0
+        }
+
     async def select_square(self, square: tuple[int, int]):
         if square in self.board.get_pieces():
             if self.board.get_pieces()[square].is_white == self.board.white_turn:
-                await self._change_state(MovingState(self, self.board.get_moveable_squares(square)))
+                moveable_squares: set[tuple[int, int]] = await self.get_moveable_squares(square)
+                if len(moveable_squares) != 0:
+                    await self._change_state(MovingState(self, moveable_squares))
+
+    async def get_moveable_squares(self, square: tuple[int, int]) -> set[tuple[int, int]]:
+        if self._moveable_squares_task is None:
+            return self.board.get_moveable_squares(square)
+        return (await self._moveable_squares_task)[square]
+
+    async def _compute_all_moveable_squares(
+        self, board: BoardSnapshot
+    ) -> dict[tuple[int, int], set[tuple[int, int]]]:
+        # runs in a worker thread so the event loop keeps handling input
+        all_moveable_squares: dict[tuple[int, int], set[tuple[int, int]]] = await asyncio.to_thread(
+            board.get_all_moveable_squares, board.white_turn
+        )
+        self.all_moveable_squares = all_moveable_squares
+        self.request_redraw()  # dim pieces without legal moves
+        return all_moveable_squares
+
+    def _cancel_moveable_squares_task(self):
+        if self._moveable_squares_task is not None:
+            self._moveable_squares_task.cancel()
+            self._moveable_squares_task = None
+        self.all_moveable_squares = None
 
     async def move_piece(
         self,
@@ -231,43 +467,50 @@ class GameViewState:
 class SelectingState(GameViewState):
     @override
     async def enter(self):
-        await self.draw_board()
+        self.view.request_redraw()
 
     @override
     async def handle_input(self, user_input: Keystroke):
         redraw: bool = True
         state_cursor: Cursor = self.view.selection_cursor
+        immobile_squares: set[tuple[int, int]] = self.view.get_immobile_squares()
 
         if user_input.is_sequence:
             match user_input.name:
                 case "KEY_LEFT":
-                    state_cursor.move(-1, 0)
+                    state_cursor.move(-1, 0, immobile_squares)
                 case "KEY_DOWN":
-                    state_cursor.move(0, 1)
+                    state_cursor.move(0, 1, immobile_squares)
                 case "KEY_RIGHT":
-                    state_cursor.move(1, 0)
+                    state_cursor.move(1, 0, immobile_squares)
                 case "KEY_UP":
-                    state_cursor.move(0, -1)
+                    state_cursor.move(0, -1, immobile_squares)
                 case _:
                     redraw = False
         else:
             match user_input.lower():
                 case "h":
-                    state_cursor.move(-1, 0)
+                    state_cursor.move(-1, 0, immobile_squares)
                 case "j":
-                    state_cursor.move(0, 1)
+                    state_cursor.move(0, 1, immobile_squares)
                 case "l":
-                    state_cursor.move(1, 0)
+                    state_cursor.move(1, 0, immobile_squares)
                 case "k":
-                    state_cursor.move(0, -1)
+                    state_cursor.move(0, -1, immobile_squares)
                 case " ":
                     await self.view.select_square(state_cursor.square)
                     redraw = False
+                case "u":
+                    await self.view.send_takeback()
+                    redraw = False
+                case "r":
+                    await self.view.send_redo()
+                    redraw = False
                 case _:
                     redraw = False
 
         if redraw:
-            await self.draw_board()
+            self.view.request_redraw()
 
     @override
     async def draw_board(self):
@@ -282,7 +525,7 @@ class MovingState(GameViewState):
     @override
     async def enter(self):
         self.view.movement_cursor.square = self.view.selection_cursor.square
-        await self.draw_board()
+        self.view.request_redraw()
 
     @override
     async def handle_input(self, user_input: Keystroke):
@@ -326,7 +569,7 @@ class MovingState(GameViewState):
                     redraw = False
 
         if redraw:
-            await self.draw_board()
+            self.view.request_redraw()
 
     @override
     async def draw_board(self):
@@ -336,7 +579,12 @@ class MovingState(GameViewState):
 class NoInputState(GameViewState):
     @override
     async def enter(self):
-        await self.draw_board()
+        self.view.request_redraw()
+
+    @override
+    async def handle_input(self, user_input: Keystroke):
+        if self.view.board.game_over and user_input.lower() == "u":  # e.g. after being mated
+            await self.view.send_takeback()
 
     @override
     async def draw_board(self):
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+
+from controller.exceptions import EndGameException
+from controller.game_config import GameConfig
+from model.snapshot import BoardSnapshot, PieceSnapshot
+from util import log
+
+from .common import get_board_colors, get_player_name, get_result_text
+
+# board of 3 characters per square with a title above and a status below, plus gaps
+TILE_WIDTH: int = 26
+TILE_HEIGHT: int = 11
+
+
+class SimulView:
+    """
+    Tiles the boards of several games, each tile fed by its own controller.
+    Tiles are only repainted when their game changed, at most once per frame.
+    """
+
+    def __init__(self, game_config: GameConfig):
+        self.term: Terminal = Terminal()
+        self.game_config: GameConfig = game_config
+        self.frame_interval: float = 1 / game_config.max_fps
+
+        self.colors: dict[str, str] = get_board_colors(self.term)
+
+        self.tiles: list[BoardTile] = []
+        self.dirty_tiles: set[BoardTile] = set()
+        self.frames_drawn: int = 0
+        self.dropped_updates: int = 0  # positions superseded before being drawn
+
+        self.is_ready: bool = False
+
+    def create_tile(self, game_config: GameConfig) -> BoardTile:
+        tile: BoardTile = BoardTile(self, len(self.tiles), game_config)
+        self.tiles.append(tile)
+        return tile
+
+    def mark_dirty(self, tile: BoardTile):
+        self.dirty_tiles.add(tile)
+
+    async def run(self):
+        try:
+            with self.term.hidden_cursor(), self.term.cbreak():
+                print(self.term.home + self.term.clear, end="")
+                self.dirty_tiles.update(self.tiles)
+                self.is_ready = True
+
+                while True:
+                    user_input: Keystroke = self.term.inkey(timeout=0)
+                    if user_input == "q":
+                        print(self.term.home + self.term.clear)
+                        raise EndGameException()
+
+                    self.render()
+                    await asyncio.sleep(self.frame_interval)
+
+        except asyncio.CancelledError:
+            print(self.term.home + self.term.clear)
+            raise
+        finally:
+            log(f"Frames drawn: {self.frames_drawn}, dropped: {self.dropped_updates}", "debug")
+
+    def render(self):
+        """Repaints the tiles which changed since the last frame"""
+        if not self.dirty_tiles:
+            return
+
+        columns: int = max(1, self.term.width // TILE_WIDTH)
+        rows: int = max(1, self.term.height // TILE_HEIGHT)
+        for tile in sorted(self.dirty_tiles, key=lambda tile: tile.index):
+            if tile.index < columns * rows:  # tiles beyond the terminal are not drawn
+                row, column = divmod(tile.index, columns)
+                self.draw_tile(tile, column * TILE_WIDTH, row * TILE_HEIGHT)
+        self.dirty_tiles.clear()
+        self.frames_drawn += 1
+
+        if len(self.tiles) > columns * rows:
+            position: str = self.term.move_xy(0, rows * TILE_HEIGHT - 1)
+            print(f"{position}Showing {columns * rows} of {len(self.tiles)} boards", end="")
+        print(end="", flush=True)
+
+    def draw_tile(self, tile: BoardTile, left: int, top: int):
+        if tile.board is None:
+            return
+        board: BoardSnapshot = tile.board
+        tile.board_drawn = True
+        pieces: Mapping[tuple[int, int], PieceSnapshot] = board.get_pieces()
+        width: int = TILE_WIDTH - 2
+
+        title: str = f"{tile.index + 1}. {get_player_name(tile.game_config, True)} - "
+        title += get_player_name(tile.game_config, False)
+        print(f"{self.term.move_xy(left, top)}{title[:width]:<{width}}", end="")
+
+        for y in range(board.height):
+            line: str = self.term.move_xy(left, top + 1 + y)
+            for x in range(board.width):
+                if (x + y) % 2 == 0:
+                    background_color: str = self.colors["white_square_background"]
+                else:
+                    background_color = self.colors["black_square_background"]
+
+                piece_character: str = " "
+                foreground_color: str = background_color
+                if (x, y) in pieces:
+                    piece: PieceSnapshot = pieces[(x, y)]
+                    color_name: str = "white" if piece.is_white else "black"
+                    foreground_color = self.colors[f"{color_name}_piece_foreground"]
+                    if self.game_config.ascii:
+                        piece_character = piece.character
+                    else:
+                        piece_character = piece.nerdfont_character
+
+                line += f"{foreground_color}{background_color} {piece_character} "
+            print(f"{line}{self.term.normal}", end="")
+
+        status: str = tile.get_status()
+        print(f"{self.term.move_xy(left, top + 1 + board.height)}{status[:width]:<{width}}", end="")
+
+
+class BoardTile:
+    """Stands in for a GameView, so that a GameController can play a game shown in a simul"""
+
+    def __init__(self, view: SimulView, index: int, game_config: GameConfig):
+        self.view: SimulView = view
+        self.index: int = index
+        self.game_config: GameConfig = game_config
+        self.board: BoardSnapshot | None = None  # set by the controller
+        self.board_drawn: bool = False
+        self.move_texts: list[str] = []
+        self.archive_games: int | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.view.is_ready
+
+    async def set_board(self, new_board: BoardSnapshot):
+        if not self.board_drawn and self.board is not None:
+            self.view.dropped_updates += 1
+        self.board = new_board
+        self.board_drawn = False
+        self.view.mark_dirty(self)
+
+    async def append_move_text(self, move_text: str):
+        self.move_texts.append(move_text)
+        self.view.mark_dirty(self)
+
+    async def set_move_texts(self, move_texts: list[str]):
+        self.move_texts = list(move_texts)
+        self.view.mark_dirty(self)
+
+    async def enable_input(self):
+        pass  # games of a simul are only played by engines
+
+    async def disable_input(self):
+        pass
+
+    def get_status(self) -> str:
+        """Returns the result once the game is over, otherwise the latest move"""
+        if self.board is not None and self.board.game_over:
+            return get_result_text(self.board)
+        if self.board is not None and self.move_texts:
+            if self.board.white_turn:  # black made the latest move
+                return f"{self.board.fullmove_number - 1}... {self.move_texts[-1]}"
+            return f"{self.board.fullmove_number}. {self.move_texts[-1]}"
+        return ""